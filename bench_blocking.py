@@ -0,0 +1,121 @@
+""" bench_blocking.py
+
+SUMMARY: Benchmark the resource blocking profiles of wyzant_driver (none, media, lean) in headless Chrome.
+Each profile loads a local stub of a page of search results, fixtures/search_page_assets.html, NUM_LOADS times,
+with the browser cache off.  The stub server serves stand-ins for the images, font, video and trackers of
+the real page, of about the same size, and counts the bytes it sends.  Reports bytes sent and requests per
+page load, and the time taken by driver.get, which waits for the load event.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+from wyzant_driver import chrome_driver, quit_driver, BLOCK_PROFILES
+
+# Other packages.
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from statistics import median
+from threading import Thread
+from time import perf_counter
+
+# CONSTANTS.
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'search_page_assets.html'
+NUM_LOADS = 20
+# Sizes of the stand-ins, in bytes, by path prefix or suffix.
+ASSET_SIZES = {'.jpg': 40_000, '.png': 4_000, '.svg': 8_000, '.woff2': 60_000, '.mp4': 900_000, '.js': 90_000}
+CONTENT_TYPES = {'.jpg': 'image/jpeg', '.png': 'image/png', '.svg': 'image/svg+xml', '.woff2': 'font/woff2',
+                 '.mp4': 'video/mp4', '.js': 'application/javascript'}
+
+
+class StubSiteHandler(BaseHTTPRequestHandler):
+    """ Serve the fixture at /match/search, and stand-ins for its assets, counting bytes and requests. """
+    page = FIXTURE.read_bytes()
+    requests_served = 0
+    bytes_sent = 0
+
+    def do_GET(self):
+        cls = StubSiteHandler
+        path = self.path.split('?')[0]
+        if path == '/match/search':
+            body, content_type = cls.page, 'text/html; charset=utf-8'
+        else:
+            suffix = Path(path).suffix
+            if suffix not in ASSET_SIZES:
+                self.send_error(404)
+                return
+            content_type = CONTENT_TYPES[suffix]
+            # Scripts must parse, so pad them with a comment.
+            body = b"/*" + b" " * (ASSET_SIZES[suffix] - 4) + b"*/" if suffix == '.js' else b"\0" * ASSET_SIZES[suffix]
+        cls.requests_served += 1
+        cls.bytes_sent += len(body)
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+# End of class StubSiteHandler.
+
+
+def bench_profile(page_url: str, block: str) -> tuple:
+    """ Load the stub page NUM_LOADS times in headless Chrome with one blocking profile.
+
+    Parameters:
+        page_url (str): URL of the stub page.
+        block (str): one of wyzant_driver.BLOCK_PROFILES.
+    Returns:
+        (median seconds per load, bytes per load, requests per load)
+    """
+    driver = chrome_driver(block)
+    try:
+        # Every load downloads everything not blocked, as the first load of each page does in the scripts.
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+        driver.get(page_url)
+        StubSiteHandler.requests_served = 0
+        StubSiteHandler.bytes_sent = 0
+        seconds = []
+        for _ in range(NUM_LOADS):
+            start = perf_counter()
+            driver.get(page_url)
+            seconds.append(perf_counter() - start)
+    finally:
+        quit_driver(driver)
+    return median(seconds), StubSiteHandler.bytes_sent / NUM_LOADS, StubSiteHandler.requests_served / NUM_LOADS
+# End of function bench_profile.
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSiteHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    page_url = f"http://127.0.0.1:{server.server_port}/match/search"
+
+    try:
+        results = {block: bench_profile(page_url, block) for block in BLOCK_PROFILES}
+    finally:
+        server.shutdown()
+
+    print(f"{NUM_LOADS} page loads per profile.")
+    for block, (seconds, bytes_sent, requests_served) in results.items():
+        print(f"{block:6}: {1000 * seconds:8.1f} ms/load, {bytes_sent:10.0f} bytes/load, "
+              f"{requests_served:5.1f} requests/load.")
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+""" bench_job_cards.py
+
+SUMMARY: Benchmark the two ways wyzant_jobs.py scrapes job cards, against the saved jobs page in
+fixtures/jobs_page.html:
+    1.  scrape_job_cards: WebDriver calls for every element in every job card.
+    2.  parse_job_cards: one WebDriver call to snapshot every job card, then parse them with lxml.
+Reports WebDriver wire calls and wall time per poll.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+# Web Browser independent Selenium imports.
+from selenium import webdriver
+
+# Web Browser dependent Selenium code.
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from wyzant_login import get_chromedriver_path
+from wyzant_jobs import scrape_job_cards, parse_job_cards, parse_jobs_page, CARD_SNAPSHOT_JS
+
+# Other packages.
+from pathlib import Path
+from time import perf_counter
+
+# CONSTANTS.
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'jobs_page.html'
+NUM_POLLS = 20
+
+
+def count_wire_calls(driver) -> list:
+    """ Count every command the driver sends to chromedriver.
+
+    Parameters:
+        driver: Selenium driver object.
+    Returns:
+        counter (list): one-item list, counter[0] is the number of commands sent so far.
+    """
+    counter = [0]
+    execute = driver.command_executor.execute
+
+    def counting_execute(command, params):
+        counter[0] += 1
+        return execute(command, params)
+
+    driver.command_executor.execute = counting_execute
+    return counter
+# End of function count_wire_calls.
+
+
+def time_polls(driver, counter: list, scrape) -> tuple:
+    """ Reload the fixture page and scrape it NUM_POLLS times.
+
+    Parameters:
+        driver: Selenium driver object.
+        counter (list): wire call counter from count_wire_calls.
+        scrape: function taking driver, returning the list of job card params dicts.
+    Returns:
+        (wire calls per poll, seconds per poll, job cards from last poll)
+    """
+    calls = 0
+    seconds = 0.0
+    job_cards = []
+    for _ in range(NUM_POLLS):
+        driver.refresh()
+        start_calls = counter[0]
+        start = perf_counter()
+        job_cards = scrape(driver)
+        seconds += perf_counter() - start
+        calls += counter[0] - start_calls
+    return calls / NUM_POLLS, seconds / NUM_POLLS, job_cards
+# End of function time_polls.
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    options = Options()
+    options.add_argument('--headless')
+    service = Service(get_chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=options)
+    counter = count_wire_calls(driver)
+
+    try:
+        driver.get(FIXTURE.resolve().as_uri())
+
+        per_element = time_polls(driver, counter, scrape_job_cards)
+        snapshot = time_polls(driver, counter,
+                              lambda d: parse_job_cards(d.execute_async_script(CARD_SNAPSHOT_JS)))
+    finally:
+        driver.quit()
+
+    # Parsing a saved page source costs no wire calls at all.
+    page_source = FIXTURE.read_text()
+    start = perf_counter()
+    for _ in range(NUM_POLLS):
+        parse_jobs_page(page_source)
+    lxml_only = (perf_counter() - start) / NUM_POLLS
+
+    print(f"{len(snapshot[2])} job cards, {NUM_POLLS} polls each.")
+    print(f"{'Method':<22}{'Wire calls/poll':>16}{'ms/poll':>10}")
+    print(f"{'per-element':<22}{per_element[0]:>16.1f}{1000 * per_element[1]:>10.1f}")
+    print(f"{'snapshot + lxml':<22}{snapshot[0]:>16.1f}{1000 * snapshot[1]:>10.1f}")
+    print(f"{'page_source lxml only':<22}{0:>16.1f}{1000 * lxml_only:>10.1f}")
+
+    if per_element[2] != snapshot[2]:
+        print("WARNING: per-element and snapshot results differ.")
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
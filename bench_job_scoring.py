@@ -0,0 +1,62 @@
+""" bench_job_scoring.py
+
+SUMMARY: Benchmark scoring new jobs with job_scoring.JobScorer, as wyzant_jobs.JobAlerts does after every poll,
+against the job cards of the saved jobs page in fixtures/jobs_page.html, copied NUM_COPIES times.
+Compares the time to score the jobs of one poll with the time to parse them, so scoring can be seen to add
+nothing measurable to a poll.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+from job_scoring import load_scorer
+from wyzant_jobs import parse_jobs_page
+
+# Other packages.
+from pathlib import Path
+from time import perf_counter
+
+# CONSTANTS.
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'jobs_page.html'
+NUM_COPIES = 1000
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    page_source = FIXTURE.read_text(encoding='utf-8')
+
+    start = perf_counter()
+    job_cards = parse_jobs_page(page_source)
+    parse_seconds = perf_counter() - start
+
+    start = perf_counter()
+    scorer = load_scorer(path=None)
+    build_seconds = perf_counter() - start
+
+    jobs = job_cards * NUM_COPIES
+    start = perf_counter()
+    scores = [scorer.score(params)[0] for params in jobs]
+    score_seconds = perf_counter() - start
+
+    per_job = score_seconds / len(jobs)
+    print(f"{len(job_cards)} jobs per poll, scored {len(jobs)} times.")
+    print(f"Building the scorer:   {1e3 * build_seconds:8.3f} ms, once.")
+    print(f"Scoring one job:       {1e6 * per_job:8.3f} us.")
+    print(f"Scoring one poll:      {1e3 * per_job * len(job_cards):8.3f} ms.")
+    print(f"Parsing one poll:      {1e3 * parse_seconds:8.3f} ms.")
+    print(f"Scores of one poll:    {', '.join(f'{score:g}' for score in scores[:len(job_cards)])}.")
+    print(f"Alerting at once:      {sum(scorer.is_urgent(score) for score in scores[:len(job_cards)])}.")
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
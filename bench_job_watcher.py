@@ -0,0 +1,84 @@
+""" bench_job_watcher.py
+
+SUMMARY: Benchmark how quickly the job watcher in wyzant_jobs.py detects new job cards, against
+fixtures/jobs_timer.html, a saved jobs page that adds a new job card every 3 seconds.
+Compares detection latency and time per poll with the full page refresh used by default.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+# Web Browser independent Selenium imports.
+from selenium import webdriver
+
+# Web Browser dependent Selenium code.
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from wyzant_login import get_chromedriver_path
+from wyzant_jobs import (parse_job_cards, CARD_SNAPSHOT_JS, JOB_WATCHER_JS, WATCHER_DRAIN_JS, JOB_ID,
+                         WATCH_POLL_TIME, WATCH_FETCH_TIME)
+
+# Other packages.
+from pathlib import Path
+from statistics import mean
+from time import perf_counter, sleep
+
+# CONSTANTS.
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'jobs_timer.html'
+RUN_TIME = 60  # Seconds.
+REFRESH_POLL_TIME = 30  # Seconds, how often the default loop in wyzant_jobs.main() refreshes the page.
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    options = Options()
+    options.add_argument('--headless')
+    service = Service(get_chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=options)
+
+    try:
+        # Full refresh and snapshot, as done every poll without the watcher.
+        driver.get(FIXTURE.resolve().as_uri())
+        start = perf_counter()
+        driver.refresh()
+        parse_job_cards(driver.execute_async_script(CARD_SNAPSHOT_JS))
+        refresh_seconds = perf_counter() - start
+
+        # Watcher.
+        driver.execute_script(JOB_WATCHER_JS, 1000 * WATCH_FETCH_TIME)
+        latencies = []
+        drain_seconds = []
+        start = perf_counter()
+        while perf_counter() - start < RUN_TIME:
+            sleep(WATCH_POLL_TIME)
+            drain_start = perf_counter()
+            job_cards = parse_job_cards(driver.execute_async_script(WATCHER_DRAIN_JS))
+            drain_seconds.append(perf_counter() - drain_start)
+
+            now, added_at = driver.execute_script("return [Date.now(), window.cardAddedAt];")
+            for params in job_cards:
+                latencies.append((now - added_at[str(params[JOB_ID])]) / 1000)
+    finally:
+        driver.quit()
+
+    print(f"Full refresh + snapshot: {1000 * refresh_seconds:.1f} ms per poll, "
+          f"detection latency up to {REFRESH_POLL_TIME} s (mean about {REFRESH_POLL_TIME / 2:.0f} s).")
+    print(f"Watcher drain:           {1000 * mean(drain_seconds):.1f} ms per poll, "
+          f"{len(latencies)} new jobs detected in {RUN_TIME} s.")
+    if latencies:
+        print(f"Watcher detection latency: mean {mean(latencies):.2f} s, max {max(latencies):.2f} s.")
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
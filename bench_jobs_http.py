@@ -0,0 +1,162 @@
+""" bench_jobs_http.py
+
+SUMMARY: Benchmark polling the jobs page over HTTP (USE_HTTP_BACKEND in wyzant_jobs.py) against
+refreshing it in headless Chrome.  Both poll a local stub server serving the recorded jobs page in
+fixtures/jobs_page.html, with gzip compression and ETag/Last-Modified support.
+The stub server changes the page every CHANGE_EVERY polls, so most HTTP polls get "304 Not Modified".
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+# Web Browser independent Selenium imports.
+from selenium import webdriver
+
+# Web Browser dependent Selenium code.
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from wyzant_login import get_chromedriver_path
+from wyzant_jobs import fetch_job_cards, fetch_job_cards_http, USE_SNAPSHOT_PARSER
+
+# Other packages.
+import gzip
+import requests
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from threading import Thread
+from time import perf_counter
+
+# CONSTANTS.
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'jobs_page.html'
+NUM_POLLS = 50
+CHANGE_EVERY = 10  # Polls.
+
+
+class StubJobsHandler(BaseHTTPRequestHandler):
+    """ Serve the recorded jobs page at /tutor/jobs, with a new version every CHANGE_EVERY requests. """
+    page = FIXTURE.read_bytes()
+    requests_served = 0
+    bytes_sent = 0
+
+    def do_GET(self):
+        cls = StubJobsHandler
+        version = cls.requests_served // CHANGE_EVERY
+        cls.requests_served += 1
+
+        etag = f'"jobs-{version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        body = cls.page.replace(b"<body>", f"<body><!-- version {version} -->".encode())
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            encoding = "gzip"
+        else:
+            encoding = "identity"
+        cls.bytes_sent += len(body)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(usegmt=True))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+# End of class StubJobsHandler.
+
+
+def bench_http(jobs_url: str) -> tuple:
+    """ Poll the stub server over HTTP.
+
+    Parameters:
+        jobs_url (str): URL of the stub jobs page.
+    Returns:
+        (seconds per poll, bytes per poll, number of unchanged polls)
+    """
+    StubJobsHandler.requests_served = 0
+    StubJobsHandler.bytes_sent = 0
+    session = requests.Session()
+    validators = dict()
+    unchanged = 0
+
+    start = perf_counter()
+    for _ in range(NUM_POLLS):
+        if fetch_job_cards_http(session, jobs_url, validators) is None:
+            unchanged += 1
+    seconds = perf_counter() - start
+
+    return seconds / NUM_POLLS, StubJobsHandler.bytes_sent / NUM_POLLS, unchanged
+# End of function bench_http.
+
+
+def bench_selenium(jobs_url: str) -> tuple:
+    """ Poll the stub server by refreshing headless Chrome.
+
+    Parameters:
+        jobs_url (str): URL of the stub jobs page.
+    Returns:
+        (seconds per poll, bytes per poll, seconds to start Chrome)
+    """
+    start = perf_counter()
+    options = Options()
+    options.add_argument('--headless')
+    service = Service(get_chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=options)
+    startup = perf_counter() - start
+
+    try:
+        driver.get(jobs_url)
+        StubJobsHandler.requests_served = 0
+        StubJobsHandler.bytes_sent = 0
+        start = perf_counter()
+        for _ in range(NUM_POLLS):
+            driver.refresh()
+            fetch_job_cards(driver)
+        seconds = perf_counter() - start
+    finally:
+        driver.quit()
+
+    return seconds / NUM_POLLS, StubJobsHandler.bytes_sent / NUM_POLLS, startup
+# End of function bench_selenium.
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubJobsHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    jobs_url = f"http://127.0.0.1:{server.server_port}/tutor/jobs"
+
+    try:
+        http_seconds, http_bytes, unchanged = bench_http(jobs_url)
+        chrome_seconds, chrome_bytes, startup = bench_selenium(jobs_url)
+    finally:
+        server.shutdown()
+
+    print(f"{NUM_POLLS} polls each, page changes every {CHANGE_EVERY} polls.")
+    print(f"HTTP:   {1000 * http_seconds:8.1f} ms/poll, {http_bytes:8.0f} bytes/poll, "
+          f"{unchanged} polls not modified.")
+    print(f"Chrome: {1000 * chrome_seconds:8.1f} ms/poll, {chrome_bytes:8.0f} bytes/poll, "
+          f"{startup:.1f} s to start Chrome (snapshot parser: {USE_SNAPSHOT_PARSER}).")
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+""" bench_login.py
+
+SUMMARY: Benchmark startup time of the scripts (start Chrome, then log into Wyzant):
+    1.  Cold: no cached chromedriver path or cookies, so ChromeDriverManager().install() and the login form.
+    2.  Warm: cached chromedriver path and cookies from the cold start.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+from wyzant_driver import make_driver
+from wyzant_login import COOKIE_CACHE, DRIVER_PATH_CACHE
+
+# Other packages.
+import os
+from time import perf_counter
+
+
+def start_and_log_in() -> float:
+    """ Start headless Chrome and log into Wyzant, as the scripts do.
+
+    Parameters:
+    Returns:
+        seconds (float): time taken.
+    """
+    start = perf_counter()
+    driver = make_driver()
+    seconds = perf_counter() - start
+    driver.quit()
+    return seconds
+# End of function start_and_log_in.
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    for path in [COOKIE_CACHE, DRIVER_PATH_CACHE]:
+        if os.path.isfile(path):
+            os.remove(path)
+
+    cold = start_and_log_in()
+    warm = start_and_log_in()
+
+    print(f"Cold start: {cold:.1f} s.")
+    print(f"Warm start: {warm:.1f} s.")
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
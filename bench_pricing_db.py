@@ -0,0 +1,142 @@
+""" bench_pricing_db.py
+
+SUMMARY: Benchmark writing scraped tutors to a synthetic pricing database with NUM_TUTORS tutors:
+    1.  Per tutor: SELECT COUNT(*), then INSERT or UPDATE, for both Tutors and Topics, then commit,
+        as wyzant_pricing.py used to do.
+    2.  pricing_db.PricingWriter: batched upserts with executemany, in WAL mode.
+Each method saves every tutor again, for a new topic.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+from pricing_db import connect, PricingWriter, get_date_time
+
+# Other packages.
+import os
+import random
+import sqlite3
+import tempfile
+from time import perf_counter
+
+# CONSTANTS.
+
+NUM_TUTORS = 100_000
+PER_TUTOR_ROWS = 5_000  # Committing every tutor is slow, so only time this many tutors for method 1.
+
+CREATE_SQL = ["CREATE TABLE Tutors (ID INTEGER, URL TEXT, Name TEXT, Bill_Rate INTEGER, Avg_Rating REAL, "
+              "Number_Ratings INTEGER, Total_Hours INTEGER, Has_Photo INTEGER, Gender TEXT, City TEXT, "
+              "State TEXT, Response_Time_Min INTEGER, Highest_Degree TEXT, Background_Check DATE, "
+              "Last_Update TEXT)",
+              "CREATE TABLE Topics (ID INTEGER, Topic TEXT, Subject INTEGER, Topic_Hours INTEGER, "
+              "Last_Update TEXT)",
+              "CREATE INDEX Tutors_ID ON Tutors (ID)",
+              "CREATE INDEX Topics_ID_Topic ON Topics (ID, Topic)"]
+
+
+def synthetic_tutors(num_tutors: int) -> list:
+    """ Make tutors, as returned by wyzant_pricing.scrape_tutor_card.
+
+    Parameters:
+        num_tutors (int): number of tutors.
+    Returns:
+        tutors (list): one list per tutor.
+    """
+    rng = random.Random(42)
+    return [[id_number, f"https://www.wyzant.com/Tutors/{id_number}", f"Tutor {id_number} L.",
+             rng.randint(20, 200), round(rng.uniform(3, 5), 1), rng.randint(0, 500), rng.randint(0, 5000),
+             rng.randint(0, 1), rng.choice(['M', 'F', 'Unk']), rng.randint(0, 500)]
+            for id_number in range(1, num_tutors + 1)]
+
+
+def save_per_tutor(connection, topic: str, subject: int, tutors: list) -> None:
+    """ Save tutors one at a time, as wyzant_pricing.py used to do. """
+    cursor = connection.cursor()
+    for tutor in tutors:
+        (id_number, tutor_url, tutor_name, bill_rate, avg_rating, num_ratings, total_hours,
+         has_photo, gender, topic_hours) = tutor
+
+        cursor.execute("SELECT COUNT(*) FROM Tutors WHERE ID = ?", [id_number])
+        if cursor.fetchone()[0] == 0:
+            sql = ("INSERT INTO Tutors (URL, Name, Bill_Rate, Avg_Rating, Number_Ratings, Total_Hours, "
+                   "Has_Photo, Gender, Last_Update, ID) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+        else:
+            sql = ("UPDATE Tutors SET URL = ?, Name = ?, Bill_Rate = ?, Avg_Rating = ?,"
+                   "Number_Ratings = ?, Total_Hours = ?, Has_Photo = ?, Gender = ?, Last_Update = ? "
+                   "WHERE ID = ?")
+        cursor.execute(sql, [tutor_url, tutor_name, bill_rate, avg_rating, num_ratings, total_hours,
+                             has_photo, gender, get_date_time(), id_number])
+
+        cursor.execute("SELECT COUNT(*) FROM Topics WHERE ID = ? AND Topic = ?", [id_number, topic])
+        if cursor.fetchone()[0] == 0:
+            sql = "INSERT INTO Topics (Subject, Topic_Hours, Last_Update, ID, Topic) VALUES (?, ?, ?, ?, ?)"
+        else:
+            sql = ("UPDATE Topics SET Subject = ?, Topic_Hours = ?, Last_Update = ? WHERE ID = ? AND "
+                   "Topic = ?")
+        cursor.execute(sql, [subject, topic_hours, get_date_time(), id_number, topic])
+        connection.commit()
+    cursor.close()
+# End of function save_per_tutor.
+
+
+def make_database(db_path: str, tutors: list) -> None:
+    """ Create a pricing database, with every tutor found for topic Python.
+
+    Parameters:
+        db_path (str): path of the new database.
+        tutors (list): tutors, from synthetic_tutors.
+    """
+    connection = sqlite3.connect(db_path)
+    with connection:
+        for sql in CREATE_SQL:
+            connection.execute(sql)
+        connection.executemany("INSERT INTO Tutors (ID, URL, Name, Bill_Rate, Avg_Rating, Number_Ratings, "
+                               "Total_Hours, Has_Photo, Gender) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                               [tutor[:-1] for tutor in tutors])
+        connection.executemany("INSERT INTO Topics (ID, Topic, Subject, Topic_Hours) "
+                               "VALUES (?, 'Python', 1, ?)", [[tutor[0], tutor[-1]] for tutor in tutors])
+    connection.close()
+# End of function make_database.
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    tutors = synthetic_tutors(NUM_TUTORS)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Method 1, default journal mode and synchronous setting.
+        db_path = os.path.join(temp_dir, 'per_tutor.sqlite3')
+        make_database(db_path, tutors)
+        connection = sqlite3.connect(db_path)
+        start = perf_counter()
+        save_per_tutor(connection, 'SQL', 0, tutors[:PER_TUTOR_ROWS])
+        per_tutor_rate = PER_TUTOR_ROWS / (perf_counter() - start)
+        connection.close()
+
+        # Method 2.
+        db_path = os.path.join(temp_dir, 'batched.sqlite3')
+        make_database(db_path, tutors)
+        connection = connect(db_path)
+        writer = PricingWriter(connection)
+        start = perf_counter()
+        writer.add_topic('SQL', 0, tutors)
+        writer.close()
+        batched_rate = NUM_TUTORS / (perf_counter() - start)
+        connection.close()
+
+    print(f"Synthetic database of {NUM_TUTORS:,} tutors, saving every tutor for a new topic.")
+    print(f"Per tutor, commit each:  {per_tutor_rate:10,.0f} tutors/sec.")
+    print(f"PricingWriter, batched:  {batched_rate:10,.0f} tutors/sec.")
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
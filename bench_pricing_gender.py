@@ -0,0 +1,123 @@
+""" bench_pricing_gender.py
+
+SUMMARY: Benchmark pricing_gender.py on a synthetic Tutors table with NUM_TUTORS tutors:
+    1.  Per row, as pricing_gender.py used to do: fetchall(), an uncached gender guess for every name
+        part, and one UPDATE per changed tutor.
+    2.  pricing_gender.normalize_tutors: chunks, cached gender guesses, one executemany per chunk.
+        Every tutor is new, so all are in the Tutors_Dirty change log.
+    3.  pricing_gender.normalize_tutors again, after renaming NUM_CHANGED tutors, so only they are read.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+import pricing_gender
+from pricing_db import connect
+
+# Other packages.
+import os
+import random
+import tempfile
+from time import perf_counter
+
+# CONSTANTS.
+
+NUM_TUTORS = 200_000
+NUM_CHANGED = 2_000  # Tutors renamed after the first run.
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David",
+               "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah",
+               "Chris", "Alex", "Jordan", "Taylor", "Priya", "Wei", "Ahmed", "Olga", "Juan", "Maria", "Kim"]
+TITLES = ["", "", "", "", "", "", "Dr. ", "Mr. ", "Ms. ", "Prof. "]
+
+
+def make_database(db_path: str) -> None:
+    """ Create a pricing database with NUM_TUTORS synthetic tutors.
+
+    Parameters:
+        db_path (str): path of the new database.
+    """
+    rng = random.Random(42)
+    rows = [[id_number, f"{rng.choice(TITLES)}{rng.choice(FIRST_NAMES)} {chr(65 + id_number % 26)}.",
+             rng.choice(['M', 'F', 'M?', 'F?', 'Unk', 'And']), rng.choice(['None', 'BS', 'MS', 'PhD'])]
+            for id_number in range(1, NUM_TUTORS + 1)]
+    connection = connect(db_path)
+    with connection:
+        connection.executemany("INSERT INTO Tutors (ID, Name, Gender, Highest_Degree) VALUES (?, ?, ?, ?)", rows)
+    connection.close()
+# End of function make_database.
+
+
+def normalize_per_row(connection) -> int:
+    """ Normalize every tutor one row at a time, without caching gender guesses.
+
+    Parameters:
+        connection: SQLite connection.
+    Returns:
+        num_changed (int): number of tutors changed.
+    """
+    guess_gender = pricing_gender.guess_gender
+    pricing_gender.guess_gender = guess_gender.__wrapped__
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT Name, ID, Gender, Highest_Degree FROM Tutors")
+        num_changed = 0
+        for tutor_name, tutor_id, prev_gender, prev_highest_degree in cursor.fetchall():
+            new_gender, new_degree = pricing_gender.normalize_tutor(tutor_name, prev_gender, prev_highest_degree)
+            if new_degree is not None:
+                cursor.execute("UPDATE Tutors SET Highest_Degree = ? WHERE ID = ?", [new_degree, tutor_id])
+            if new_gender is not None:
+                cursor.execute("UPDATE Tutors SET Gender = ? WHERE ID = ?", [new_gender, tutor_id])
+            if new_gender is not None or new_degree is not None:
+                num_changed += 1
+        connection.commit()
+        cursor.close()
+    finally:
+        pricing_gender.guess_gender = guess_gender
+    return num_changed
+# End of function normalize_per_row.
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, 'per_row.sqlite3')
+        make_database(db_path)
+        connection = connect(db_path)
+        start = perf_counter()
+        per_row_changed = normalize_per_row(connection)
+        per_row_seconds = perf_counter() - start
+        connection.close()
+
+        db_path = os.path.join(temp_dir, 'chunked.sqlite3')
+        make_database(db_path)
+        connection = connect(db_path)
+        pricing_gender.guess_gender.cache_clear()
+        start = perf_counter()
+        chunked_changed = pricing_gender.normalize_tutors(connection)
+        chunked_seconds = perf_counter() - start
+
+        with connection:
+            connection.execute("UPDATE Tutors SET Name = 'Dr. ' || Name WHERE ID % ? = 0",
+                               [NUM_TUTORS // NUM_CHANGED])
+        start = perf_counter()
+        delta_changed = pricing_gender.normalize_tutors(connection)
+        delta_seconds = perf_counter() - start
+        connection.close()
+
+    print(f"Synthetic Tutors table of {NUM_TUTORS:,} tutors.")
+    print(f"Per row: {per_row_seconds:6.2f} s, {per_row_changed:,} tutors changed.")
+    print(f"Chunked: {chunked_seconds:6.2f} s, {chunked_changed:,} tutors changed.")
+    print(f"Delta:   {delta_seconds:6.2f} s, {delta_changed:,} tutors changed, after renaming {NUM_CHANGED:,}.")
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
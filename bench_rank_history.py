@@ -0,0 +1,120 @@
+""" bench_rank_history.py
+
+SUMMARY: Benchmark a report of how my rank changed for each topic, over NUM_RUNS runs of
+wyzant_search_topics.py, RUNS_PER_DAY a day, for NUM_TOPICS topics:
+    1.  Re-reading the csv file of every run, and taking the median rank per topic and day.
+    2.  rank_history.rank_changes, which only reads the daily rollup, Rank_Daily.
+Also times saving one run to the rank history, including updating the rollup of its day.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+from pricing_db import connect
+from rank_history import RankHistory, rank_changes, MY_TUTOR_ID
+
+# Other packages.
+import csv
+import datetime
+import os
+import random
+import tempfile
+from statistics import median
+from time import perf_counter
+
+# CONSTANTS.
+
+NUM_RUNS = 360
+RUNS_PER_DAY = 4
+NUM_TOPICS = 300
+
+
+def synthetic_runs() -> list:
+    """ Make the rows of each run, as written by wyzant_search_topics.RankWriter.
+
+    Parameters:
+    Returns:
+        runs (list): (run date-time, rows) for each run.
+    """
+    rng = random.Random(42)
+    start = datetime.datetime.now() - datetime.timedelta(days=NUM_RUNS // RUNS_PER_DAY)
+    runs = []
+    for run in range(NUM_RUNS):
+        run_ts = str(start + datetime.timedelta(hours=24 * run // RUNS_PER_DAY))[:19]
+        rows = [[f"topic {topic}", "", 500, 40, rng.choice([-1, rng.randint(1, 40)])] for topic in range(NUM_TOPICS)]
+        runs.append((run_ts, rows))
+    return runs
+
+
+def changes_from_csv(paths: list) -> dict:
+    """ Report rank changes by re-reading every csv file, as before the rank history.
+
+    Parameters:
+        paths (list): (run date-time, path) of each csv file, in order.
+    Returns:
+        changes (dict): topic: [first median rank, last median rank].
+    """
+    ranks = {}
+    for run_ts, path in paths:
+        with open(path, 'r', newline='') as file:
+            rows = csv.reader(file)
+            next(rows)
+            for topic, _, _, _, rank in rows:
+                if rank != "-1":
+                    ranks.setdefault(topic, {}).setdefault(run_ts[:10], []).append(int(rank))
+    changes = {}
+    for topic, days in ranks.items():
+        medians = [median(days[day]) for day in sorted(days)]
+        changes[topic] = [medians[0], medians[-1]]
+    return changes
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    runs = synthetic_runs()
+    with tempfile.TemporaryDirectory() as directory:
+        # Method 1.
+        paths = []
+        for run, (run_ts, rows) in enumerate(runs):
+            path = os.path.join(directory, f"search_topics_{run}.csv")
+            with open(path, 'w', newline='') as output:
+                csvwriter = csv.writer(output)
+                csvwriter.writerow(['Topic', 'Subject', 'Num_Tutors', 'Num_Tutor_Cards', 'Rank'])
+                csvwriter.writerows(rows)
+            paths.append((run_ts, path))
+        start = perf_counter()
+        changes_from_csv(paths)
+        csv_seconds = perf_counter() - start
+
+        # Method 2.
+        connection = connect(os.path.join(directory, "bench.sqlite3"))
+        save_seconds = []
+        for run_ts, rows in runs:
+            history = RankHistory(connection, [MY_TUTOR_ID], run_ts)
+            for topic, subject, num_tutors, num_cards, rank in rows:
+                history.add(topic, 0, num_tutors, num_cards, [rank])
+            start = perf_counter()
+            history.close()
+            save_seconds.append(perf_counter() - start)
+        start = perf_counter()
+        rank_changes(connection, MY_TUTOR_ID, days=NUM_RUNS // RUNS_PER_DAY + 1)
+        rollup_seconds = perf_counter() - start
+        connection.close()
+
+    print(f"{NUM_RUNS} runs of {NUM_TOPICS} topics.")
+    print(f"Re-reading every csv file: {csv_seconds:.3f} seconds.")
+    print(f"Rank history rollup: {rollup_seconds:.3f} seconds.")
+    print(f"Saving one run: {median(save_seconds):.3f} seconds, median.")
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
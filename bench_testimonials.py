@@ -0,0 +1,110 @@
+""" bench_testimonials.py
+
+SUMMARY: Benchmark reading NUM_TESTIMONIALS testimonials from a local copy of the testimonial carousel of the
+job application form, fixtures/testimonials_page.html, filled with made-up testimonials:
+    1.  wyzant_testimonials.click_through_testimonials: click the "›" arrow, and read each testimonial with
+        4 find_element(s) calls, in headless Chrome.
+    2.  wyzant_testimonials.extract_testimonials: read all of them at once from the page source.
+Method 2 is also timed on the page source alone, without a browser.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+from wyzant_driver import chrome_driver, quit_driver
+from wyzant_testimonials import click_through_testimonials, extract_testimonials
+
+# Other packages.
+import json
+import random
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from threading import Thread
+from time import perf_counter
+
+# CONSTANTS.
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'testimonials_page.html'
+NUM_TESTIMONIALS = 500
+WORDS = ("python sql calculus loops functions homework exam project patient clear explained helpful great "
+         "understand code linux bash precalc GRE data queries recursion lesson week grade confident").split()
+
+
+def synthetic_page() -> bytes:
+    """ Make the fixture page, with NUM_TESTIMONIALS made-up testimonials.
+
+    Parameters:
+    Returns:
+        page (bytes): HTML.
+    """
+    rng = random.Random(42)
+    testimonials = [{"studentName": f"Student {number} {chr(65 + number % 26)}.",
+                     "sessions": rng.randint(1, 60),
+                     "title": " ".join(rng.choices(WORDS, k=4)).capitalize(),
+                     "body": " ".join(rng.choices(WORDS, k=rng.randint(20, 120))).capitalize() + "."}
+                    for number in range(1, NUM_TESTIMONIALS + 1)]
+    page = FIXTURE.read_text(encoding='utf-8')
+    page = page.replace("var testimonials = [];", f"var testimonials = {json.dumps(testimonials)};")
+    return page.encode('utf-8')
+
+
+class StubPageHandler(BaseHTTPRequestHandler):
+    """ Serve the fixture page at any path. """
+    page = synthetic_page()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.page)))
+        self.end_headers()
+        self.wfile.write(self.page)
+
+    def log_message(self, *args):
+        pass
+# End of class StubPageHandler.
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    start = perf_counter()
+    rows = extract_testimonials(StubPageHandler.page.decode('utf-8'))
+    source_seconds = perf_counter() - start
+    assert len(rows) == NUM_TESTIMONIALS
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubPageHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    page_url = f"http://127.0.0.1:{server.server_port}/tutor/jobs/1"
+
+    driver = chrome_driver()
+    try:
+        driver.get(page_url)
+        start = perf_counter()
+        rows_clicked = list(click_through_testimonials(driver))
+        click_seconds = perf_counter() - start
+
+        driver.get(page_url)
+        start = perf_counter()
+        rows_extracted = extract_testimonials(driver.page_source)
+        extract_seconds = perf_counter() - start
+    finally:
+        quit_driver(driver)
+        server.shutdown()
+
+    print(f"{NUM_TESTIMONIALS} testimonials.")
+    print(f"Clicking through:           {click_seconds:8.3f} seconds, {len(rows_clicked)} testimonials.")
+    print(f"From the page source:       {extract_seconds:8.3f} seconds, {len(rows_extracted)} testimonials, "
+          f"same rows: {rows_clicked == rows_extracted}.")
+    print(f"Parsing the source only:    {source_seconds:8.3f} seconds.")
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+""" bench_topic_tagger.py
+
+SUMMARY: Benchmark tagging NUM_TEXTS synthetic testimonials with a dictionary of NUM_KEYWORDS keywords:
+    1.  One substring search per keyword in each text, as wyzant_testimonials.py used to do.
+    2.  topic_tagger.TopicTagger: split each text into words once, and intersect them with the keywords.
+Also counts the texts the two methods tag differently, since method 1 also matches inside words, and checks
+TopicTagger against a compiled regex of whole-word matches, which must agree with it on the first NUM_REGEX_TEXTS.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+from topic_tagger import TopicTagger, DEFAULT_TOPICS, DEFAULT_EXACT_TOPICS
+
+# Other packages.
+import random
+import re
+from time import perf_counter
+
+# CONSTANTS.
+
+NUM_TEXTS = 10_000
+NUM_KEYWORDS = 200
+NUM_REGEX_TEXTS = 1000  # Texts checked against the regex of whole words, which is slow.
+FILLER = ("the she was very patient and explained every step clearly my son now understands his homework "
+          "we met weekly before the exam highly recommend great tutor mysql development-loop coder pre-calculus "
+          "sql-heavy c++ python's").split()
+# Characters of a word, for the regex of whole-word matches.
+WORD_CHARACTERS = "A-Za-z0-9_+#"
+
+
+def synthetic_topics() -> tuple:
+    """ Make a dictionary of NUM_KEYWORDS keywords: the default topics, plus made-up ones.
+
+    Parameters:
+    Returns:
+        (topics, exact_topics), as for TopicTagger.
+    """
+    rng = random.Random(42)
+    topics = dict(DEFAULT_TOPICS)
+    while len(topics) + len(DEFAULT_EXACT_TOPICS) < NUM_KEYWORDS:
+        keyword = "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(4, 10)))
+        topics[keyword] = keyword.capitalize()
+    return topics, dict(DEFAULT_EXACT_TOPICS)
+
+
+def synthetic_texts(keywords: list) -> list:
+    """ Make NUM_TEXTS testimonials, of filler words and a few keywords.
+
+    Parameters:
+        keywords (list): keywords to mention.
+    Returns:
+        texts (list): one str per testimonial.
+    """
+    rng = random.Random(7)
+    texts = []
+    for _ in range(NUM_TEXTS):
+        words = rng.choices(FILLER, k=rng.randint(30, 150)) + rng.choices(keywords, k=rng.randint(0, 4))
+        rng.shuffle(words)
+        texts.append(" ".join(words).capitalize() + ".")
+    return texts
+
+
+def tag_substrings(text: str, topics: dict, exact_topics: dict) -> list:
+    """ Tag a text with one substring search per keyword, as wyzant_testimonials.py used to do. """
+    used_topics = set()
+    for keyword, topic in exact_topics.items():
+        if keyword in text:
+            used_topics.add(topic)
+    search_me = text.lower()
+    for keyword, topic in topics.items():
+        if keyword in search_me:
+            used_topics.add(topic)
+    return sorted(used_topics)
+
+
+def whole_word_regex(keywords: list, flags: int = 0):
+    """ Make one compiled regex matching any of the keywords as whole words, optionally plural.
+
+    Parameters:
+        keywords (list): keywords, words separated by spaces.
+        flags (int): re flags, such as re.IGNORECASE.
+    Returns:
+        regex (re.Pattern): regex whose named groups are the indices of the keywords.
+    """
+    alternatives = []
+    for index, keyword in enumerate(keywords):
+        pattern = f"[^{WORD_CHARACTERS}]+".join(re.escape(word) for word in keyword.split())
+        plural = "(?:s|es)?" if keyword[-1].isalpha() else ""
+        alternatives.append(f"(?P<k{index}>{pattern}{plural})")
+    return re.compile(f"(?<![{WORD_CHARACTERS}])(?:{'|'.join(alternatives)})(?![{WORD_CHARACTERS}])", flags)
+
+
+def tag_regex(text: str, regexes: list) -> list:
+    """ Tag a text with compiled regexes of whole-word matches.
+
+    Parameters:
+        text (str): text to tag.
+        regexes (list): (regex from whole_word_regex, topic of each keyword) for each regex.
+    Returns:
+        topics (list): topics found, sorted.
+    """
+    used_topics = set()
+    for regex, keyword_topics in regexes:
+        for match in regex.finditer(text):
+            used_topics.add(keyword_topics[int(match.lastgroup[1:])])
+    return sorted(used_topics)
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    topics, exact_topics = synthetic_topics()
+    texts = synthetic_texts(list(topics) + list(exact_topics))
+
+    start = perf_counter()
+    substring_tags = [tag_substrings(text, topics, exact_topics) for text in texts]
+    substring_seconds = perf_counter() - start
+
+    start = perf_counter()
+    tagger = TopicTagger(topics, exact_topics)
+    build_seconds = perf_counter() - start
+    start = perf_counter()
+    tagger_tags = [sorted(tags) for tags in tagger.tag_all(texts)]
+    tagger_seconds = perf_counter() - start
+
+    # Case-insensitive keywords overlap the exact ones, so overlapping matches need a regex for each.
+    regexes = [(whole_word_regex(list(keywords), flags), list(keywords.values()))
+               for keywords, flags in [(topics, re.IGNORECASE), (exact_topics, 0)]]
+    start = perf_counter()
+    regex_tags = [tag_regex(text, regexes) for text in texts[:NUM_REGEX_TEXTS]]
+    regex_seconds = perf_counter() - start
+
+    differ = sum(old != new for old, new in zip(substring_tags, tagger_tags))
+    missed = sum(old != new for old, new in zip(regex_tags, tagger_tags))
+    print(f"{NUM_TEXTS} texts, {len(topics) + len(exact_topics)} keywords.")
+    print(f"Substring search per keyword: {substring_seconds:.3f} seconds.")
+    print(f"Regex of whole words:         {regex_seconds * NUM_TEXTS / NUM_REGEX_TEXTS:.3f} seconds, "
+          f"from {NUM_REGEX_TEXTS} texts.")
+    print(f"TopicTagger:                  {tagger_seconds:.3f} seconds, plus {build_seconds:.3f} to build.")
+    print(f"Texts tagged differently (substring matches inside words, such as mysql): {differ}.")
+    print(f"Texts tagged differently from the regex of whole words (should be 0): {missed}.")
+    if missed:
+        raise SystemExit("TopicTagger does not match whole words as the regex does.")
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
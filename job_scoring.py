@@ -0,0 +1,168 @@
+""" job_scoring.py
+
+SUMMARY: Score new jobs on Wyzant.com by how well they fit me, so that only the best ones alert me at once.
+Class JobScorer is built once from a dictionary of rules, and scores the params dict of a job, as scraped by
+wyzant_jobs.py, by adding:
+    1.  The weight of each topic its topic, subject and description mention, tagged by topic_tagger.TopicTagger.
+    2.  rate_weight for each dollar per hour its rate is above min_rate, or below_min_rate if it is below.
+    3.  The weight of the first keyword in grade_weights found in its student grade level.
+    4.  no_applications if no tutor has applied yet.
+Jobs scoring at least alert_score alert at once, the rest are batched.
+Subject and student grade level are only scraped when the job details are shown, so with the HTTP backend of
+wyzant_jobs.py (USE_HTTP_BACKEND), rule 3 never counts, and rule 1 only sees the topic and description.
+
+The rules are DEFAULT_RULES, or, if it exists, the JSON file SCORING_PATH, which need only have the rules that
+differ from DEFAULT_RULES:
+{"topic_weights": {"Topic": weight, ...}, "min_rate": 40, "below_min_rate": -5, "rate_weight": 0.1,
+ "grade_weights": {"keyword": weight, ...}, "no_applications": 3, "alert_score": 5}
+
+Used by:
+wyzant_jobs.py.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+from topic_tagger import TopicTagger, load_tagger
+
+# Other packages.
+import json
+import os
+import re
+
+# CONSTANTS.
+
+SCORING_PATH = './job_scoring.json'
+
+DEFAULT_RULES = {'topic_weights': {'Python': 5, 'SQL': 4, 'Web Scraping': 4, 'Linux': 3, 'VBA': 2, 'Coding': 2,
+                                   'Calculus': 1, 'Pre-Calculus': 1, 'GRE': 1},
+                 'min_rate': 40,  # Dollars per hour.
+                 'below_min_rate': -5,
+                 'rate_weight': 0.1,  # Per dollar per hour above min_rate.
+                 'grade_weights': {'graduate': 2, 'adult': 2, 'college': 1, 'high school': 0, 'grade': -1},
+                 'no_applications': 3,
+                 'alert_score': 5}
+
+# Keys of the params dict of a job, as in wyzant_jobs.py.
+JOB_TOPIC = "Topic"
+JOB_SUBJECT = "Subject"
+PAY_RATE = "Rate"
+GRADE_LEVEL = "Student grade level"
+JOB_DESCRIPTION = "Description"
+APPLICATIONS = "Applications"
+
+RATE_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+def parse_rate(rate: str) -> float:
+    """ Function parse_rate.
+
+    Parameters:
+        rate (str): rate of a job, such as "$40/hr", or None.
+    Returns: Dollars per hour, or None if there is no number in rate.
+    """
+    match = RATE_NUMBER.search((rate or "").replace(",", ""))
+    return float(match.group()) if match else None
+
+
+class JobScorer:
+    """ Scores jobs by the rules it was built from. """
+
+    def __init__(self, rules: dict, tagger: TopicTagger):
+        """ Function __init__.
+
+        Parameters:
+            rules (dict): rules, as described above.  Rules missing are as in DEFAULT_RULES.
+            tagger (TopicTagger): tags jobs with the topics they mention.
+        """
+        rules = {**DEFAULT_RULES, **rules}
+        self.tagger = tagger
+        self.topic_weights = dict(rules['topic_weights'])
+        self.min_rate = float(rules['min_rate'])
+        self.below_min_rate = float(rules['below_min_rate'])
+        self.rate_weight = float(rules['rate_weight'])
+        # Lowercase, in the order to look for them.
+        self.grade_weights = [(keyword.lower(), float(weight)) for keyword, weight in rules['grade_weights'].items()]
+        self.no_applications = float(rules['no_applications'])
+        self.alert_score = float(rules['alert_score'])
+
+    @classmethod
+    def from_file(cls, path: str, tagger: TopicTagger):
+        """ Function from_file.
+
+        Parameters:
+            path (str): path of a JSON file of rules, as described above.
+            tagger (TopicTagger): tags jobs with the topics they mention.
+        Returns: JobScorer.
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            return cls(json.load(file), tagger)
+
+    def score(self, params: dict) -> tuple:
+        """ Function score.
+
+        Parameters:
+            params (dict): job properties, as scraped by wyzant_jobs.py.
+        Returns: (score, reasons), where reasons (list) are str such as "Python +5", for each rule that counted.
+        """
+        score = 0.0
+        reasons = []
+
+        # Topics.
+        for tag in self.tagger.tags(params.get(JOB_TOPIC), params.get(JOB_SUBJECT), params.get(JOB_DESCRIPTION)):
+            weight = self.topic_weights.get(tag, 0)
+            if weight:
+                score += weight
+                reasons.append(f"{tag} {weight:+g}")
+
+        # Rate.
+        rate = parse_rate(params.get(PAY_RATE))
+        if rate is not None:
+            weight = self.below_min_rate if rate < self.min_rate else self.rate_weight * (rate - self.min_rate)
+            if weight:
+                score += weight
+                reasons.append(f"${rate:g}/hr {weight:+g}")
+
+        # Student grade level.
+        grade_level = params.get(GRADE_LEVEL, "").lower()
+        for keyword, weight in self.grade_weights:
+            if keyword in grade_level:
+                if weight:
+                    score += weight
+                    reasons.append(f"{keyword} {weight:+g}")
+                break
+
+        # Applications.
+        if params.get(APPLICATIONS) == "N" and self.no_applications:
+            score += self.no_applications
+            reasons.append(f"no applications {self.no_applications:+g}")
+
+        return round(score, 2), reasons
+
+    def is_urgent(self, score: float) -> bool:
+        """ Function is_urgent.
+
+        Parameters:
+            score (float): score of a job.
+        Returns: True if the job should alert at once, False if it can wait for the next batch.
+        """
+        return score >= self.alert_score
+# End of class JobScorer.
+
+
+def load_scorer(path: str = SCORING_PATH, tagger: TopicTagger = None) -> JobScorer:
+    """ Function load_scorer.
+
+    Parameters:
+        path (str): path of a JSON file of rules.
+        tagger (TopicTagger): tags jobs with the topics they mention, or None for topic_tagger.load_tagger().
+    Returns: JobScorer of the rules in the file, if it exists, else of the default rules.
+    """
+    tagger = tagger or load_tagger()
+    if path and os.path.isfile(path):
+        return JobScorer.from_file(path, tagger)
+    return JobScorer(DEFAULT_RULES, tagger)
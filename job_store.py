@@ -0,0 +1,184 @@
+""" job_store.py
+
+SUMMARY: Store of every job listing wyzant_jobs.py has seen, in SQLite, so that it knows which jobs are new
+even after it restarts, and so that job volume, rate and time-to-fill can be reported.
+Table Jobs has one row per job, primary key Job_ID: when it was first and last seen, when it was posted
+(first seen, less its age then), when it was first seen with applications, its topic and rate, and the
+params dict scraped from its job card, as JSON.  Class JobStore loads the IDs of all jobs seen into a set on
+startup, for seen-before lookups in O(1), and saves each poll in one transaction.
+
+A job is taken to be filled when it is no longer listed: its time-to-fill is from when it was posted to when
+it was last seen, for jobs last seen before the latest poll.
+
+Run on its own, reports the number of new jobs, their average rate, and the median time-to-fill, for each of
+the last DAYS days.
+
+Used by:
+wyzant_jobs.py.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+from job_scoring import parse_rate
+
+# Other packages.
+import argparse
+import datetime
+import json
+import os
+import sqlite3
+from statistics import median
+
+# CONSTANTS.
+
+DB_PATH = './output/jobs.sqlite3'
+TIMEOUT = 30  # Seconds.
+DAYS = 30  # Days covered by the report.
+MAX_JOB_AGE = 60 * 24 * 90  # Minutes.  Older ages are not believed, and Posted is left NULL.
+
+# Keys of the params dict of a job, as in wyzant_jobs.py.
+JOB_ID = "Job ID"
+APPLICATIONS = "Applications"
+JOB_AGE = "Age"
+JOB_TOPIC = "Topic"
+PAY_RATE = "Rate"
+
+CREATE_SQL = ["CREATE TABLE IF NOT EXISTS Jobs (Job_ID INTEGER PRIMARY KEY, First_Seen TEXT NOT NULL, "
+              "Last_Seen TEXT NOT NULL, Posted TEXT, First_Applied TEXT, Topic TEXT, Rate REAL, Params TEXT)",
+              "CREATE INDEX IF NOT EXISTS Jobs_First_Seen ON Jobs (First_Seen)",
+              "CREATE INDEX IF NOT EXISTS Jobs_Last_Seen ON Jobs (Last_Seen)"]
+UPSERT_JOB_SQL = ("INSERT INTO Jobs (Job_ID, First_Seen, Last_Seen, Posted, First_Applied, Topic, Rate, Params) "
+                  "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                  "ON CONFLICT (Job_ID) DO UPDATE SET Last_Seen = excluded.Last_Seen, "
+                  "First_Applied = coalesce(First_Applied, excluded.First_Applied), Topic = excluded.Topic, "
+                  "Rate = excluded.Rate, Params = excluded.Params")
+REPORT_SQL = ("SELECT substr(First_Seen, 1, 10), Rate, Last_Seen < (SELECT max(Last_Seen) FROM Jobs), "
+              "24 * (julianday(Last_Seen) - julianday(Posted)) "
+              "FROM Jobs WHERE First_Seen >= ? ORDER BY First_Seen")
+
+
+def get_date_time() -> str:
+    """ Function get_date_time.
+
+    Parameters:
+    Returns: Current date-time as string in 'YYYY-MM-DD HH:MM:SS' format.
+    """
+    return str(datetime.datetime.now())[:19]
+
+
+def open_store(db_path: str = DB_PATH, timeout: float = TIMEOUT) -> sqlite3.Connection:
+    """ Function open_store.  Open the job store in WAL mode, creating it if needed.
+
+    Parameters:
+        db_path (str): path of the job store.
+        timeout (float): seconds to wait for a lock held by another connection.
+    Returns: SQLite connection.
+    """
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    connection = sqlite3.connect(database=db_path, timeout=timeout)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    with connection:
+        for sql in CREATE_SQL:
+            connection.execute(sql)
+    return connection
+
+
+class JobStore:
+    """ Every job seen, on disk, with the IDs of all of them in memory. """
+
+    def __init__(self, connection: sqlite3.Connection):
+        """ Function __init__.
+
+        Parameters:
+            connection: SQLite connection, from open_store().
+        """
+        self.connection = connection
+        self.job_ids = {row[0] for row in connection.execute("SELECT Job_ID FROM Jobs")}
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self.job_ids
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def record(self, job_cards: list, poll_ts: str = None) -> list:
+        """ Function record.  Save the jobs of one poll, in one transaction.
+
+        Parameters:
+            job_cards (list): a params dict for each job listed.
+            poll_ts (str): date-time of the poll, in 'YYYY-MM-DD HH:MM:SS' format, by default now.
+        Returns: The params dicts of the jobs not seen before, in the order given.
+        """
+        if not job_cards:
+            return []
+        poll_ts = poll_ts or get_date_time()
+        poll_time = datetime.datetime.fromisoformat(poll_ts)
+        rows = []
+        new_jobs = []
+        for params in job_cards:
+            job_id = params[JOB_ID]
+            age = params.get(JOB_AGE, 0)
+            posted = str(poll_time - datetime.timedelta(minutes=age))[:19] if 0 <= age <= MAX_JOB_AGE else None
+            applied = poll_ts if params.get(APPLICATIONS) == "Y" else None
+            rows.append([job_id, poll_ts, poll_ts, posted, applied, params.get(JOB_TOPIC),
+                         parse_rate(params.get(PAY_RATE)), json.dumps(params)])
+            if job_id not in self.job_ids:
+                new_jobs.append(params)
+        with self.connection:
+            self.connection.executemany(UPSERT_JOB_SQL, rows)
+        self.job_ids.update(params[JOB_ID] for params in new_jobs)
+        return new_jobs
+# End of class JobStore.
+
+
+def daily_report(connection: sqlite3.Connection, days: int = DAYS) -> list:
+    """ Function daily_report.
+
+    Parameters:
+        connection: SQLite connection.
+        days (int): days covered.
+    Returns: (day, new jobs, average rate, jobs filled, median hours to fill) for each day jobs were first seen,
+             in order.  Jobs filled are those first seen that day and no longer listed.
+    """
+    since = str(datetime.date.today() - datetime.timedelta(days=days))
+    groups = {}
+    for day, rate, filled, hours in connection.execute(REPORT_SQL, [since]):
+        groups.setdefault(day, []).append((rate, filled, hours))
+
+    report = []
+    for day, jobs in groups.items():
+        rates = [rate for rate, _, _ in jobs if rate is not None]
+        filled = [hours for _, filled, hours in jobs if filled]
+        hours = [hours for hours in filled if hours is not None]
+        report.append((day, len(jobs), round(sum(rates) / len(rates), 2) if rates else None, len(filled),
+                       round(median(hours), 2) if hours else None))
+    return report
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    parser = argparse.ArgumentParser(description="Report job volume, rate and time-to-fill from the job store.")
+    parser.add_argument("--days", type=int, default=DAYS, help="days covered by the report")
+    parser.add_argument("--db", default=DB_PATH, help="path of the job store")
+    args = parser.parse_args()
+
+    connection = open_store(args.db)
+    print(['Day', 'New_Jobs', 'Avg_Rate', 'Filled', 'Median_Hours_To_Fill'])
+    for row in daily_report(connection, args.days):
+        print(list(row))
+    connection.close()
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+""" parquet_sink.py
+
+SUMMARY: Optional columnar output, in Parquet files, with typed columns, for fast analysis.
+Class ParquetSink buffers rows and writes them to a Parquet file ROW_GROUP_SIZE rows at a time,
+one row group each.  Needs pyarrow, which is optional: the other outputs work without it.
+
+Used by:
+wyzant_history.py, for the tutoring history.
+pricing_parquet.py, for the Tutors and Topics tables of the pricing database.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+import datetime
+import os
+from decimal import Decimal
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# CONSTANTS.
+
+ROW_GROUP_SIZE = 10_000  # Rows.
+COMPRESSION = 'zstd'
+
+
+def require_pyarrow() -> None:
+    """ Function require_pyarrow.  Raise ImportError, with instructions, if pyarrow is not installed.
+
+    Parameters:
+    Returns:
+    """
+    if pa is None:
+        raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+
+
+def to_date(value: str, formats: list):
+    """ Function to_date.
+
+    Parameters:
+        value (str): a date, or "" or None if missing.
+        formats (list): strptime formats to try.
+    Returns: datetime.date, or None if value is missing or not in any of formats.
+    """
+    for date_format in formats if value else []:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            pass
+    return None
+
+
+def to_decimal(value) -> Decimal:
+    """ Function to_decimal.
+
+    Parameters: A number, or a string of one, or "" or None if missing.
+    Returns: Decimal, or None if value is missing.
+    """
+    if value is None or value == "":
+        return None
+    return Decimal(str(value).replace(",", ""))
+
+
+def to_int(value) -> int:
+    """ Function to_int.
+
+    Parameters: A number, or a string of one, or "" or None if missing.
+    Returns: int, or None if value is missing.
+    """
+    if value is None or value == "":
+        return None
+    return int(value)
+
+
+class ParquetSink:
+    """ Writes rows to a Parquet file, in row groups of row_group_size rows. """
+
+    def __init__(self, path: str, schema, convert=None, row_group_size: int = ROW_GROUP_SIZE):
+        """ Function __init__.
+
+        Parameters:
+            path (str): path of the Parquet file, replaced if it exists.
+            schema: pyarrow.Schema of the rows.
+            convert: function from one row to a dict of column values, if rows are not already dicts.
+            row_group_size (int): rows per row group.
+        """
+        require_pyarrow()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.schema = schema
+        self.convert = convert
+        self.row_group_size = row_group_size
+        self.writer = pq.ParquetWriter(path, schema, compression=COMPRESSION)
+        self.rows = []
+        self.num_written = 0
+
+    def write(self, row) -> None:
+        """ Buffer one row, and write the buffer as a row group if it is full. """
+        self.rows.append(self.convert(row) if self.convert else row)
+        if len(self.rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """ Write all buffered rows as one row group. """
+        if not self.rows:
+            return
+        self.writer.write_table(pa.Table.from_pylist(self.rows, schema=self.schema))
+        self.num_written += len(self.rows)
+        self.rows.clear()
+
+    def close(self) -> None:
+        """ Write any buffered rows, and close the file. """
+        self.flush()
+        self.writer.close()
+# End of class ParquetSink.
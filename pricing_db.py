@@ -0,0 +1,135 @@
+""" pricing_db.py
+
+SUMMARY: Database access for the survey and analysis of tutors (the competition).
+Function connect opens the pricing database in WAL mode, tuned for bulk writes.
+Class PricingWriter buffers scraped tutors, and writes them to the Tutors and Topics tables in batches,
+with one INSERT ... ON CONFLICT DO UPDATE executemany per table, in one transaction per batch.
+
+Used by:
+Part 1: wyzant_pricing.py, and wyzant_search_topics.py with --pricing.
+Part 2: wyzant_pricing_detail.py
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+from pricing_schema import migrate
+
+import datetime
+import sqlite3
+
+# CONSTANTS.
+
+TIMEOUT = 30  # Seconds.
+BATCH_SIZE = 500  # Tutors per transaction.
+
+# ON CONFLICT relies on the primary keys created by pricing_schema.
+UPSERT_TUTOR_SQL = ("INSERT INTO Tutors (ID, URL, Name, Bill_Rate, Avg_Rating, Number_Ratings, Total_Hours, "
+                    "Has_Photo, Gender, Last_Update) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (ID) DO UPDATE SET URL = excluded.URL, Name = excluded.Name, "
+                    "Bill_Rate = excluded.Bill_Rate, Avg_Rating = excluded.Avg_Rating, "
+                    "Number_Ratings = excluded.Number_Ratings, Total_Hours = excluded.Total_Hours, "
+                    "Has_Photo = excluded.Has_Photo, Gender = excluded.Gender, Last_Update = excluded.Last_Update")
+
+UPSERT_TOPIC_SQL = ("INSERT INTO Topics (ID, Topic, Subject, Topic_Hours, Last_Update) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (ID, Topic) DO UPDATE SET Subject = excluded.Subject, "
+                    "Topic_Hours = excluded.Topic_Hours, Last_Update = excluded.Last_Update")
+
+
+def get_date_time() -> str:
+    """ Function get_date_time.
+
+    Parameters:
+    Returns: Current date-time as string in 'YYYY-MM-DD HH:MM:SS' format.
+    """
+    return str(datetime.datetime.now())[:19]
+
+
+def connect(db_path: str, timeout: float = TIMEOUT) -> sqlite3.Connection:
+    """ Function connect.  Open the pricing database in WAL mode, with synchronous = NORMAL, so that
+    a commit does not wait for the disk, and readers do not block the writer.
+    Creates or migrates the schema if needed.
+
+    Parameters:
+        db_path (str): path of the pricing database.
+        timeout (float): seconds to wait for a lock held by another connection.
+    Returns: SQLite connection.
+    """
+    connection = sqlite3.connect(database=db_path, timeout=timeout)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    migrate(connection)
+    return connection
+
+
+class PricingWriter:
+    """ Buffers tutors scraped from search results, and saves them BATCH_SIZE at a time. """
+
+    def __init__(self, connection: sqlite3.Connection, batch_size: int = BATCH_SIZE):
+        """ Function __init__.
+
+        Parameters:
+            connection: SQLite connection, from connect().
+            batch_size (int): tutors per transaction.
+        """
+        self.connection = connection
+        self.batch_size = batch_size
+        self.tutor_rows = []
+        self.topic_rows = []
+        self.num_written = 0
+
+    def add(self, topic: str, subject: int, tutor: list) -> None:
+        """ Buffer one tutor, and write the buffer if it is full.
+
+        Parameters:
+            topic (str): topic searched for.
+            subject (int): 1 if the topic is a subject, else 0.
+            tutor (list): [ID, URL, name, bill rate, average rating, number of ratings, total hours,
+                           has photo, gender, topic hours].
+        """
+        id_number, *tutor_columns, topic_hours = tutor
+        last_update = get_date_time()
+        self.tutor_rows.append([id_number, *tutor_columns, last_update])
+        self.topic_rows.append([id_number, topic, subject, topic_hours, last_update])
+        if len(self.tutor_rows) >= self.batch_size:
+            self.flush()
+
+    def add_topic(self, topic: str, subject: int, tutors: list) -> None:
+        """ Buffer all the tutors found for a topic.
+
+        Parameters:
+            topic (str): topic searched for.
+            subject (int): 1 if the topic is a subject, else 0.
+            tutors (list): tutors, as for add().
+        """
+        for tutor in tutors:
+            self.add(topic, subject, tutor)
+
+    def add_hit(self, hit) -> None:
+        """ Buffer the tutor of a search hit, if any.
+
+        Parameters:
+            hit: wyzant_search.SearchHit.
+        """
+        if hit.tutor is not None:
+            self.add(hit.topic, hit.subject, hit.tutor)
+
+    def flush(self) -> None:
+        """ Write all buffered tutors in one transaction. """
+        if not self.tutor_rows:
+            return
+        with self.connection:
+            self.connection.executemany(UPSERT_TUTOR_SQL, self.tutor_rows)
+            self.connection.executemany(UPSERT_TOPIC_SQL, self.topic_rows)
+        self.num_written += len(self.tutor_rows)
+        self.tutor_rows.clear()
+        self.topic_rows.clear()
+
+    def close(self) -> None:
+        """ Write any buffered tutors. """
+        self.flush()
+# End of class PricingWriter.
@@ -2,6 +2,10 @@
 
 SUMMARY: Part 3 of a survey and analysis of tutors (the competition).
 Fixes issues with highest_degree and gender from Parts 1 and 2.
+Reads tutors CHUNK_SIZE at a time, in ID order, and writes the changes to each chunk with one executemany.
+Gender guesses are cached per name part, since first names repeat a lot.
+Only tutors added, or with a changed name, gender or highest degree, since the last run are read, from the
+Tutors_Dirty change log kept by triggers (see pricing_schema.py).  Use --all to read every tutor.
 
 Part 1: wyzant_pricing.py.
 Part 2: wyzant_pricing_detail.py
@@ -15,29 +19,15 @@ VERSION: 0.6.0
 
 DATE: Sep 02, 2023
 """
-import sqlite3
-import gender_guesser.detector as gender_guesser
+from pricing_db import connect
+from wyzant_common import guess_gender
+
+import argparse
 
 # CONSTANTS.
 DB_PATH = r'C:\Users\david\Desktop\Wyzant\Pricing\Pricing.sqlite3'
 TIMEOUT = 10
-
-# Instantiate gender guesser
-""" Output:
-unknown (name not found), saved as Unk
-andy (androgynous), saved as And
-male, saved as M
-female, saved as F
-mostly_male, saved as M?
-mostly_female, saved as F?
-"""
-guess = gender_guesser.Detector()
-guess_dict = {'unknown': 'Unk',
-              'andy': 'And',
-              'male': 'M',
-              'female': 'F',
-              'mostly_male': 'M?',
-              'mostly_female': 'F?'}
+CHUNK_SIZE = 5000  # Tutors.
 
 degree_dict = {'None': 0,
                'BS': 1,
@@ -46,92 +36,158 @@ degree_dict = {'None': 0,
                'Dr': 3}
 
 
+def normalize_tutor(tutor_name: str, prev_gender: str, prev_highest_degree: str) -> tuple:
+    """ Function normalize_tutor.  Work out a tutor's gender and highest degree from their name.
+
+    Parameters:
+        tutor_name (str): tutor's name.
+        prev_gender (str): gender in the Tutors table.
+        prev_highest_degree (str): highest degree in the Tutors table.
+    Returns: (new gender, new highest degree), each None if unchanged.
+    """
+    name_parts = (tutor_name or "").split()
+
+    # Process multi-part names.
+    new_degree = ""
+    new_name_parts = []  # The items in name_parts that aren't titles, degrees, or single characters.
+    gender_parts = []  # The gender of names in new_name_parts that are "M", "M?", "F", or "F?"
+    for name_part in name_parts:
+        name_part = name_part.replace(".", "").replace(")", "").replace("(", "")
+        if name_part in ["Ms", "Miss", "Mrs"]:
+            gender_parts.append("F")
+        elif name_part == "Mr":
+            gender_parts.append("M")
+        elif name_part in ["Dr", "PhD", "Prof", "Md"]:
+            if degree_dict.get(prev_highest_degree, 0) < 3:
+                new_degree = "PhD"
+        elif len(name_part) > 1:
+            new_name_parts.append(name_part)
+            gender_part = guess_gender(name_part)
+            if gender_part not in ["And", "Unk"]:
+                # "And" and "Unk" useless info, only use M, M?, F, F?.
+                gender_parts.append(gender_part)
+        if len(gender_parts) > 2:
+            print("MAXLEN: ", len(gender_parts))
+
+    # Process gender info.
+    new_gender = ""  # No change.
+    if len(gender_parts) == 1:
+        candidate_gender = gender_parts[0]
+        if prev_gender in ["Unk", "And"]:
+            new_gender = candidate_gender
+            # print("Assign definite gender:", new_gender, prev_gender)
+        elif prev_gender == candidate_gender + '?':
+            new_gender = candidate_gender
+            # print("Promote F? to F or M? to M:", new_gender, prev_gender)
+        elif candidate_gender == prev_gender + '?':
+            new_gender = ""  # Let's not demote F to F? or M to M?.
+        elif candidate_gender == prev_gender:
+            new_gender = ""  # No change.
+        else:
+            new_gender = ""  # Inconsistent results.  Leave old value.
+    elif len(gender_parts) == 2:
+        gender_parts.sort()
+        if gender_parts[0][0] != gender_parts[1][0]:
+            new_gender = ""  # Inconsistent results.  Leave old value.
+        elif gender_parts[0][0] == gender_parts[1][0]:
+            candidate_gender = gender_parts[0]
+            if prev_gender in ["Unk", "And"] and candidate_gender[0] in ["M", "F"]:
+                new_gender = candidate_gender  # print("Assign definite gender:", new_gender, prev_gender)
+            elif prev_gender == new_gender + '?':
+                new_gender = candidate_gender  # print("Promote F? to F or M? to M:", new_gender, prev_gender)
+            else:
+                new_gender = ""  # Pass on other options.
+        else:
+            new_gender = ""  # Pass on other options.
+    elif len(gender_parts) >= 3:
+        new_gender = ""
+        print("EXTRA LONG")
+
+    return new_gender or None, new_degree or None
+
+
+def normalize_chunk(rows: list) -> list:
+    """ Function normalize_chunk.  Work out new genders and highest degrees for a chunk of tutors.
+
+    Parameters:
+        rows (list): (Name, ID, Gender, Highest_Degree) of each tutor.
+    Returns: [new gender, new highest degree, ID] for each tutor that changed, None meaning unchanged.
+    """
+    names, tutor_ids, prev_genders, prev_degrees = zip(*rows)
+    new_values = map(normalize_tutor, names, prev_genders, prev_degrees)
+    return [[new_gender, new_degree, tutor_id]
+            for tutor_id, (new_gender, new_degree) in zip(tutor_ids, new_values)
+            if new_gender is not None or new_degree is not None]
+
+
+def normalize_tutors(connection, chunk_size: int = CHUNK_SIZE, all_tutors: bool = False) -> int:
+    """ Function normalize_tutors.  Fix genders and highest degrees of the tutors in the Tutors_Dirty change
+    log, or of all tutors, one chunk at a time.  Each chunk is removed from the change log in the same
+    transaction as its changes are written, so an interrupted run resumes where it stopped.  With all_tutors,
+    the change log is cleared up to the last ID of each chunk, and past it after the last chunk, so the next run
+    does not fix them all again.
+
+    Parameters:
+        connection: SQLite connection, from pricing_db.connect.
+        chunk_size (int): tutors per chunk.
+        all_tutors (bool): True to fix all tutors, not just those in the change log.
+    Returns: Number of tutors changed.
+    """
+    if all_tutors:
+        select_sql = ("SELECT Name, ID, Gender, Highest_Degree FROM Tutors "
+                      "WHERE ID > ? ORDER BY ID LIMIT ?")
+    else:
+        select_sql = ("SELECT Tutors.Name, Tutors_Dirty.ID, Tutors.Gender, Tutors.Highest_Degree "
+                      "FROM Tutors_Dirty LEFT JOIN Tutors ON Tutors.ID = Tutors_Dirty.ID "
+                      "WHERE Tutors_Dirty.ID > ? ORDER BY Tutors_Dirty.ID LIMIT ?")
+    update_sql = ("UPDATE Tutors SET Gender = COALESCE(?, Gender), Highest_Degree = COALESCE(?, Highest_Degree) "
+                  "WHERE ID = ?")
+    num_changed = 0
+    last_id = -1
+    while True:
+        # BEGIN IMMEDIATE, so no scraper changes a tutor between reading the chunk and clearing its log entries.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            rows = connection.execute(select_sql, [last_id, chunk_size]).fetchall()
+            if not rows:
+                if all_tutors:
+                    # Tutors logged after the last one in Tutors, such as deleted tutors.
+                    connection.execute("DELETE FROM Tutors_Dirty WHERE ID > ?", [last_id])
+                connection.commit()
+                break
+            prev_last_id, last_id = last_id, rows[-1][1]
+
+            changes = normalize_chunk(rows)
+            connection.executemany(update_sql, changes)
+            # After the UPDATE, since its triggers log the changed tutors again.  Every ID since the last chunk,
+            # so that with all_tutors, no tutor between chunks is left in the change log.
+            connection.execute("DELETE FROM Tutors_Dirty WHERE ID > ? AND ID <= ?", [prev_last_id, last_id])
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        num_changed += len(changes)
+    return num_changed
+
+
 def main():
     """ Function main.
 
     Parameters:
     Returns:
     """
+    parser = argparse.ArgumentParser(description="Fix genders and highest degrees of tutors.")
+    parser.add_argument('--all', action='store_true',
+                        help="fix all tutors, not just those added or changed since the last run")
+    args = parser.parse_args()
+
     # Connect to database.
-    connection = sqlite3.connect(database=DB_PATH, timeout=TIMEOUT)
-    cursor = connection.cursor()
-
-    # Find tutors who need details from their profile added.
-    sql = ("SELECT Name, ID, gender, highest_degree "
-           "FROM Tutors")
-    cursor.execute(sql)
-    rows = cursor.fetchall()
-
-    for row_number, row in enumerate(rows):
-        tutor_name, tutor_id, prev_gender, prev_highest_degree = row
-        name_parts = tutor_name.split()
-
-        # Process multi-part names.
-        new_degree = ""
-        new_name_parts = []  # The items in name_parts that aren't titles, degrees, or single characters.
-        gender_parts = []  # The gender of names in new_name_parts that are "M", "M?", "F", or "F?"
-        for name_part in name_parts:
-            name_part = name_part.replace(".", "").replace(")", "").replace("(", "")
-            if name_part in ["Ms", "Miss", "Mrs"]:
-                gender_parts.append("F")
-            elif name_part == "Mr":
-                gender_parts.append("M")
-            elif name_part in ["Dr", "PhD", "Prof", "Md"]:
-                if degree_dict[prev_highest_degree] < 3:
-                    new_degree = "PhD"
-            elif len(name_part) > 1:
-                new_name_parts.append(name_part)
-                gender_part = guess_dict[guess.get_gender(name_part)]
-                if gender_part not in ["And", "Unk"]:
-                    # "And" and "Unk" useless info, only use M, M?, F, F?.
-                    gender_parts.append(gender_part)
-            if len(gender_parts) > 2:
-                print("MAXLEN: ", len(gender_parts))
-
-        # Process gender info.
-        new_gender = ""  # No change.
-        if len(gender_parts) == 1:
-            candidate_gender = gender_parts[0]
-            if prev_gender in ["Unk", "And"]:
-                new_gender = candidate_gender
-                # print("Assign definite gender:", new_gender, prev_gender)
-            elif prev_gender == candidate_gender + '?':
-                new_gender = candidate_gender
-                # print("Promote F? to F or M? to M:", new_gender, prev_gender)
-            elif candidate_gender == prev_gender + '?':
-                new_gender = ""  # Let's not demote F to F? or M to M?.
-            elif candidate_gender == prev_gender:
-                new_gender = ""  # No change.
-            else:
-                new_gender = ""  # Inconsistent results.  Leave old value.
-        elif len(gender_parts) == 2:
-            gender_parts.sort()
-            if gender_parts[0][0] != gender_parts[1][0]:
-                new_gender = ""  # Inconsistent results.  Leave old value.
-            elif gender_parts[0][0] == gender_parts[1][0]:
-                candidate_gender = gender_parts[0]
-                if prev_gender in ["Unk", "And"] and candidate_gender[0] in ["M", "F"]:
-                    new_gender = candidate_gender  # print("Assign definite gender:", new_gender, prev_gender)
-                elif prev_gender == new_gender + '?':
-                    new_gender = candidate_gender  # print("Promote F? to F or M? to M:", new_gender, prev_gender)
-                else:
-                    new_gender = ""  # Pass on other options.
-            else:
-                new_gender = ""  # Pass on other options.
-        elif len(gender_parts) >= 3:
-            new_gender = ""
-            print("EXTRA LONG")
-
-        if new_degree != "":
-            sql = "UPDATE Tutors SET Highest_Degree = ? WHERE ID = ?"
-            cursor.execute(sql, ["PhD", tutor_id])
-        if new_gender != "":
-            sql = "UPDATE Tutors SET Gender = ? WHERE ID = ?"
-            cursor.execute(sql, [new_gender, tutor_id])
-
-    # Final commit, disconnect from database.
-    connection.commit()
-    cursor.close()
+    connection = connect(DB_PATH, timeout=TIMEOUT)
+
+    num_changed = normalize_tutors(connection, all_tutors=args.all)
+    print(f"Changed {num_changed} tutors.")
+
+    # Disconnect from database.
     connection.close()
     print("ALL DONE.")
 # End of function main.
@@ -139,4 +195,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,159 @@
+""" pricing_parquet.py
+
+SUMMARY: Export the Tutors and Topics tables of the pricing database to Parquet files, with typed
+columns: rates as decimals, dates as dates, and update times as timestamps.  Analysis, such as the
+distribution of rates per topic, can then read just the columns it needs, without parsing text.
+Run after wyzant_pricing.py (or use its --parquet option), wyzant_pricing_detail.py and pricing_gender.py.
+Needs pyarrow.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+from parquet_sink import ParquetSink, require_pyarrow, to_date, to_decimal, pa
+from pricing_db import connect
+
+import datetime
+import os
+
+# CONSTANTS.
+
+DB_PATH = r'C:\Users\david\Desktop\Wyzant\Pricing\Pricing.sqlite3'
+TIMEOUT = 30  # Seconds.
+OUTPUT_DIR = './output'
+FETCH_SIZE = 10_000  # Rows read from SQLite at a time.
+
+TUTORS_SQL = ("SELECT ID, URL, Name, Bill_Rate, Avg_Rating, Number_Ratings, Total_Hours, Has_Photo, Gender, "
+              "City, State, Response_Time_Min, Highest_Degree, Background_Check, Last_Update FROM Tutors")
+TOPICS_SQL = "SELECT ID, Topic, Subject, Topic_Hours, Last_Update FROM Topics"
+
+
+def tutors_schema():
+    """ Function tutors_schema.
+
+    Parameters:
+    Returns: pyarrow.Schema of the Tutors Parquet file, same columns as TUTORS_SQL.
+    """
+    return pa.schema([("ID", pa.int64()),
+                      ("URL", pa.string()),
+                      ("Name", pa.string()),
+                      ("Bill_Rate", pa.decimal128(9, 2)),
+                      ("Avg_Rating", pa.float64()),
+                      ("Number_Ratings", pa.int32()),
+                      ("Total_Hours", pa.int32()),
+                      ("Has_Photo", pa.bool_()),
+                      ("Gender", pa.dictionary(pa.int32(), pa.string())),
+                      ("City", pa.string()),
+                      ("State", pa.dictionary(pa.int32(), pa.string())),
+                      ("Response_Time_Min", pa.int32()),
+                      ("Highest_Degree", pa.dictionary(pa.int32(), pa.string())),
+                      ("Background_Check", pa.date32()),
+                      ("Last_Update", pa.timestamp('s'))])
+
+
+def topics_schema():
+    """ Function topics_schema.
+
+    Parameters:
+    Returns: pyarrow.Schema of the Topics Parquet file, same columns as TOPICS_SQL.
+    """
+    return pa.schema([("ID", pa.int64()),
+                      ("Topic", pa.dictionary(pa.int32(), pa.string())),
+                      ("Subject", pa.bool_()),
+                      ("Topic_Hours", pa.int32()),
+                      ("Last_Update", pa.timestamp('s'))])
+
+
+def to_timestamp(value: str):
+    """ Function to_timestamp.
+
+    Parameters: Date-time in 'YYYY-MM-DD HH:MM:SS' format, as written by pricing_db, or None.
+    Returns: datetime.datetime, or None.
+    """
+    return datetime.datetime.fromisoformat(value) if value else None
+
+
+def convert_tutor(row: tuple) -> dict:
+    """ Function convert_tutor.
+
+    Parameters: One row of TUTORS_SQL.
+    Returns: Typed column values, for tutors_schema.
+    """
+    (id_number, url, name, bill_rate, avg_rating, num_ratings, total_hours, has_photo, gender,
+     city, state, response_time, highest_degree, background_check, last_update) = row
+    return {"ID": id_number, "URL": url, "Name": name, "Bill_Rate": to_decimal(bill_rate),
+            "Avg_Rating": avg_rating, "Number_Ratings": num_ratings, "Total_Hours": total_hours,
+            "Has_Photo": None if has_photo is None else bool(has_photo), "Gender": gender, "City": city,
+            "State": state, "Response_Time_Min": response_time, "Highest_Degree": highest_degree,
+            "Background_Check": to_date(background_check, ["%Y-%m-%d"]), "Last_Update": to_timestamp(last_update)}
+
+
+def convert_topic(row: tuple) -> dict:
+    """ Function convert_topic.
+
+    Parameters: One row of TOPICS_SQL.
+    Returns: Typed column values, for topics_schema.
+    """
+    id_number, topic, subject, topic_hours, last_update = row
+    return {"ID": id_number, "Topic": topic, "Subject": None if subject is None else bool(subject),
+            "Topic_Hours": topic_hours, "Last_Update": to_timestamp(last_update)}
+
+
+def export_table(connection, sql: str, sink: ParquetSink) -> int:
+    """ Function export_table.  Copy the rows of a query to a ParquetSink, FETCH_SIZE rows at a time.
+
+    Parameters:
+        connection: SQLite connection.
+        sql (str): query.
+        sink: ParquetSink, closed when done.
+    Returns: Number of rows exported.
+    """
+    cursor = connection.execute(sql)
+    try:
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                sink.write(row)
+    finally:
+        cursor.close()
+        sink.close()
+    return sink.num_written
+
+
+def export_pricing(connection, output_dir: str = OUTPUT_DIR) -> None:
+    """ Function export_pricing.  Export the Tutors and Topics tables to tutors.parquet and topics.parquet.
+
+    Parameters:
+        connection: SQLite connection, from pricing_db.connect.
+        output_dir (str): directory of the Parquet files.
+    Returns:
+    """
+    require_pyarrow()
+    for table, sql, schema, convert in [("tutors", TUTORS_SQL, tutors_schema(), convert_tutor),
+                                        ("topics", TOPICS_SQL, topics_schema(), convert_topic)]:
+        path = os.path.join(output_dir, f"{table}.parquet")
+        num_rows = export_table(connection, sql, ParquetSink(path, schema, convert))
+        print(f"Exported {num_rows} rows to {path}.")
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    connection = connect(DB_PATH, timeout=TIMEOUT)
+    export_pricing(connection)
+    connection.close()
+    print("ALL DONE.")
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+""" pricing_schema.py
+
+SUMMARY: Creates and migrates the schema of the pricing database used by the survey and analysis of
+tutors (the competition).  Applied migrations are recorded in table Schema_Migrations, so each one is
+applied once, in order.  Function migrate is called by pricing_db.connect, so every script that opens
+the pricing database brings it up to date first.
+
+Schema:
+Tutors, primary key ID.
+Topics, primary key (ID, Topic).
+Partial index Tutors_Needs_Detail, on the tutors wyzant_pricing_detail.py still has to scrape.
+Index Topics_Topic, for looking up all tutors of a topic.
+Tutors_Dirty, IDs of tutors inserted, or with Name, Gender or Highest_Degree changed, since pricing_gender.py
+last normalized them.  Maintained by triggers Tutors_Dirty_Insert and Tutors_Dirty_Update.
+Rank_Runs, Rank_Topics, Rank_History and Rank_Daily, the history of ranks found by wyzant_search_topics.py,
+and its daily rollup, kept by rank_history.py.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+import datetime
+import sqlite3
+
+# CONSTANTS.
+
+TUTORS_COLUMNS = [("ID", "INTEGER PRIMARY KEY"),
+                  ("URL", "TEXT"),
+                  ("Name", "TEXT"),
+                  ("Bill_Rate", "INTEGER"),
+                  ("Avg_Rating", "REAL"),
+                  ("Number_Ratings", "INTEGER"),
+                  ("Total_Hours", "INTEGER"),
+                  ("Has_Photo", "INTEGER"),
+                  ("Gender", "TEXT"),
+                  ("City", "TEXT"),
+                  ("State", "TEXT"),
+                  ("Response_Time_Min", "INTEGER"),
+                  ("Highest_Degree", "TEXT"),
+                  ("Background_Check", "DATE"),
+                  ("Last_Update", "TEXT")]
+
+TOPICS_COLUMNS = [("ID", "INTEGER"),
+                  ("Topic", "TEXT"),
+                  ("Subject", "INTEGER"),
+                  ("Topic_Hours", "INTEGER"),
+                  ("Last_Update", "TEXT")]
+TOPICS_PRIMARY_KEY = "PRIMARY KEY (ID, Topic)"
+
+# Same predicate as wyzant_pricing_detail.NEEDS_DETAIL_SQL, so SQLite can use the partial index for it.
+NEEDS_DETAIL_WHERE = ("City IS NULL "
+                      "OR State IS NULL "
+                      "OR Response_Time_Min IS NULL "
+                      "OR Highest_Degree IS NULL "
+                      "OR Background_Check IS NULL")
+
+
+def get_date_time() -> str:
+    """ Function get_date_time.
+
+    Parameters:
+    Returns: Current date-time as string in 'YYYY-MM-DD HH:MM:SS' format.
+    """
+    return str(datetime.datetime.now())[:19]
+
+
+def table_columns(connection: sqlite3.Connection, table: str) -> list:
+    """ Function table_columns.
+
+    Parameters:
+        connection: SQLite connection.
+        table (str): table name.
+    Returns: List of (name, declared type, part of primary key) for each column, empty if no such table.
+    """
+    return [(row[1], row[2], row[5]) for row in connection.execute(f"PRAGMA table_info({table})")]
+
+
+def create_table(connection: sqlite3.Connection, table: str, columns: list, constraint: str = None) -> None:
+    """ Function create_table.
+
+    Parameters:
+        connection: SQLite connection.
+        table (str): table name.
+        columns (list): (name, type and constraints) for each column.
+        constraint (str): table constraint, if any.
+    Returns:
+    """
+    definitions = [f"{name} {definition}" for name, definition in columns]
+    if constraint:
+        definitions.append(constraint)
+    connection.execute(f"CREATE TABLE {table} ({', '.join(definitions)})")
+
+
+def create_or_rebuild(connection: sqlite3.Connection, table: str, columns: list, primary_key: list,
+                      constraint: str = None) -> None:
+    """ Function create_or_rebuild.  Create a table with a primary key, or, if it already exists without
+    that primary key, rebuild it with one.  Columns of the old table not in columns are kept.  Of rows with
+    the same primary key, the last one inserted is kept.  Rows with a NULL in the primary key are reported,
+    and moved to table <table>_Rejected rather than copied, since an INTEGER PRIMARY KEY would quietly give
+    them a new ID.
+
+    Parameters:
+        connection: SQLite connection, inside a transaction.
+        table (str): table name.
+        columns (list): (name, type and constraints) for each column.
+        primary_key (list): names of the primary key columns.
+        constraint (str): table constraint, if any.
+    Returns:
+    """
+    old_columns = table_columns(connection, table)
+    if not old_columns:
+        create_table(connection, table, columns, constraint)
+        return
+
+    old_primary_key = [name for name, _, pk in sorted(old_columns, key=lambda column: column[2]) if pk > 0]
+    if old_primary_key == primary_key:
+        return
+
+    # Rebuild, keeping any extra columns of the old table.
+    names = [name for name, _ in columns]
+    extra_columns = [(name, declared) for name, declared, _ in old_columns if name not in names]
+    create_table(connection, f"{table}_New", columns + extra_columns, constraint)
+    copy = ", ".join(name for name, _, _ in old_columns)
+    has_null_key = " OR ".join(f"{name} IS NULL" for name in primary_key)
+    num_null_keys = connection.execute(f"SELECT count(*) FROM {table} WHERE {has_null_key}").fetchone()[0]
+    if num_null_keys:
+        print(f"{num_null_keys} rows of {table} have a NULL in primary key ({', '.join(primary_key)}), "
+              f"moved to {table}_Rejected.")
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {table}_Rejected AS SELECT * FROM {table} WHERE 0")
+        connection.execute(f"INSERT INTO {table}_Rejected SELECT * FROM {table} WHERE {has_null_key}")
+    connection.execute(f"INSERT OR REPLACE INTO {table}_New ({copy}) SELECT {copy} FROM {table} "
+                       f"WHERE NOT ({has_null_key}) ORDER BY rowid")
+    connection.execute(f"DROP TABLE {table}")
+    connection.execute(f"ALTER TABLE {table}_New RENAME TO {table}")
+
+
+def migration_1(connection: sqlite3.Connection) -> None:
+    """ Function migration_1.  Tutors and Topics tables, with primary keys. """
+    create_or_rebuild(connection, "Tutors", TUTORS_COLUMNS, ["ID"])
+    create_or_rebuild(connection, "Topics", TOPICS_COLUMNS, ["ID", "Topic"], TOPICS_PRIMARY_KEY)
+
+
+def migration_2(connection: sqlite3.Connection) -> None:
+    """ Function migration_2.  Indexes for the queries of wyzant_pricing_detail.py and of analysis by topic. """
+    connection.execute(f"CREATE INDEX IF NOT EXISTS Tutors_Needs_Detail ON Tutors (ID) WHERE {NEEDS_DETAIL_WHERE}")
+    connection.execute("CREATE INDEX IF NOT EXISTS Topics_Topic ON Topics (Topic)")
+
+
+def migration_3(connection: sqlite3.Connection) -> None:
+    """ Function migration_3.  Change log of tutors for pricing_gender.py, starting with every tutor. """
+    connection.execute("CREATE TABLE IF NOT EXISTS Tutors_Dirty (ID INTEGER PRIMARY KEY)")
+    connection.execute("INSERT OR IGNORE INTO Tutors_Dirty (ID) SELECT ID FROM Tutors")
+    connection.execute("CREATE TRIGGER IF NOT EXISTS Tutors_Dirty_Insert AFTER INSERT ON Tutors "
+                       "BEGIN INSERT OR IGNORE INTO Tutors_Dirty (ID) VALUES (NEW.ID); END")
+    # The upserts of pricing_db set Name and Gender every time, so only log actual changes.
+    # Gender too, since wyzant_pricing.py overwrites the normalized gender with a fresh guess.
+    connection.execute("CREATE TRIGGER IF NOT EXISTS Tutors_Dirty_Update "
+                       "AFTER UPDATE OF Name, Gender, Highest_Degree ON Tutors "
+                       "WHEN NEW.Name IS NOT OLD.Name OR NEW.Gender IS NOT OLD.Gender "
+                       "OR NEW.Highest_Degree IS NOT OLD.Highest_Degree "
+                       "BEGIN INSERT OR IGNORE INTO Tutors_Dirty (ID) VALUES (NEW.ID); END")
+
+
+def migration_4(connection: sqlite3.Connection) -> None:
+    """ Function migration_4.  Rank history, append-only, one row per run, topic and tutor ranked,
+    and its daily rollup.  WITHOUT ROWID, since each table is only read by its primary key.
+    """
+    connection.execute("CREATE TABLE IF NOT EXISTS Rank_Runs (Run_ID INTEGER PRIMARY KEY, Run_TS TEXT NOT NULL)")
+    connection.execute("CREATE INDEX IF NOT EXISTS Rank_Runs_TS ON Rank_Runs (Run_TS)")
+    connection.execute("CREATE TABLE IF NOT EXISTS Rank_Topics "
+                       "(Topic_ID INTEGER PRIMARY KEY, Topic TEXT NOT NULL UNIQUE, Subject INTEGER)")
+    # Rank is NULL if the tutor was not found.
+    connection.execute("CREATE TABLE IF NOT EXISTS Rank_History "
+                       "(Run_ID INTEGER, Topic_ID INTEGER, Tutor_ID INTEGER, Num_Tutors INTEGER, "
+                       "Num_Tutor_Cards INTEGER, Rank INTEGER, "
+                       "PRIMARY KEY (Run_ID, Topic_ID, Tutor_ID)) WITHOUT ROWID")
+    connection.execute("CREATE INDEX IF NOT EXISTS Rank_History_Topic ON Rank_History (Topic_ID, Tutor_ID, Run_ID)")
+    # Ranks are over the runs in which the tutor was found.
+    connection.execute("CREATE TABLE IF NOT EXISTS Rank_Daily "
+                       "(Topic_ID INTEGER, Tutor_ID INTEGER, Day TEXT, Runs INTEGER, Runs_Found INTEGER, "
+                       "Min_Rank INTEGER, Median_Rank REAL, Max_Rank INTEGER, Avg_Num_Tutors REAL, "
+                       "PRIMARY KEY (Topic_ID, Tutor_ID, Day)) WITHOUT ROWID")
+
+
+# Migrations, in order: (version, description, function).
+MIGRATIONS = [(1, "Tutors and Topics tables, with primary keys", migration_1),
+              (2, "Needs-detail partial index, and Topics index by topic", migration_2),
+              (3, "Tutors_Dirty change log, for pricing_gender.py", migration_3),
+              (4, "Rank history and its daily rollup, for rank_history.py", migration_4)]
+
+
+def schema_version(connection: sqlite3.Connection) -> int:
+    """ Function schema_version.
+
+    Parameters:
+        connection: SQLite connection.
+    Returns: Version of the last migration applied, 0 if none.
+    """
+    connection.execute("CREATE TABLE IF NOT EXISTS Schema_Migrations "
+                       "(Version INTEGER PRIMARY KEY, Description TEXT, Applied TEXT)")
+    return connection.execute("SELECT COALESCE(MAX(Version), 0) FROM Schema_Migrations").fetchone()[0]
+
+
+def migrate(connection: sqlite3.Connection) -> int:
+    """ Function migrate.  Apply every migration not yet applied, each in its own transaction.
+
+    Parameters:
+        connection: SQLite connection.
+    Returns: Schema version after migrating.
+    """
+    version = schema_version(connection)
+    connection.commit()
+    for migration_version, description, function in MIGRATIONS:
+        if migration_version <= version:
+            continue
+        print(f"Migrating pricing database to version {migration_version}: {description}.")
+        # Explicit BEGIN, since sqlite3 does not start a transaction before CREATE, DROP or ALTER.
+        connection.execute("BEGIN")
+        try:
+            function(connection)
+            connection.execute("INSERT INTO Schema_Migrations (Version, Description, Applied) VALUES (?, ?, ?)",
+                               [migration_version, description, get_date_time()])
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        version = migration_version
+    return version
@@ -0,0 +1,238 @@
+""" rank_history.py
+
+SUMMARY: History of my rank for each topic, as found by wyzant_search_topics.py, so that trends can be
+reported without re-reading the csv file of every run.  Each run appends one row per topic and tutor ranked
+to table Rank_History of the pricing database: number of tutors, number of tutor-cards read, and rank.
+Table Rank_Daily holds a rollup per topic, tutor and day: number of runs, and the minimum, median and
+maximum rank.  It is brought up to date for the day of a run when the run is saved, so trend reports only
+read the rollup.  The tables are created by pricing_schema.migration_4.
+
+Run on its own, reports how the rank of a tutor changed for each topic over the last DAYS days, or, with
+--topic, the daily trend for one topic.  With --import, adds the ranks in old search_topics.csv files to
+the history first, one run per file, timed by when the file was last modified.
+
+Used by:
+wyzant_search_topics.py, and wyzant_pricing.py with --ranks.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+from pricing_db import connect, get_date_time
+
+# Other packages.
+import argparse
+import csv
+import datetime
+import os
+from statistics import median
+
+# CONSTANTS.
+
+DB_PATH = r'C:\Users\david\Desktop\Wyzant\Pricing\Pricing.sqlite3'
+TIMEOUT = 30  # Seconds.
+MY_TUTOR_ID = 88195255
+DAYS = 90  # Days covered by the report of rank changes.
+
+INSERT_RUN_SQL = "INSERT INTO Rank_Runs (Run_TS) VALUES (?)"
+UPSERT_TOPIC_SQL = ("INSERT INTO Rank_Topics (Topic, Subject) VALUES (?, ?) "
+                    "ON CONFLICT (Topic) DO UPDATE SET Subject = excluded.Subject")
+INSERT_HISTORY_SQL = ("INSERT OR REPLACE INTO Rank_History (Run_ID, Topic_ID, Tutor_ID, Num_Tutors, "
+                      "Num_Tutor_Cards, Rank) VALUES (?, (SELECT Topic_ID FROM Rank_Topics WHERE Topic = ?), "
+                      "?, ?, ?, ?)")
+DAY_HISTORY_SQL = ("SELECT H.Topic_ID, H.Tutor_ID, H.Num_Tutors, H.Rank FROM Rank_Runs AS R "
+                   "JOIN Rank_History AS H ON H.Run_ID = R.Run_ID "
+                   "WHERE R.Run_TS >= ? AND R.Run_TS < date(?, '+1 day')")
+UPSERT_DAILY_SQL = ("INSERT OR REPLACE INTO Rank_Daily (Topic_ID, Tutor_ID, Day, Runs, Runs_Found, Min_Rank, "
+                    "Median_Rank, Max_Rank, Avg_Num_Tutors) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+TREND_SQL = ("SELECT D.Day, D.Runs, D.Runs_Found, D.Min_Rank, D.Median_Rank, D.Max_Rank, D.Avg_Num_Tutors "
+             "FROM Rank_Topics AS T JOIN Rank_Daily AS D ON D.Topic_ID = T.Topic_ID "
+             "WHERE T.Topic = ? AND D.Tutor_ID = ? AND D.Day >= ? ORDER BY D.Day")
+CHANGES_SQL = ("SELECT T.Topic, D.Day, D.Median_Rank, D.Avg_Num_Tutors "
+               "FROM Rank_Daily AS D JOIN Rank_Topics AS T ON T.Topic_ID = D.Topic_ID "
+               "WHERE D.Tutor_ID = ? AND D.Day >= ? ORDER BY T.Topic, D.Day")
+
+
+class RankHistory:
+    """ Saves the ranks of one run of wyzant_search_topics.py, and updates the daily rollup when closed. """
+
+    def __init__(self, connection, tutor_ids: list, run_ts: str = None):
+        """ Function __init__.
+
+        Parameters:
+            connection: SQLite connection, from pricing_db.connect.
+            tutor_ids (list): IDs of the tutors ranked, in the order of the ranks given to add().
+            run_ts (str): date-time of the run, in 'YYYY-MM-DD HH:MM:SS' format, by default now.
+        """
+        self.connection = connection
+        self.tutor_ids = list(tutor_ids)
+        self.run_ts = run_ts or get_date_time()
+        self.topic_rows = []
+        self.history_rows = []
+
+    def add(self, topic: str, subject: int, num_tutors: int, num_cards: int, ranks: list) -> None:
+        """ Buffer the ranks of one topic.
+
+        Parameters:
+            topic (str): topic searched for.
+            subject (int): 1 if the topic is a subject, else 0.
+            num_tutors (int): number of tutors found.
+            num_cards (int): number of tutor-cards read.
+            ranks (list): rank of each of tutor_ids, -1 or None if not found.
+        """
+        self.topic_rows.append([topic, subject])
+        for tutor_id, rank in zip(self.tutor_ids, ranks):
+            self.history_rows.append([topic, tutor_id, num_tutors, num_cards, None if rank == -1 else rank])
+
+    def close(self) -> None:
+        """ Save the run, and update the rollup of its day, in one transaction. """
+        if not self.history_rows:
+            return
+        with self.connection:
+            run_id = self.connection.execute(INSERT_RUN_SQL, [self.run_ts]).lastrowid
+            self.connection.executemany(UPSERT_TOPIC_SQL, self.topic_rows)
+            self.connection.executemany(INSERT_HISTORY_SQL, [[run_id, *row] for row in self.history_rows])
+            rollup_day(self.connection, self.run_ts[:10])
+        print(f"Saved ranks of {len(self.topic_rows)} topics to the rank history.")
+        self.topic_rows.clear()
+        self.history_rows.clear()
+# End of class RankHistory.
+
+
+def rollup_day(connection, day: str) -> int:
+    """ Function rollup_day.  Recompute the rollup of every topic and tutor for one day, from Rank_History.
+
+    Parameters:
+        connection: SQLite connection.
+        day (str): date, in 'YYYY-MM-DD' format.
+    Returns: Number of rows of Rank_Daily written.
+    """
+    groups = {}
+    for topic_id, tutor_id, num_tutors, rank in connection.execute(DAY_HISTORY_SQL, [day, day]):
+        groups.setdefault((topic_id, tutor_id), []).append((num_tutors or 0, rank))
+
+    rows = []
+    for (topic_id, tutor_id), runs in groups.items():
+        ranks = [rank for _, rank in runs if rank is not None]
+        avg_num_tutors = sum(num_tutors for num_tutors, _ in runs) / len(runs)
+        if ranks:
+            rows.append([topic_id, tutor_id, day, len(runs), len(ranks), min(ranks), median(ranks), max(ranks),
+                         avg_num_tutors])
+        else:
+            rows.append([topic_id, tutor_id, day, len(runs), 0, None, None, None, avg_num_tutors])
+    connection.executemany(UPSERT_DAILY_SQL, rows)
+    return len(rows)
+
+
+def rebuild_rollups(connection) -> int:
+    """ Function rebuild_rollups.  Recompute the rollup of every day in Rank_History.
+
+    Parameters:
+        connection: SQLite connection.
+    Returns: Number of rows of Rank_Daily written.
+    """
+    num_rows = 0
+    with connection:
+        connection.execute("DELETE FROM Rank_Daily")
+        for (day,) in connection.execute("SELECT DISTINCT substr(Run_TS, 1, 10) FROM Rank_Runs").fetchall():
+            num_rows += rollup_day(connection, day)
+    return num_rows
+
+
+def import_csv(connection, path: str, run_ts: str = None) -> int:
+    """ Function import_csv.  Add the ranks in a csv file written by wyzant_search_topics.RankWriter
+    to the history, as one run.
+
+    Parameters:
+        connection: SQLite connection.
+        path (str): path of the csv file.
+        run_ts (str): date-time of the run, by default when the file was last modified.
+    Returns: Number of topics imported.
+    """
+    if run_ts is None:
+        run_ts = str(datetime.datetime.fromtimestamp(os.path.getmtime(path)))[:19]
+    with open(path, 'r', newline='') as file:
+        rows = csv.reader(file)
+        heading = next(rows)
+        # Rank columns are "Rank", for MY_TUTOR_ID, or "Rank_<ID>".
+        tutor_ids = [MY_TUTOR_ID if column == 'Rank' else int(column[5:]) for column in heading[4:]]
+        history = RankHistory(connection, tutor_ids, run_ts)
+        num_topics = 0
+        for topic, subject, num_tutors, num_cards, *ranks in rows:
+            history.add(topic, int(subject == "subject"), int(num_tutors), int(num_cards),
+                        [int(rank) for rank in ranks])
+            num_topics += 1
+    history.close()
+    return num_topics
+
+
+def rank_trend(connection, topic: str, tutor_id: int = MY_TUTOR_ID, since: str = "") -> list:
+    """ Function rank_trend.
+
+    Parameters:
+        connection: SQLite connection.
+        topic (str): topic.
+        tutor_id (int): ID of the tutor.
+        since (str): first day, in 'YYYY-MM-DD' format, by default the first in the history.
+    Returns: (Day, Runs, Runs_Found, Min_Rank, Median_Rank, Max_Rank, Avg_Num_Tutors) for each day, in order.
+    """
+    return connection.execute(TREND_SQL, [topic, tutor_id, since]).fetchall()
+
+
+def rank_changes(connection, tutor_id: int = MY_TUTOR_ID, days: int = DAYS) -> list:
+    """ Function rank_changes.  How the median rank of a tutor changed for each topic over the last days.
+
+    Parameters:
+        connection: SQLite connection.
+        tutor_id (int): ID of the tutor.
+        days (int): days covered.
+    Returns: (topic, first day, first median rank, last day, last median rank, last average number of
+             tutors) for each topic, in topic order.  Median ranks are None if the tutor was not found.
+    """
+    since = str(datetime.date.today() - datetime.timedelta(days=days))
+    changes = {}
+    for topic, day, median_rank, avg_num_tutors in connection.execute(CHANGES_SQL, [tutor_id, since]):
+        if topic not in changes:
+            changes[topic] = [topic, day, median_rank, day, median_rank, avg_num_tutors]
+        else:
+            changes[topic][3:] = [day, median_rank, avg_num_tutors]
+    return [tuple(change) for change in changes.values()]
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    parser = argparse.ArgumentParser(description="Report trends in the rank history of wyzant_search_topics.py.")
+    parser.add_argument("--tutor-id", type=int, default=MY_TUTOR_ID, help="ID of the tutor, by default me")
+    parser.add_argument("--days", type=int, default=DAYS, help="days covered by the report")
+    parser.add_argument("--topic", help="report the daily trend for this topic only")
+    parser.add_argument("--import", dest="import_paths", nargs="+", default=[], metavar="CSV",
+                        help="first add old search_topics.csv files to the history")
+    args = parser.parse_args()
+
+    connection = connect(DB_PATH, timeout=TIMEOUT)
+    for path in args.import_paths:
+        print(f"Imported {import_csv(connection, path)} topics from {path}.")
+
+    if args.topic:
+        since = str(datetime.date.today() - datetime.timedelta(days=args.days))
+        print(['Day', 'Runs', 'Runs_Found', 'Min_Rank', 'Median_Rank', 'Max_Rank', 'Avg_Num_Tutors'])
+        for row in rank_trend(connection, args.topic, args.tutor_id, since):
+            print(list(row))
+    else:
+        print(['Topic', 'First_Day', 'First_Median_Rank', 'Last_Day', 'Last_Median_Rank', 'Avg_Num_Tutors'])
+        for row in rank_changes(connection, args.tutor_id, args.days):
+            print(list(row))
+    connection.close()
+# End of function main.
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+""" test_pricing_detail.py
+
+SUMMARY: Tests of wyzant_pricing_detail.scrape_worker when no browser can be leased from the pool.
+Run with pytest.  login_tutor.py holds the Wyzant login and is not in the repository, so if it is missing,
+a stand-in is used, since no test logs in.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+import sys
+import types
+from importlib.util import find_spec
+
+if 'login_tutor' not in sys.modules and find_spec('login_tutor') is None:
+    sys.modules['login_tutor'] = types.SimpleNamespace(USERNAME='', PASSWORD='')
+
+import wyzant_pricing_detail
+from wyzant_driver import DriverPool
+from wyzant_pricing_detail import RateLimiter, scrape_worker
+
+# Other packages.
+from queue import Queue
+from threading import Event, Thread
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+
+class FailingPool:
+    """ Stand-in for DriverPool, whose lease() always fails. """
+
+    def __init__(self):
+        self.num_leases = 0
+
+    def lease(self, timeout: float = None):
+        self.num_leases += 1
+        raise WebDriverException("No browser.")
+# End of class FailingPool.
+
+
+@pytest.fixture(autouse=True)
+def no_failure_wait(monkeypatch):
+    monkeypatch.setattr(wyzant_pricing_detail, 'FAILURE_WAIT', 0)
+
+
+def run_worker(pool) -> tuple:
+    """ Function run_worker.  Run scrape_worker on one tutor, in a thread, as main does.
+
+    Parameters:
+        pool: DriverPool, or stand-in.
+    Returns: (tutors left in the queue, results), once the worker has stopped.
+    """
+    tutors = Queue()
+    tutors.put((1, "https://www.wyzant.com/Tutors/tutor-1"))
+    results = Queue()
+    worker = Thread(target=scrape_worker, args=(pool, tutors, results, RateLimiter(0), Event()), daemon=True)
+    worker.start()
+    worker.join(timeout=10)
+    assert not worker.is_alive()
+    return list(tutors.queue), list(results.queue)
+
+
+def test_lease_failures_stop_worker():
+    pool = FailingPool()
+    tutors, results = run_worker(pool)
+    assert pool.num_leases == wyzant_pricing_detail.MAX_TRIES
+    assert tutors == [(1, "https://www.wyzant.com/Tutors/tutor-1")]
+    assert results == []
+
+
+def test_browser_start_failures_stop_worker(monkeypatch):
+    num_starts = []
+
+    def make_driver(*args):
+        num_starts.append(1)
+        raise WebDriverException("Cannot start browser.")
+
+    monkeypatch.setattr('wyzant_driver.make_driver', make_driver)
+    pool = DriverPool(size=0)
+    pool._idle.put(None)  # As left by a browser that failed to start in the background.
+    tutors, results = run_worker(pool)
+    assert len(num_starts) == wyzant_pricing_detail.MAX_TRIES
+    assert tutors == [(1, "https://www.wyzant.com/Tutors/tutor-1")]
+    assert results == []
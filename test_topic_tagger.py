@@ -0,0 +1,41 @@
+""" test_topic_tagger.py
+
+SUMMARY: Tests of topic_tagger.TopicTagger, for keywords in hyphenated words and hyphenated keywords.
+Run with pytest.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+from topic_tagger import TopicTagger
+
+import pytest
+
+TOPICS = {'calculus': 'Calculus', 'pre-calculus': 'Pre-Calculus', 'sat': 'SAT', 'loop': 'Coding', 'sql': 'SQL',
+          'web scraping': 'Web Scraping'}
+EXACT_TOPICS = {'GRE': 'GRE'}
+
+
+@pytest.fixture
+def tagger():
+    return TopicTagger(TOPICS, EXACT_TOPICS)
+
+
+@pytest.mark.parametrize("text, tags", [
+    # Keywords in hyphenated words, as the substring search found them.
+    ("Helped with pre-calculus homework.", ['Calculus', 'Pre-Calculus']),
+    ("Pre-Calculus and SAT-prep.", ['Calculus', 'Pre-Calculus', 'SAT']),
+    ("A development-loop question.", ['Coding']),
+    ("SQL-heavy course, and GRE-level math.", ['SQL', 'GRE']),
+    ("Web-scraping with loops.", ['Web Scraping', 'Coding']),
+    # Hyphenated keywords also match with a space.
+    ("Pre calculus, then calculus.", ['Calculus', 'Pre-Calculus']),
+    # Still whole words only.
+    ("MySQL and satellites.", []),
+])
+def test_hyphens(tagger, text, tags):
+    assert sorted(tagger.tags(text)) == sorted(tags)
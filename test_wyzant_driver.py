@@ -0,0 +1,48 @@
+""" test_wyzant_driver.py
+
+SUMMARY: Tests of wyzant_driver.HttpElement.text, which should be the text Selenium's WebElement.text gives
+for the same element in Chrome.  Run with pytest.  login_tutor.py holds the Wyzant login and is not in the
+repository, so if it is missing, a stand-in is used, since no test logs in.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+import sys
+import types
+from importlib.util import find_spec
+
+if 'login_tutor' not in sys.modules and find_spec('login_tutor') is None:
+    sys.modules['login_tutor'] = types.SimpleNamespace(USERNAME='', PASSWORD='')
+
+from wyzant_driver import HttpElement
+
+# Other packages.
+from lxml import html as lxml_html
+
+import pytest
+
+
+@pytest.mark.parametrize("source, text", [
+    # Inline children stay on the line of their parent, with whitespace collapsed.
+    ('<h2>Other <a href="/x">Palm Beach\n   Gardens</a>, FL Tutors</h2>', "Other Palm Beach Gardens, FL Tutors"),
+    ('<div>Response time: <strong>2</strong>  hours</div>', "Response time: 2 hours"),
+    ('<p><b>No</b><i>space</i></p>', "Nospace"),
+    # Block children start new lines, with no blank lines between them.
+    ('<section><div><p>University of Rochester</p>\n <p>Mathematics</p></div>\n <div>Masters</div></section>',
+     "University of Rochester\nMathematics\nMasters"),
+    # <br> always starts a new line.
+    ('<p>Line one<br>Line two<br><br>Line four</p>', "Line one\nLine two\n\nLine four"),
+    # Table cells are separated by a space, rows by a new line.
+    ('<table><tr><td>a</td><td>b</td></tr><tr><td>c</td></tr></table>', "a b\nc"),
+    # Hidden elements, scripts, styles and comments are left out, but the text after them is not.
+    ('<div>Shown<span style="display: none">Hidden</span> <script>x = 1;</script>text<!-- note --> too</div>',
+     "Shown text too"),
+])
+def test_text_like_selenium(source, text):
+    element = HttpElement(lxml_html.fragment_fromstring(source))
+    assert element.text == text
@@ -0,0 +1,188 @@
+""" topic_tagger.py
+
+SUMMARY: Tag text, such as testimonials and job descriptions, with the topics it mentions.
+Class TopicTagger is built once from a dictionary of keywords, each with its topic.  Rather than one substring
+search per keyword, each text is split into words once, with str.translate and str.split, and its set of words
+intersected with the set of keywords, so the time taken hardly depends on the number of keywords.  Keywords
+of several words, such as "web scraping", are looked for only where their first word is found.
+Keywords only match whole words, optionally plural, so "loop" matches "loops", and "sql" does not match "mysql".
+Hyphens separate words, as the substring search this replaced found, so "calculus" matches "pre-calculus" and
+"sat" matches "SAT-prep".  A hyphenated keyword, such as "pre-calculus", is a keyword of several words, so it
+matches "pre-calculus" and "pre calculus".  Keywords are case-insensitive, except for exact keywords, such as "GRE".
+
+The dictionary is DEFAULT_TOPICS and DEFAULT_EXACT_TOPICS, or, if it exists, the JSON file TOPICS_PATH:
+{"topics": {"keyword": "Topic", ...}, "exact_topics": {"KEYWORD": "Topic", ...}}
+exact_topics may also be a list of keywords, each its own topic.
+
+Used by:
+wyzant_testimonials.py.
+wyzant_jobs.py.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+import json
+import os
+
+# CONSTANTS.
+
+TOPICS_PATH = './topics.json'
+
+DEFAULT_TOPICS = {'python': 'Python',
+                  'sql': 'SQL',
+                  'calculus': 'Calculus',
+                  'web scraping': 'Web Scraping',
+                  'vba': 'VBA',
+                  'precalc': 'Pre-Calculus',
+                  'linux': 'Linux', 'ubuntu': 'Linux', 'unix': 'Linux', 'bash': 'Linux',
+                  'code': 'Coding', 'coding': 'Coding', 'programming': 'Coding', 'loop': 'Coding'}
+DEFAULT_EXACT_TOPICS = {'GRE': 'GRE'}
+
+# Words are separated by white space and by punctuation, except "+" and "#", so that "c++" and "c#" are words.
+# Hyphens, en and em dashes, and minus signs separate words too, as in "pre-calculus" and "Python\u2014really".
+SEPARATORS = str.maketrans({character: " " for character in "!\"$%&'()*,-./:;<=>?@[\\]^`{|}~"
+                                                           "\u2018\u2019\u201c\u201d\u2026\u2013\u2014\u2212"})
+PLURALS = ['s', 'es']
+
+
+def split_words(text: str) -> list:
+    """ Function split_words.
+
+    Parameters:
+        text (str): text, or None.
+    Returns: Words of the text, as separated by SEPARATORS and white space.
+    """
+    return (text or "").translate(SEPARATORS).split()
+
+
+def plurals(word: str) -> list:
+    """ Function plurals.
+
+    Parameters:
+        word (str): a word.
+    Returns: The word, and its plurals if it ends in a letter.
+    """
+    return [word] + [word + plural for plural in PLURALS] if word[-1].isalpha() else [word]
+
+
+class TopicTagger:
+    """ Tags text with the topics of the keywords it mentions. """
+
+    def __init__(self, topics: dict, exact_topics: dict = None):
+        """ Function __init__.
+
+        Parameters:
+            topics (dict): topic of each case-insensitive keyword.
+            exact_topics (dict): topic of each case-sensitive keyword.
+        """
+        # Topic of each one-word keyword, and of its plurals, lowercase.
+        self.word_topics = {}
+        # Topic of each exact one-word keyword, and of its plurals, and the same keys lowercase.
+        self.exact_word_topics = {}
+        self.exact_lower = set()
+        # Keywords of several words, by their first word, lowercase unless exact: [(words, topic, exact)].
+        self.phrases = {}
+        for keywords, exact in [(topics, False), ((exact_topics or {}), True)]:
+            for keyword, topic in keywords.items():
+                words = split_words(keyword if exact else keyword.lower())
+                if len(words) == 1:
+                    for word in plurals(words[0]):
+                        if exact:
+                            self.exact_word_topics.setdefault(word, topic)
+                            self.exact_lower.add(word.lower())
+                        else:
+                            self.word_topics.setdefault(word, topic)
+                elif words:
+                    self.phrases.setdefault(words[0].lower(), []).append((words, topic, exact))
+
+    @classmethod
+    def from_file(cls, path: str):
+        """ Function from_file.
+
+        Parameters:
+            path (str): path of a JSON file of topics, as described above.
+        Returns: TopicTagger.
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            config = json.load(file)
+        exact_topics = config.get('exact_topics', {})
+        if isinstance(exact_topics, list):
+            exact_topics = {keyword: keyword for keyword in exact_topics}
+        return cls(config.get('topics', {}), exact_topics)
+
+    def tags(self, *texts: str) -> list:
+        """ Function tags.
+
+        Parameters:
+            texts (str): texts to tag, such as a title and a body.  None is skipped.
+        Returns: Topics mentioned, each once, in order of first mention.
+        """
+        mentions = []  # (position, topic) of the first mention of each keyword found.
+        offset = 0  # Position in words of the current text, as if texts were one text.
+        for text in texts:
+            # Lowercase does not change the separators, so words and lower_words are the same words.
+            lower_words = split_words(text.lower() if text else text)
+            lower_set = set(lower_words)
+            words = None  # Only split in its own case if there might be an exact keyword.
+            for word in self.word_topics.keys() & lower_set:
+                mentions.append((offset + lower_words.index(word), self.word_topics[word]))
+            if not self.exact_lower.isdisjoint(lower_set):
+                words = split_words(text)
+                for word in self.exact_word_topics.keys() & set(words):
+                    mentions.append((offset + words.index(word), self.exact_word_topics[word]))
+            for first_word in self.phrases.keys() & lower_set:
+                for phrase, topic, exact in self.phrases[first_word]:
+                    if exact and words is None:
+                        words = split_words(text)
+                    position = find_phrase(words if exact else lower_words, phrase)
+                    if position is not None:
+                        mentions.append((offset + position, topic))
+            offset += len(lower_words)
+        return list(dict.fromkeys(topic for _, topic in sorted(mentions, key=lambda mention: mention[0])))
+
+    def tag_all(self, texts: list) -> list:
+        """ Function tag_all.
+
+        Parameters:
+            texts (list): texts to tag.
+        Returns: Topics mentioned in each text, as by tags().
+        """
+        return [self.tags(text) for text in texts]
+# End of class TopicTagger.
+
+
+def find_phrase(words: list, phrase: list) -> int:
+    """ Function find_phrase.
+
+    Parameters:
+        words (list): words of a text.
+        phrase (list): words of a keyword, the last of which may be plural in the text.
+    Returns: Position of the first mention of the keyword in words, or None.
+    """
+    last_words = plurals(phrase[-1])
+    position = -1
+    while True:
+        try:
+            position = words.index(phrase[0], position + 1)
+        except ValueError:
+            return None
+        end = position + len(phrase)
+        if words[position:end - 1] == phrase[:-1] and end <= len(words) and words[end - 1] in last_words:
+            return position
+
+
+def load_tagger(path: str = TOPICS_PATH) -> TopicTagger:
+    """ Function load_tagger.
+
+    Parameters:
+        path (str): path of a JSON file of topics.
+    Returns: TopicTagger of the topics in the file, if it exists, else of the default topics.
+    """
+    if path and os.path.isfile(path):
+        return TopicTagger.from_file(path)
+    return TopicTagger(DEFAULT_TOPICS, DEFAULT_EXACT_TOPICS)
@@ -0,0 +1,90 @@
+""" wyzant_common.py
+
+SUMMARY: Helpers shared by the scraping scripts.
+Function element_text gets the text of an lxml element the way Selenium's WebElement.text does.
+Function make_http_session makes a requests Session with the login of a Selenium browser, so that pages can be
+fetched over HTTP without it.
+Function guess_gender guesses the gender of one part of a name, with gender_guesser, cached per name part.
+
+Used by:
+wyzant_search.py.
+wyzant_history.py.
+wyzant_jobs.py.
+pricing_gender.py.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+import gender_guesser.detector as gender_guesser
+import requests
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+
+# CONSTANTS.
+
+# Instantiate gender guesser
+""" Output:
+unknown (name not found), saved as Unk
+andy (androgynous), saved as And
+male, saved as M
+female, saved as F
+mostly_male, saved as M?
+mostly_female, saved as F?
+"""
+guess = gender_guesser.Detector()
+guess_dict = {'unknown': 'Unk',
+              'andy': 'And',
+              'male': 'M',
+              'female': 'F',
+              'mostly_male': 'M?',
+              'mostly_female': 'F?'}
+
+
+def element_text(element) -> str:
+    """ Text of an lxml element, with whitespace collapsed like Selenium's WebElement.text.
+
+    Parameters:
+        element: lxml element.
+    Returns:
+        text (str): text content of element, one space between words.
+    """
+    return " ".join(element.text_content().split())
+# End of function element_text.
+
+
+def make_http_session(driver, connections: int = 2, headers: dict = None) -> requests.Session:
+    """ Make an HTTP session with the cookies and user agent of a logged-in Selenium driver.
+    The session keeps its connections alive between requests, and accepts gzip-compressed responses.
+
+    Parameters:
+        driver: Selenium driver object, after logging into Wyzant.
+        connections (int): connections kept alive, one for each request made at once.
+        headers (dict): headers sent with every request, besides User-Agent and Accept-Encoding.
+    Returns:
+        session (requests.Session): HTTP session logged into Wyzant.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=connections))
+    session.headers.update({"User-Agent": driver.execute_script("return navigator.userAgent;"),
+                            "Accept-Encoding": "gzip, deflate"})
+    session.headers.update(headers or {})
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"),
+                            path=cookie.get("path", "/"), secure=cookie.get("secure", False))
+    return session
+# End of function make_http_session.
+
+
+@lru_cache(maxsize=None)
+def guess_gender(name_part: str) -> str:
+    """ Function guess_gender.
+
+    Parameters: One part of a name.
+    Returns: Gender of name_part, one of the values of guess_dict.
+    """
+    return guess_dict[guess.get_gender(name_part)]
@@ -0,0 +1,574 @@
+""" wyzant_driver.py
+
+SUMMARY: Function make_driver starts a pre-configured headless browser, logged into Wyzant.
+Class DriverPool keeps a warm pool of such browsers, so that scripts can lease several at once,
+and can swap to a standby browser immediately when one fails.
+
+Each script chooses its browser, one of BROWSERS:
+chrome: headless Chrome, with chromedriver.
+firefox: headless Firefox, with geckodriver.
+http: class HttpDriver, which fetches pages with requests and finds elements with lxml.  It has no
+      JavaScript, so only suits pages rendered by the server, such as tutor profiles, but starts at once,
+      and takes a few MB rather than a few hundred.  It logs in with the cookies cached by wyzant_login,
+      starting Chrome once to log in if there are none.
+
+Each script also chooses what its browser does not download, one of BLOCK_PROFILES, since the scripts only
+read text and attributes, never images, media, fonts, analytics or ads:
+none: download everything.
+media: block images, media and fonts.
+lean: block images, media, fonts and third-party trackers.
+Chrome blocks the URL patterns of BLOCKED_URLS with the DevTools command Network.setBlockedURLs, and images
+with its content settings too.  Firefox has no such command, so it uses its preferences instead: no images,
+no downloadable fonts, no autoplay, and its own tracking protection.  HttpDriver never downloads any of these.
+The src of an img is still in the page when its image is blocked, so checks such as for silhouette.png work.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+# Web Browser independent Selenium imports.
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+# Web Browser dependent Selenium code.
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+from wyzant_login import log_into_wyzant, get_chromedriver_path, get_geckodriver_path, load_session
+
+# Other packages.
+import requests
+from contextlib import contextmanager
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+from urllib.parse import urljoin
+from queue import Queue, Empty
+from threading import Lock, Thread
+from traceback import print_exception
+from sys import exc_info
+
+# CONSTANTS.
+
+TIMEOUT = 30  # Seconds.
+POOL_SIZE = 2  # Browsers.
+POOL_MAX_PAGES = 500  # Pages loaded by a browser before it is replaced.
+POOL_MAX_HEAP_MB = 1024  # JavaScript heap size of a browser, in MB, before it is replaced.
+LEASE_TIMEOUT = 300  # Seconds to wait for an idle browser.
+
+# Browsers.
+BROWSERS = ('chrome', 'firefox', 'http')
+JS_BROWSERS = ('chrome', 'firefox')  # Browsers that run JavaScript.
+BROWSER = 'chrome'  # Default browser.
+WINDOW_WIDTH = 1920  # Pixels.
+WINDOW_HEIGHT = 2200  # Pixels.
+
+# Resource blocking.
+BLOCK_PROFILES = {'none': [],
+                  'media': ['images', 'media', 'fonts'],
+                  'lean': ['images', 'media', 'fonts', 'trackers']}
+BLOCK_PROFILE = 'none'  # Default, for callers that do not choose.
+# URL patterns for Network.setBlockedURLs, by kind of resource.  "*" matches any characters.
+BLOCKED_URLS = {'images': ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico", "*.ico?*",
+                           "*.avif*"],
+                'media': ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*.ogg*", "*.wav*"],
+                'fonts': ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*", "*fonts.googleapis.com*",
+                          "*fonts.gstatic.com*", "*use.typekit.net*"],
+                'trackers': ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+                             "*googlesyndication.com*", "*googleadservices.com*", "*connect.facebook.net*",
+                             "*hotjar.com*", "*segment.com*", "*segment.io*", "*bat.bing.com*", "*clarity.ms*",
+                             "*fullstory.com*", "*newrelic.com*", "*nr-data.net*", "*optimizely.com*",
+                             "*/analytics.js*", "*/gtm.js*", "*/fbevents.js*"]}
+# Firefox preferences, by kind of resource.
+FIREFOX_BLOCK_PREFS = {'images': {"permissions.default.image": 2},
+                       'media': {"media.autoplay.default": 5, "media.preload.default": 0},
+                       'fonts': {"gfx.downloadable_fonts.enabled": False},
+                       'trackers': {"privacy.trackingprotection.enabled": True}}
+
+# HttpDriver.
+HTTP_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                              "(KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"}
+# Locators of By, other than By.XPATH and By.CSS_SELECTOR, as XPaths for lxml.
+HTTP_XPATHS = {By.ID: './/*[@id="{}"]',
+               By.NAME: './/*[@name="{}"]',
+               By.TAG_NAME: './/{}',
+               By.CLASS_NAME: './/*[contains(concat(" ", normalize-space(@class), " "), " {} ")]',
+               By.LINK_TEXT: './/a[normalize-space(.)="{}"]',
+               By.PARTIAL_LINK_TEXT: './/a[contains(., "{}")]'}
+# Elements that start and end a line of text, as laid out by a browser, and elements with no visible text.
+BLOCK_TAGS = frozenset(['address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset',
+                        'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+                        'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'tr', 'ul'])
+CELL_TAGS = frozenset(['td', 'th'])
+HIDDEN_TAGS = frozenset(['head', 'noscript', 'script', 'style', 'template', 'title'])
+
+
+def blocked_urls(block: str) -> list:
+    """ Function blocked_urls.
+
+    Parameters:
+        block (str): one of BLOCK_PROFILES.
+    Returns: URL patterns blocked by the profile.
+    """
+    if block not in BLOCK_PROFILES:
+        raise ValueError(f"Unknown block profile {block}, not one of {list(BLOCK_PROFILES)}.")
+    return [pattern for kind in BLOCK_PROFILES[block] for pattern in BLOCKED_URLS[kind]]
+
+
+def chrome_driver(block: str = BLOCK_PROFILE):
+    """ Function chrome_driver.
+
+    Parameters:
+        block (str): one of BLOCK_PROFILES.
+    Returns: Selenium driver object for headless Chrome.
+    """
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument(f"--window-size={WINDOW_WIDTH},{WINDOW_HEIGHT}")
+    patterns = blocked_urls(block)
+    if 'images' in BLOCK_PROFILES[block]:
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    service = Service(get_chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=options)
+    if patterns:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return driver
+
+
+def firefox_driver(block: str = BLOCK_PROFILE):
+    """ Function firefox_driver.
+
+    Parameters:
+        block (str): one of BLOCK_PROFILES.
+    Returns: Selenium driver object for headless Firefox.
+    """
+    options = FirefoxOptions()
+    options.add_argument('-headless')
+    options.add_argument(f"--width={WINDOW_WIDTH}")
+    options.add_argument(f"--height={WINDOW_HEIGHT}")
+    blocked_urls(block)  # Check the profile.
+    for kind in BLOCK_PROFILES[block]:
+        for name, value in FIREFOX_BLOCK_PREFS[kind].items():
+            options.set_preference(name, value)
+    service = FirefoxService(get_geckodriver_path())
+    return webdriver.Firefox(service=service, options=options)
+
+
+class HttpElement:
+    """ An element of a page fetched by HttpDriver, with the parts of the Selenium WebElement interface
+    the scripts use.
+    """
+
+    def __init__(self, element):
+        """ Function __init__.
+
+        Parameters:
+            element: lxml element.
+        """
+        self.element = element
+
+    @property
+    def tag_name(self) -> str:
+        """ Tag of the element. """
+        return self.element.tag
+
+    @property
+    def text(self) -> str:
+        """ Text of the element, as Selenium's WebElement.text: see visible_text. """
+        return visible_text(self.element)
+
+    def get_attribute(self, name: str) -> str:
+        """ Value of an attribute, or None.  href and src are made absolute, as by a browser. """
+        value = self.element.get(name)
+        if value is not None and name in ('href', 'src'):
+            value = urljoin(self.element.base_url or "", value)
+        return value
+
+    def is_displayed(self) -> bool:
+        """ True, since there is no layout to hide it, unless hidden by its style attribute. """
+        return "display: none" not in (self.element.get('style') or "")
+
+    def is_enabled(self) -> bool:
+        """ True unless disabled. """
+        return self.element.get('disabled') is None
+
+    def find_elements(self, by: str = By.ID, value: str = None) -> list:
+        """ Elements under this one found by a locator. """
+        return [HttpElement(element) for element in find_lxml(self.element, by, value)]
+
+    def find_element(self, by: str = By.ID, value: str = None):
+        """ First element under this one found by a locator.  Raises NoSuchElementException if none. """
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element found by {by} {value}.")
+        return elements[0]
+# End of class HttpElement.
+
+
+def visible_text(element) -> str:
+    """ Function visible_text.  Text of an lxml element, by Selenium's rules for WebElement.text, without the
+    layout a browser has: block elements and <br> start new lines, text of inline elements stays on the line,
+    whitespace is collapsed to one space, table cells are separated by a space, and elements hidden by their
+    style attribute, scripts and styles are left out.
+
+    Parameters:
+        element: lxml element.
+    Returns: Text, with lines separated by "\n".
+    """
+    lines = [[]]  # Text pieces of each line.
+
+    def end_line(always: bool = False) -> None:
+        if always or "".join(lines[-1]).strip():
+            lines.append([])
+
+    def add_text(element) -> None:
+        tag = element.tag if isinstance(element.tag, str) else None  # None for comments.
+        if tag is None or tag in HIDDEN_TAGS or "display: none" in (element.get('style') or ""):
+            return
+        if tag == 'br':
+            end_line(always=True)
+            return
+        if tag in BLOCK_TAGS:
+            end_line()
+        elif tag in CELL_TAGS:
+            lines[-1].append(" ")
+        lines[-1].append(element.text or "")
+        for child in element:
+            add_text(child)
+            lines[-1].append(child.tail or "")
+        if tag in BLOCK_TAGS:
+            end_line()
+
+    add_text(element)
+    return "\n".join(" ".join("".join(line).split()) for line in lines).strip()
+
+
+def find_lxml(element, by: str, value: str) -> list:
+    """ Function find_lxml.
+
+    Parameters:
+        element: lxml element to search under.
+        by (str): locator strategy, one of By.
+        value (str): locator.
+    Returns: lxml elements found.
+    """
+    if by == By.XPATH:
+        # An XPath starting with "/" searches the whole page, as in Selenium.
+        return [found for found in element.xpath(value) if isinstance(found, lxml_html.HtmlElement)]
+    if by == By.CSS_SELECTOR:
+        # Needs the cssselect package.
+        return element.cssselect(value)
+    if by in HTTP_XPATHS:
+        return element.xpath(HTTP_XPATHS[by].format(value))
+    raise WebDriverException(f"HttpDriver does not support locating elements by {by}.")
+
+
+class HttpDriver:
+    """ A browser without JavaScript: fetches pages with a requests Session, and finds elements with lxml.
+    Has the parts of the Selenium WebDriver interface the scripts use, so it can replace Chrome for pages
+    rendered by the server.
+    """
+    fills_forms = False  # Elements have no send_keys or click, so log_into_wyzant needs cached cookies.
+
+    def __init__(self):
+        """ Function __init__. """
+        self.session = requests.Session()
+        self.session.headers.update(HTTP_HEADERS)
+        self.session.mount("https://", HTTPAdapter(max_retries=2))
+        self.current_url = None
+        self.page_source = ""
+        self.status_code = None
+        self.tree = lxml_html.fromstring("<html></html>")
+
+    def get(self, url: str) -> None:
+        """ Load a page, following redirects. """
+        response = self.session.get(url, timeout=TIMEOUT)
+        self.current_url = response.url
+        self.status_code = response.status_code
+        self.page_source = response.text
+        self.tree = lxml_html.fromstring(response.content or b"<html></html>", base_url=response.url)
+
+    def refresh(self) -> None:
+        """ Load the current page again. """
+        if self.current_url:
+            self.get(self.current_url)
+
+    @property
+    def title(self) -> str:
+        """ Title of the current page. """
+        titles = self.tree.xpath('//title')
+        return titles[0].text_content().strip() if titles else ""
+
+    def find_elements(self, by: str = By.ID, value: str = None) -> list:
+        """ Elements of the current page found by a locator. """
+        return [HttpElement(element) for element in find_lxml(self.tree, by, value)]
+
+    def find_element(self, by: str = By.ID, value: str = None):
+        """ First element of the current page found by a locator.  Raises NoSuchElementException if none. """
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element found by {by} {value}.")
+        return elements[0]
+
+    def execute_script(self, script: str, *args):
+        """ Raises WebDriverException, since there is no JavaScript. """
+        raise WebDriverException("HttpDriver does not run JavaScript.")
+
+    def get_cookies(self) -> list:
+        """ Cookies of the session, as Selenium returns them. """
+        return [{'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path,
+                 'secure': cookie.secure} for cookie in self.session.cookies]
+
+    def add_cookie(self, cookie: dict) -> None:
+        """ Add a cookie, as returned by Selenium, to the session. """
+        self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ""),
+                                 path=cookie.get('path', "/"))
+
+    def delete_all_cookies(self) -> None:
+        """ Delete all cookies of the session. """
+        self.session.cookies.clear()
+
+    def maximize_window(self) -> None:
+        """ Nothing to do, without a window. """
+
+    def quit(self) -> None:
+        """ Close the session. """
+        self.session.close()
+# End of class HttpDriver.
+
+
+def make_driver(log_in: bool = True, browser: str = BROWSER, block: str = BLOCK_PROFILE):
+    """ Function make_driver.  Start a headless browser, and log into Wyzant.
+
+    Parameters:
+        log_in (bool): log into Wyzant if True.
+        browser (str): one of BROWSERS.
+        block (str): one of BLOCK_PROFILES, what the browser does not download.
+    Returns: Selenium driver object, or HttpDriver.
+    """
+    cookies = None
+    if browser == 'http':
+        if log_in:
+            cookies = load_session()
+            if cookies is None:
+                # Log in with Chrome once, which caches the cookies HttpDriver logs in with.
+                chrome = make_driver(log_in=True, browser='chrome', block=block)
+                try:
+                    cookies = chrome.get_cookies()
+                finally:
+                    quit_driver(chrome)
+        driver = HttpDriver()
+    else:
+        # Selenium options.
+        print("Initializing Selenium.")
+        if browser == 'chrome':
+            driver = chrome_driver(block)
+        elif browser == 'firefox':
+            driver = firefox_driver(block)
+        else:
+            raise ValueError(f"Unknown browser {browser}, not one of {BROWSERS}.")
+
+        # Maximize the browser window.
+        driver.maximize_window()
+
+        print("Done initializing Selenium.")
+
+    # Log into wyzant.
+    if log_in:
+        driver = log_into_wyzant(driver, cookies)
+
+    return driver
+# End of function make_driver.
+
+
+def quit_driver(driver) -> None:
+    """ Function quit_driver.  Quit a browser, ignoring errors from browsers that already crashed.
+
+    Parameters: Selenium driver object.
+    Returns:
+    """
+    try:
+        driver.quit()
+    except Exception:
+        pass
+# End of function quit_driver.
+
+
+def is_healthy(driver) -> bool:
+    """ Function is_healthy.
+
+    Parameters: Selenium driver object.
+    Returns: True if the browser still responds to commands.
+    """
+    if isinstance(driver, HttpDriver):
+        # Nothing to crash.
+        return True
+    try:
+        return driver.execute_script("return 1;") == 1
+    except Exception:
+        return False
+# End of function is_healthy.
+
+
+def heap_mb(driver) -> float:
+    """ Function heap_mb.
+
+    Parameters: Selenium driver object.
+    Returns: JavaScript heap size of the current page, in MB, or 0 if unknown.
+    """
+    try:
+        heap = driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : 0;")
+        return heap / 2**20
+    except Exception:
+        return 0
+# End of function heap_mb.
+
+
+class DriverPool:
+    """ A pool of browsers logged into Wyzant, started in the background.
+
+    Lease a browser with lease() or leased(), and give it back with release().  Browsers that fail
+    their health check, that have loaded max_pages pages, or whose heap exceeds max_heap_mb, are quit
+    and replaced in the background, so the pool always has size browsers, leased or standing by.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, log_in: bool = True, max_pages: int = POOL_MAX_PAGES,
+                 max_heap_mb: float = POOL_MAX_HEAP_MB, browser: str = BROWSER, block: str = BLOCK_PROFILE):
+        """ Start size browsers in the background.
+
+        Parameters:
+            size (int): number of browsers in the pool.
+            log_in (bool): log browsers into Wyzant if True.
+            max_pages (int): pages a browser loads before it is replaced.
+            max_heap_mb (float): heap size in MB of a browser before it is replaced.
+            browser (str): one of BROWSERS.
+            block (str): one of BLOCK_PROFILES.
+        """
+        self.size = size
+        self.log_in = log_in
+        self.browser = browser
+        self.block = block
+        self.max_pages = max_pages
+        self.max_heap_mb = max_heap_mb
+        self._idle = Queue()
+        self._pages = dict()  # Pages loaded, by id() of driver.
+        self._lock = Lock()
+        self._closed = False
+        for _ in range(size):
+            self._start_driver()
+
+    def _start_driver(self) -> None:
+        """ Start a browser in a background thread, and add it to the idle browsers when ready. """
+        def start():
+            try:
+                driver = make_driver(self.log_in, self.browser, self.block)
+            except Exception:
+                print("Failed to start a browser for the pool:")
+                print_exception(*exc_info(), limit=None)
+                # Leave a placeholder, so lease() starts the browser itself instead of waiting forever.
+                driver = None
+            with self._lock:
+                if self._closed:
+                    if driver is not None:
+                        quit_driver(driver)
+                    return
+                if driver is not None:
+                    self._pages[id(driver)] = 0
+            self._idle.put(driver)
+        Thread(target=start, daemon=True).start()
+
+    def standby(self) -> int:
+        """ Number of idle browsers, ready to lease immediately. """
+        return self._idle.qsize()
+
+    def lease(self, timeout: float = LEASE_TIMEOUT):
+        """ Lease a healthy browser, waiting for one to start if none are idle.
+
+        Parameters:
+            timeout (float): seconds to wait for an idle browser.
+        Returns: Selenium driver object.
+        Raises:
+            WebDriverException: if no browser is idle within timeout, or one cannot be started in place of a
+                                browser that failed to start.
+        """
+        while True:
+            try:
+                driver = self._idle.get(timeout=timeout)
+            except Empty:
+                raise WebDriverException(f"No browser in the pool was ready within {timeout} seconds.") from None
+            if driver is None:
+                try:
+                    driver = make_driver(self.log_in, self.browser, self.block)
+                except BaseException:
+                    # Give the slot back, so the next lease() tries again instead of waiting forever.
+                    self._idle.put(None)
+                    raise
+                with self._lock:
+                    self._pages[id(driver)] = 0
+            if is_healthy(driver):
+                return driver
+            self.discard(driver)
+
+    def release(self, driver, pages: int = 1) -> None:
+        """ Give a leased browser back to the pool, after it loaded pages more pages.
+        The browser is replaced if it has loaded too many pages, or its heap is too big.
+
+        Parameters:
+            driver: Selenium driver object, from lease().
+            pages (int): pages loaded since the browser was leased.
+        """
+        with self._lock:
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + pages
+            worn_out = self._pages[id(driver)] >= self.max_pages
+        if worn_out or heap_mb(driver) > self.max_heap_mb or self._closed:
+            self.discard(driver)
+        else:
+            self._idle.put(driver)
+
+    def discard(self, driver) -> None:
+        """ Quit a leased browser, for example after an exception, and start a replacement in the background.
+
+        Parameters:
+            driver: Selenium driver object, from lease().
+        """
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        quit_driver(driver)
+        if not self._closed:
+            self._start_driver()
+
+    @contextmanager
+    def leased(self, pages: int = 1):
+        """ Lease a browser for a with block.  The browser is discarded if the block raises an exception.
+
+        Parameters:
+            pages (int): pages the with block loads.
+        """
+        driver = self.lease()
+        try:
+            yield driver
+        except Exception:
+            self.discard(driver)
+            raise
+        else:
+            self.release(driver, pages)
+
+    def close(self) -> None:
+        """ Quit all idle browsers.  Browsers still leased are quit when released. """
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except Empty:
+                break
+            if driver is not None:
+                quit_driver(driver)
+# End of class DriverPool.
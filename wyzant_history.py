@@ -1,13 +1,21 @@
 """ wyzant_history.py
 
 SUMMARY:
-    Use Selenium to get my entire tutoring history and:
-    1.  Write it to a csv or tsv (tab-separated-values) file.
+    Use Selenium to get my tutoring history and:
+    1.  Write it to a csv or tsv (tab-separated-values) file, an SQLite database,
+        or Parquet files with typed columns (needs pyarrow), one file per run.
     2.  Print it in the same format.
-    Have disabled (but not removed) ability to scrape multiple pages to get the
-    entire tutoring history, since I already have the entire tutoring history
-    in an Excel workbook, and update only the last 3 or so months of the
-    tutoring history.
+    Rows are streamed, page by page, from the history pages to the output:
+    each 200-row page is read with one HTML snapshot, and parsed with lxml.
+    The date and time of the newest session exported is saved in a checkpoint
+    file next to the output.  Later runs add only newer sessions, and stop
+    paging at the first session already exported.  Delete the checkpoint file
+    to export the entire tutoring history again.
+    The checkpoint only moves once a run finishes.  A csv or tsv file is
+    rewritten in a temporary file, with the new sessions first, so it stays
+    newest first, and only replaces the old file when the run finishes.
+    An interrupted run leaves the output as it was, except for SQLite, whose
+    rows are keyed by date and time, so a session exported twice is saved once.
 
 REPOSITORY:
     https://github.com/DavidJLambert/wyzant
@@ -16,39 +24,51 @@ AUTHOR:
     David J. Lambert
 
 VERSION:
-    0.6.1
+    0.7.0
 
 DATE:
-    May 12, 2024
+    Oct 18, 2026
 """
 
 # Web Browser independent Selenium imports.
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as ec
 
-# Web Browser dependent Selenium code
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-
-from wyzant_login import log_into_wyzant
+from wyzant_driver import make_driver, quit_driver
+from wyzant_common import element_text
+from parquet_sink import ParquetSink, require_pyarrow, to_date, to_decimal, to_int, pa
 
 # Other packages.
 import csv
 import os
+import sqlite3
+from datetime import datetime
+from lxml import html as lxml_html
 from time import sleep, strptime, strftime
-# import zipfile
 
 # CONSTANTS.
 
 TIMEOUT = 30  # Seconds.
+BLOCK_PROFILE = 'lean'  # What the browser does not download, one of wyzant_driver.BLOCK_PROFILES.
 SHORT_SLEEP_TIME = 2  # Seconds.
-LONG_SLEEP_TIME = 5  # Seconds.
 FILE_NAME = './output/history'
 CSV = 'csv'
 TSV = 'tsv'
+SQLITE = 'sqlite3'
+PARQUET = 'parquet'  # A directory, with one Parquet file per run.
+CHECKPOINT_EXTENSION = '.checkpoint'
+PAGE_SIZE = "200"  # Rows per history page.
+
+HISTORY_URL = "https://www.wyzant.com/tutor/lessons"
+ID_PREFIX = "ctl00_ctl00_PageCPH_CenterColumnCPH_LessonDisplay1_"
+SHOW_ALL_ID = ID_PREFIX + "btnShowAll"
+PAGE_SIZE_ID = ID_PREFIX + "ListViewSession_Pager_DDPageSize"
+NEXT_PAGE_ID = ID_PREFIX + "ListViewSession_Pager_NextPageBTN"
+
+HEADINGS = ['Date', 'Time', 'Min', 'Hrs', 'Entered', 'Online', 'Student', 'Subject', 'Rating',
+            'Rate', 'Pay', 'Earned', 'Miles', 'Payment', 'Status']
+DATE_FORMATS = ["%m/%d/%Y", "%m/%d/%y", "%b %d, %Y"]  # Formats tried for the session date.
 
 
 def time_fmt(convert_me: str) -> str:
@@ -62,185 +82,416 @@ def time_fmt(convert_me: str) -> str:
     return output
 
 
-def main():
-    """ Function main.  Get all recommendations.
+def session_key(row: list) -> str:
+    """ Function session_key.
 
-    Parameters:
-    Returns:
+    Parameters: A history row, from parse_history_row.
+    Returns: Date and time of the session, in 'YYYY-MM-DD HH:MM' format, which sorts in time order.
     """
-    # Get output format.
-    delimiter = '\t'
-    while True:
-        fmt = input("Enter 'c' for csv output, or 't' or press 'Enter' for tab-separated value output: ")
-        extension = fmt.lower()
-        if extension == 'c':
-            extension = CSV
-            delimiter = ','
-        elif extension in ['t', '']:
-            extension = TSV
-            delimiter = '\t'
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(row[0], date_format).strftime("%Y-%m-%d") + " " + row[1]
+        except ValueError:
+            pass
+    raise ValueError(f"Unknown session date format: '{row[0]}'.")
 
-        if extension in [CSV, TSV]:
-            print(f"You chose {extension} format.")
-            break
-        else:
-            print(f"'{fmt}' was not an option, doofus.")
 
-    # Selenium options.
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument("--window-size=1920,2200")
+def parse_history_row(t_row) -> list:
+    """ Parse one row of the history table.
 
-    # Connect to the Selenium web driver.
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    Parameters:
+        t_row: lxml element for a "tr" in the history table.
+    Returns:
+        row (list): values for each of HEADINGS.
+    """
+    row = []
+
+    # Find cells in the current row.
+    t_cells = t_row.xpath('./td')
+
+    # Cell  0 "Date", date and time
+    # date
+    row.append(element_text(t_cells[0].xpath('./span[1]/span[1]')[0]))
+    # time
+    row.append(time_fmt(element_text(t_cells[0].xpath('./span[2]')[0])))
+    # Cell  1 "Minutes"
+    value = element_text(t_cells[1])[:-4]
+    row.append(value)
+    # Cell  2 "Hours"
+    row.append(str(int(value)/60))
+    # Cell  3 "Entered" date
+    row.append(element_text(t_cells[2].xpath('./span/span[1]')[0]))
+    # Cell  4 "Online" yes/no
+    row.append(element_text(t_cells[3]))
+    # Cell  5 "Student" name and location
+    name = element_text(t_cells[4].xpath('./span/a')[0])
+    location = element_text(t_cells[4].xpath('./span/span')[0])
+    row.append(name + ", " + location)
+    # Cell  6 "Subject"
+    row.append(element_text(t_cells[5]))
+    # Cell  7 "Rating", "No Rating" or 1-5 stars
+    value = element_text(t_cells[6])
+    if value == "":
+        value = str(len(t_cells[6].xpath('./div/span[contains(@class, "wc-yellow")]')))
+    else:
+        value = ""
+    row.append(value)
+    # Cell  8 "Rate", $/hr
+    row.append(element_text(t_cells[7])[1:-3])
+    # Cell  9 "Pay", always 75%?
+    row.append(element_text(t_cells[8])[:-1])
+    # Cell 10 "Earned" $
+    row.append(element_text(t_cells[9])[1:])
+    # Cell 11 "Mileage" blank or "<N> miles"
+    value = element_text(t_cells[10])
+    if value != "":
+        value = value[:-6]
+    row.append(value)
+    # Cell 12 "Payment" date
+    values = t_cells[11].xpath('./a/span/span[1]')
+    if len(values) > 0:
+        # Payment date present.
+        row.append(element_text(values[0]))
+        # Cell 13 "Status", "complete" or "void"
+        row.append(element_text(t_cells[12].xpath('./a')[0]))
+    else:
+        # No payment date present, so leave date blank and set status = void
+        row.append("void")
+        row.append("void")
+
+    return row
+# End of function parse_history_row.
+
+
+def parse_history_page(page_source: str) -> list:
+    """ Parse all rows of one history page.
 
-    # Maximize the browser window.
-    driver.maximize_window()
+    Parameters:
+        page_source (str): HTML of the history page.
+    Returns:
+        rows (list): one row per session, from parse_history_row.
+    """
+    tree = lxml_html.document_fromstring(page_source)
+    return [parse_history_row(t_row) for t_row in tree.xpath('(//tbody)[1]/tr')]
+# End of function parse_history_page.
 
-    print("Done initializing Selenium.")
 
-    # Log into wyzant.
-    driver = log_into_wyzant(driver)
+def history_pages(driver):
+    """ Generator of history pages, PAGE_SIZE rows each, newest sessions first.  Goes to the next page only
+    when the caller asks for it, so a caller that stops early stops the paging too.
 
+    Parameters:
+        driver: Selenium web driver, logged into Wyzant.
+    Yields:
+        page_source (str): HTML of one history page.
+    """
     print("Going to the Wyzant lesson history page.")
-
-    driver.get("https://www.wyzant.com/tutor/lessons")
-    this_id = "ctl00_ctl00_PageCPH_CenterColumnCPH_LessonDisplay1_ListViewSession_Pager_NextPageBTN"
-    WebDriverWait(driver, TIMEOUT).until(ec.visibility_of_element_located((By.ID, this_id)))
-
+    driver.get(HISTORY_URL)
+    WebDriverWait(driver, TIMEOUT).until(ec.visibility_of_element_located((By.ID, NEXT_PAGE_ID)))
     print("At Wyzant tutoring history page.")
 
     # Click the "Show All" link.
-    show_all = driver.find_element(By.ID, value='ctl00_ctl00_PageCPH_CenterColumnCPH_LessonDisplay1_btnShowAll')
     sleep(SHORT_SLEEP_TIME)
-    show_all.click()
+    driver.find_element(By.ID, value=SHOW_ALL_ID).click()
     sleep(SHORT_SLEEP_TIME)
 
-    # Select 200 entries per page.
-    this_id = 'ctl00_ctl00_PageCPH_CenterColumnCPH_LessonDisplay1_ListViewSession_Pager_DDPageSize'
-    per_page = Select(driver.find_element(By.ID, value=this_id))
-    per_page.select_by_value("200")
-    sleep(LONG_SLEEP_TIME)
+    # Select PAGE_SIZE entries per page.  Changing it reloads the page.
+    per_page = Select(driver.find_element(By.ID, value=PAGE_SIZE_ID))
+    if per_page.first_selected_option.get_attribute("value") != PAGE_SIZE:
+        t_body = driver.find_element(By.XPATH, '//tbody')
+        per_page.select_by_value(PAGE_SIZE)
+        WebDriverWait(driver, TIMEOUT).until(ec.staleness_of(t_body))
+
+    page_num = 1
+    while True:
+        WebDriverWait(driver, TIMEOUT).until(ec.presence_of_element_located((By.XPATH, '//tbody')))
+        print(f"In Wyzant history page {page_num}.")
+        yield driver.page_source
+
+        # ">" link to move to next page, with an empty href on the last page.
+        next_page = driver.find_element(By.ID, value=NEXT_PAGE_ID)
+        href = (next_page.get_attribute("href") or "").strip()
+        if href == "":
+            break
+        t_body = driver.find_element(By.XPATH, '//tbody')
+        next_page.click()
+        WebDriverWait(driver, TIMEOUT).until(ec.staleness_of(t_body))
+        page_num += 1
+# End of function history_pages.
 
-    print("In first Wyzant history page.")
 
-    with open(FILE_NAME + extension, 'w', newline='') as output:
-        csvwriter = csv.writer(output, delimiter=delimiter)
+def new_history_rows(pages, checkpoint: str):
+    """ Generator of the rows in history pages newer than the checkpoint.
 
-        # Heading row.
-        row = ['Date', 'Time', 'Min', 'Hrs', 'Entered', 'Online', 'Student', 'Subject', 'Rating',
-               'Rate', 'Pay', 'Earned', 'Miles', 'Payment', 'Status']
-        if extension == CSV:
+    Parameters:
+        pages: iterable of history page HTML, newest sessions first, from history_pages.
+        checkpoint (str): session_key of the newest session already exported, "" if none.
+    Yields:
+        row (list): one row per session, newest first.
+    """
+    for page_source in pages:
+        for row in parse_history_page(page_source):
+            if checkpoint and session_key(row) <= checkpoint:
+                return
+            yield row
+# End of function new_history_rows.
+
+
+class CsvSink:
+    """ Adds history rows to the top of a csv or tsv file, below its heading row, so the file stays newest first.
+    Rows are written to a temporary file, followed by the rows of the old file, which it then replaces. """
+
+    def __init__(self, path: str, delimiter: str):
+        """ Function __init__.
+
+        Parameters:
+            path (str): path of the output file.
+            delimiter (str): ',' or tab.
+        """
+        self.path = path
+        self.temp_path = path + '.tmp'
+        self.delimiter = delimiter
+        self.output = open(self.temp_path, 'w', newline='')
+        self.csvwriter = csv.writer(self.output, delimiter=delimiter)
+        self.write(HEADINGS)
+
+    def write(self, row: list) -> None:
+        """ Write and print one row. """
+        if self.delimiter == ',':
             print(row)
         else:
-            print(delimiter.join(row))
-        csvwriter.writerow(row)
-
-        # Go to every page in the history
-        while True:
-
-            # Get table tbody.
-            t_body = driver.find_element(By.XPATH, '//tbody')
-
-            # Find all rows in tbody and iterate over them.
-            t_rows = t_body.find_elements(By.XPATH, './tr')
-            for t_row in t_rows:
-                row = []
-
-                # Find cells in the current row.
-                t_cells = t_row.find_elements(By.XPATH, './td')
-
-                # Cell  0 "Date", date and time
-                # date
-                value = t_cells[0].find_element(By.XPATH, './span[1]/span[1]').text.strip()
-                row.append(value)
-                # time
-                value = t_cells[0].find_element(By.XPATH, './span[2]').text.strip()
-                row.append(time_fmt(value))
-                # Cell  1 "Minutes"
-                value = t_cells[1].text.strip()[:-4]
-                row.append(value)
-                # Cell  2 "Hours"
-                value = str(int(value)/60)
-                row.append(value)
-                # Cell  3 "Entered" date
-                value = t_cells[2].find_element(By.XPATH, './span/span[1]').text.strip()
-                row.append(value)
-                # Cell  4 "Online" yes/no
-                value = t_cells[3].text.strip()
-                row.append(value)
-                # Cell  5 "Student" name and location
-                name = t_cells[4].find_element(By.XPATH, './span/a').text.strip()
-                location = t_cells[4].find_element(By.XPATH, './span/span').text.strip()
-                row.append(name + ", " + location)
-                # Cell  6 "Subject"
-                value = t_cells[5].text.strip()
-                row.append(value)
-                # Cell  7 "Rating", "No Rating" or 1-5 stars
-                value = t_cells[6].text.strip()
-                if value == "":
-                    xpath = './div/span[contains(@class, "wc-yellow")]'
-                    value = t_cells[6].find_elements(By.XPATH, xpath)
-                    value = str(len(value))
-                else:
-                    value = ""
-                row.append(value)
-                # Cell  8 "Rate", $/hr
-                value = t_cells[7].text.strip()[1:-3]
-                row.append(value)
-                # Cell  9 "Pay", always 75%?
-                value = t_cells[8].text.strip()[:-1]
-                row.append(value)
-                # Cell 10 "Earned" $
-                value = t_cells[9].text.strip()[1:]
-                row.append(value)
-                # Cell 11 "Mileage" blank or "<N> miles"
-                value = t_cells[10].text.strip()
-                if value != "":
-                    value = value[:-6]
-                row.append(value)
-                # Cell 12 "Payment" date
-                values = t_cells[11].find_elements(By.XPATH, './a/span/span[1]')
-                if len(values) > 0:
-                    # Payment date present.
-                    value = values[0]
-                    row.append(value.text.strip())
-                    # Cell 13 "Status", "complete" or "void"
-                    value = t_cells[12].find_element(By.XPATH, './a').text.strip()
-                    row.append(value)
-                else:
-                    # No payment date present, so leave date blank and set status = void
-                    row.append("void")
-                    row.append("void")
-
-                # Save row.
-                if extension == CSV:
-                    print(row)
-                else:
-                    print(delimiter.join(row))
-                csvwriter.writerow(row)
-
-            # xpath of ">" link to move to next page.
-            xpath = '//a[@id="ctl00_ctl00_PageCPH_CenterColumnCPH_LessonDisplay1_ListViewSession_Pager_NextPageBTN"]'
-            next_page = driver.find_element(By.XPATH, xpath)
-            href = next_page.get_attribute("href").strip()
-
-            if href != "":
-                next_page.click()
-                sleep(LONG_SLEEP_TIME)
-            else:
-                break
-
-            # Comment out to allow multiple loops.
-            break
+            print(self.delimiter.join(row))
+        self.csvwriter.writerow(row)
+
+    def close(self) -> None:
+        """ Copy the rows of the old file after the new rows, and replace the old file. """
+        if os.path.isfile(self.path):
+            with open(self.path, 'r', newline='') as old_file:
+                old_rows = csv.reader(old_file, delimiter=self.delimiter)
+                next(old_rows, None)  # Heading row.
+                self.csvwriter.writerows(old_rows)
+        self.output.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self) -> None:
+        """ Throw away the new rows, leaving the old file as it was. """
+        self.output.close()
+        os.remove(self.temp_path)
+# End of class CsvSink.
+
+
+class SqliteSink:
+    """ Saves history rows to table History of an SQLite database, one transaction per page of rows. """
+
+    def __init__(self, path: str):
+        """ Function __init__.
+
+        Parameters:
+            path (str): path of the SQLite database.
+        """
+        self.connection = sqlite3.connect(path)
+        columns = ", ".join(f"{heading} TEXT" for heading in HEADINGS)
+        self.connection.execute(f"CREATE TABLE IF NOT EXISTS History ({columns}, PRIMARY KEY (Date, Time))")
+        self.insert_sql = (f"INSERT OR REPLACE INTO History ({', '.join(HEADINGS)}) "
+                           f"VALUES ({', '.join('?' * len(HEADINGS))})")
+        self.rows = []
+
+    def write(self, row: list) -> None:
+        """ Print one row, and buffer it. """
+        print(row)
+        self.rows.append(row)
+        if len(self.rows) >= int(PAGE_SIZE):
+            self.flush()
+
+    def flush(self) -> None:
+        """ Save all buffered rows. """
+        with self.connection:
+            self.connection.executemany(self.insert_sql, self.rows)
+        self.rows.clear()
+
+    def close(self) -> None:
+        """ Save any buffered rows, and close the database. """
+        self.flush()
+        self.connection.close()
+
+    def abort(self) -> None:
+        """ Save any buffered rows, and close the database.  Sessions are saved once, however often written. """
+        self.close()
+# End of class SqliteSink.
+
+
+def history_schema():
+    """ Function history_schema.
+
+    Parameters:
+    Returns: pyarrow.Schema of the Parquet history files, one column for each of HEADINGS.
+    """
+    return pa.schema([("Date", pa.date32()),
+                      ("Time", pa.string()),
+                      ("Min", pa.int32()),
+                      ("Hrs", pa.float64()),
+                      ("Entered", pa.date32()),
+                      ("Online", pa.bool_()),
+                      ("Student", pa.string()),
+                      ("Subject", pa.dictionary(pa.int32(), pa.string())),
+                      ("Rating", pa.int8()),
+                      ("Rate", pa.decimal128(9, 2)),
+                      ("Pay", pa.int8()),
+                      ("Earned", pa.decimal128(9, 2)),
+                      ("Miles", pa.decimal128(9, 2)),
+                      ("Payment", pa.date32()),
+                      ("Status", pa.dictionary(pa.int8(), pa.string()))])
+
+
+def typed_history_row(row: list) -> dict:
+    """ Function typed_history_row.
+
+    Parameters: A history row, from parse_history_row.
+    Returns: Typed column values, for history_schema.  Missing values are None.
+    """
+    values = dict(zip(HEADINGS, row))
+    for heading in ['Date', 'Entered', 'Payment']:
+        values[heading] = to_date(values[heading], DATE_FORMATS)
+    for heading in ['Min', 'Rating', 'Pay']:
+        values[heading] = to_int(values[heading])
+    for heading in ['Rate', 'Earned', 'Miles']:
+        values[heading] = to_decimal(values[heading])
+    values['Hrs'] = float(values['Hrs'])
+    values['Online'] = values['Online'].lower() == 'yes'
+    return values
+
+
+class ParquetHistorySink(ParquetSink):
+    """ Writes history rows, with typed columns, to a new Parquet file, one row group per history page. """
+
+    def __init__(self, directory: str):
+        """ Function __init__.
+
+        Parameters:
+            directory (str): directory of the Parquet files, one per run.
+        """
+        require_pyarrow()
+        self.path = os.path.join(directory, f"history_{datetime.now():%Y%m%d_%H%M%S}.parquet")
+        super().__init__(self.path, history_schema(), typed_history_row, int(PAGE_SIZE))
+
+    def write(self, row: list) -> None:
+        """ Print one row, and buffer it. """
+        print(row)
+        super().write(row)
+
+    def abort(self) -> None:
+        """ Close and delete the file of this run, so the next run exports its sessions again. """
+        self.writer.close()
+        os.remove(self.path)
+# End of class ParquetHistorySink.
+
+
+def read_checkpoint(path: str) -> str:
+    """ Function read_checkpoint.
+
+    Parameters: Path of the checkpoint file.
+    Returns: session_key of the newest session already exported, "" if none.
+    """
+    if not os.path.isfile(path):
+        return ""
+    with open(path, 'r') as file:
+        return file.read().strip()
+
+
+def write_checkpoint(path: str, checkpoint: str) -> None:
+    """ Function write_checkpoint.
+
+    Parameters:
+        path (str): path of the checkpoint file.
+        checkpoint (str): session_key of the newest session exported.
+    Returns:
+    """
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as file:
+        file.write(checkpoint + '\n')
+    os.replace(temp_path, path)
+
+
+def export_rows(rows, sink) -> tuple:
+    """ Write rows to a sink, and close it, or, if reading the rows fails, abort it.
+
+    Parameters:
+        rows: iterable of history rows, newest first.
+        sink: CsvSink, SqliteSink or ParquetHistorySink.
+    Returns:
+        (num_rows, newest) (tuple): number of rows written, and session_key of the first, "" if none.
+    """
+    num_rows = 0
+    newest = ""
+    try:
+        for row in rows:
+            if num_rows == 0:
+                newest = session_key(row)
+            sink.write(row)
+            num_rows += 1
+    except BaseException:
+        sink.abort()
+        raise
+    sink.close()
+    return num_rows, newest
+# End of function export_rows.
+
+
+def main():
+    """ Function main.  Export my tutoring history.
 
-    ## Compress the output file.
-    # with zipfile.ZipFile(FILE_NAME + '.zip', compression=zipfile.ZIP_DEFLATED, mode='w') as x:
-    #    x.write(FILE_NAME + extension, compresslevel=9)
+    Parameters:
+    Returns:
+    """
+    # Get output format.
+    delimiter = '\t'
+    while True:
+        fmt = input("Enter 'c' for csv output, 's' for SQLite output, 'p' for Parquet output, "
+                    "or 't' or press 'Enter' for tab-separated value output: ")
+        extension = fmt.lower()
+        if extension == 'c':
+            extension = CSV
+            delimiter = ','
+        elif extension in ['t', '']:
+            extension = TSV
+            delimiter = '\t'
+        elif extension == 's':
+            extension = SQLITE
+        elif extension == 'p':
+            extension = PARQUET
+
+        if extension in [CSV, TSV, SQLITE, PARQUET]:
+            print(f"You chose {extension} format.")
+            break
+        else:
+            print(f"'{fmt}' was not an option, doofus.")
 
-    # Delete csv file, not using file output currently.
-    os.remove(FILE_NAME + extension)
+    path = f"{FILE_NAME}.{extension}"
+    checkpoint_path = path + CHECKPOINT_EXTENSION
+    checkpoint = read_checkpoint(checkpoint_path)
+    if checkpoint:
+        print(f"Exporting sessions after {checkpoint}.")
+    else:
+        print("Exporting entire tutoring history.")
+
+    if extension == SQLITE:
+        sink = SqliteSink(path)
+    elif extension == PARQUET:
+        sink = ParquetHistorySink(path)
+    else:
+        sink = CsvSink(path, delimiter)
+
+    # Start a browser, logged into Wyzant.
+    driver = make_driver(block=BLOCK_PROFILE)
+    try:
+        num_rows, newest = export_rows(new_history_rows(history_pages(driver), checkpoint), sink)
+    finally:
+        quit_driver(driver)
+
+    # Only move the checkpoint once the rows are safely written.
+    if newest:
+        write_checkpoint(checkpoint_path, newest)
+    print(f"Exported {num_rows} new sessions to {path}.")
 # End of function main.
 
 
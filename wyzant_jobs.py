@@ -1,6 +1,11 @@
 """ wyzant_jobs.py
 
 SUMMARY: Use Selenium to watch for new online jobs on Wyzant.com.
+The alert for a new job lists the topics its topic, subject and description mention, by topic_tagger.py.
+New jobs are scored by job_scoring.py, and ranked by score.  Jobs scoring at least its alert_score beep and are
+printed at once, the rest are printed together, best first, every DIGEST_TIME seconds.
+Every job seen is saved in the job store of job_store.py, so a job is new if it is not in the store, even
+after a restart.
 
 REPOSITORY: https://github.com/DavidJLambert/Selenium
 
@@ -11,35 +16,38 @@ VERSION: 0.6.1
 DATE: Jun 13, 2024
 """
 # Web Browser independent Selenium imports.
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
 
-# Web Browser dependent Selenium code.
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-
-from wyzant_login import log_into_wyzant
+from wyzant_driver import make_driver, quit_driver, DriverPool
+from wyzant_common import element_text, make_http_session
+from topic_tagger import load_tagger
+from job_scoring import load_scorer
+from job_store import JobStore, open_store
 
 # Other packages.
+from lxml import html as lxml_html
+import requests
 from traceback import print_exception
 from sys import exc_info
-from copy import deepcopy
 from winsound import Beep
 from datetime import datetime, date
-from time import sleep
+from time import sleep, monotonic
 
 # CONSTANTS.
 
 TIMEOUT = 30  # Seconds.
+BLOCK_PROFILE = 'lean'  # What the browser does not download, one of wyzant_driver.BLOCK_PROFILES.
 SLEEP_TIME = 30  # Seconds.
+# Refreshes of the jobs page before its browser goes back to the pool, which replaces it if it has loaded
+# POOL_MAX_PAGES pages or its heap is too big, and another browser is leased.
+LEASE_REFRESHES = 60
 # MY_CLASS_NAME = "ui-page-link"
 # MY_CLASS_NAME = "job-details-link" # If there are no jobs listed, this class is missing.
 MY_CLASS_NAME = "jobs-tutor-header"
 
-# Keys for the jobs_curr and jobs_prev dictionaries.
+# Keys for the jobs_curr dictionary, and the params dict of each job.
 JOB_ID = "Job ID"
 APPLICATIONS = "Applications"
 JOB_AGE = "Age"
@@ -49,6 +57,118 @@ PAY_RATE = "Rate"
 JOB_DESCRIPTION = "Description"
 CARD_NUMBER = "Card #"
 
+# Topics of the keywords in job descriptions, from topic_tagger.TOPICS_PATH if it exists.
+TAGGER = load_tagger()
+# Scores new jobs, from job_scoring.SCORING_PATH if it exists.
+SCORER = load_scorer(tagger=TAGGER)
+
+MAX_JOB_AGE = 10  # Minutes.  Older new jobs are not alerted on.
+DIGEST_TIME = 600  # Seconds between printing the batch of new jobs not scoring enough to alert at once.
+
+# Scrape the job cards from one snapshot of the page (True), or with WebDriver calls per element (False).
+USE_SNAPSHOT_PARSER = True
+
+# Click every "Show Details" control, then return the outerHTML of every job card, in one WebDriver call.
+# Asynchronous, so that the page can render the job details before the cards are copied.
+CARD_SNAPSHOT_JS = """
+const done = arguments[arguments.length - 1];
+const cards = Array.from(document.getElementsByClassName('academy-card'));
+for (const card of cards) {
+    const details = document.evaluate('./div[4]/div/div/p', card, null,
+                                      XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    if (details.snapshotLength === 1) {
+        details.snapshotItem(0).click();
+    }
+}
+setTimeout(() => done(cards.map(card => card.outerHTML)), 0);
+"""
+
+# Watch the jobs page for new job cards (True), instead of only refreshing the page every 30 seconds (False).
+USE_JOB_WATCHER = False
+WATCH_POLL_TIME = 2  # Seconds between checks of the watcher's queue of new job cards.
+WATCH_FETCH_TIME = 15  # Seconds between in-page re-fetches of the job listings.
+WATCH_REFRESH_TIME = 600  # Seconds between full page refreshes, as a fallback.
+
+# Poll the jobs page over HTTP without a browser (True), instead of refreshing it in Selenium (False).
+# Selenium is only used to log in, and is relaunched when the HTTP session expires.
+# Job cards fetched over HTTP have no details, such as Subject and Student grade level, since nothing clicks
+# "Show Details", so job_scoring's grade level rule never counts, and topics are only tagged from the topic
+# and description.
+USE_HTTP_BACKEND = False
+HTTP_POLL_TIME = 30  # Seconds.
+
+# Inject a watcher into the jobs page.  A MutationObserver queues job cards added to the page, and the job
+# listings are re-fetched in the page every arguments[0] milliseconds, queueing job cards not seen before.
+JOB_WATCHER_JS = """
+const fetchInterval = arguments[0];
+if (window.wyzantJobWatcher) {
+    return;
+}
+const jobId = card => {
+    const link = card.querySelector('h3 > a');
+    return link ? link.getAttribute('href').split('/').pop().trim() : null;
+};
+const watcher = {seen: new Set(), queue: []};
+for (const card of document.getElementsByClassName('academy-card')) {
+    watcher.seen.add(jobId(card));
+}
+const enqueue = card => {
+    const id = jobId(card);
+    if (id !== null && !watcher.seen.has(id)) {
+        watcher.seen.add(id);
+        watcher.queue.push(card);
+    }
+};
+watcher.observer = new MutationObserver(mutations => {
+    for (const mutation of mutations) {
+        for (const node of mutation.addedNodes) {
+            if (node.nodeType !== Node.ELEMENT_NODE) {
+                continue;
+            }
+            if (node.classList.contains('academy-card')) {
+                enqueue(node);
+            }
+            for (const card of node.getElementsByClassName('academy-card')) {
+                enqueue(card);
+            }
+        }
+    }
+});
+watcher.observer.observe(document.body, {childList: true, subtree: true});
+watcher.timer = setInterval(() => {
+    fetch(window.location.href, {credentials: 'include', cache: 'no-cache'})
+        .then(response => response.text())
+        .then(text => {
+            const doc = new DOMParser().parseFromString(text, 'text/html');
+            for (const card of doc.getElementsByClassName('academy-card')) {
+                enqueue(card);
+            }
+        })
+        .catch(() => {});
+}, fetchInterval);
+window.wyzantJobWatcher = watcher;
+"""
+
+# Empty the watcher's queue, clicking "Show Details" in each queued job card, and return their outerHTML.
+# Returns null if the watcher is gone, for example after the page reloaded.
+WATCHER_DRAIN_JS = """
+const done = arguments[arguments.length - 1];
+const watcher = window.wyzantJobWatcher;
+if (!watcher) {
+    done(null);
+    return;
+}
+const cards = watcher.queue.splice(0);
+for (const card of cards) {
+    const details = document.evaluate('./div[4]/div/div/p', card, null,
+                                      XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    if (card.isConnected && details.snapshotLength === 1) {
+        details.snapshotItem(0).click();
+    }
+}
+setTimeout(() => done(cards.map(card => card.outerHTML)), 0);
+"""
+
 
 def age_to_minutes(arg: str) -> int:
     """ Convert job age to minutes.
@@ -81,6 +201,324 @@ def age_to_minutes(arg: str) -> int:
 # End of function age_to_minutes.
 
 
+def scrape_job_cards(driver) -> list:
+    """ Scrape the job cards on the jobs page, one WebDriver call per element.
+
+    Parameters:
+        driver: Selenium driver object, at the Wyzant job listings page.
+    Returns:
+        job_cards (list): a params dict for each job card.
+    """
+    job_cards = []
+
+    # Each instance of class "academy-card" contains 1 job, 10 cards per page.
+    academy_cards = driver.find_elements(By.CLASS_NAME, "academy-card")
+
+    for card_num, card_obj in enumerate(academy_cards):
+        # Get Job listing URL.
+        job_url = card_obj.find_element(By.XPATH, './h3/a').get_attribute('href')
+
+        # Save job properties.
+        params = dict()
+        params[JOB_ID] = int(job_url.split("/")[-1].strip())
+        params[CARD_NUMBER] = card_num
+        job_age_info = card_obj.find_element(By.XPATH, './div[1]/span[1]').text.strip()
+        if job_age_info == "No applications yet":
+            params[APPLICATIONS] = "N"
+            job_age_info = card_obj.find_element(By.XPATH, './div[1]/span[2]').text.strip()
+        else:
+            params[APPLICATIONS] = "Y"
+        params[JOB_AGE] = age_to_minutes(job_age_info)
+        params[STUDENT_NAME] = card_obj.find_element(By.XPATH, './p[1]').text.strip()
+        params[JOB_TOPIC] = card_obj.find_element(By.XPATH, './h3/a').text.strip()
+        pay_rate = card_obj.find_element(By.XPATH, './div[3]/span/div/div[1]/span').text.strip()
+        params[PAY_RATE] = pay_rate.replace("Recommended rate: ", "")
+        params[JOB_DESCRIPTION] = card_obj.find_element(By.XPATH, './p[2]').text.strip()
+
+        # Does "Show Details" control exist?
+        show_details = card_obj.find_elements(By.XPATH, './div[4]/div/div/p')
+        if len(show_details) == 1:
+            # If "Show Details" exists, click it.
+            show_details[0].click()
+
+            # Each instance of class "spc_zero" contains one job attribute.
+            spc_zeros = card_obj.find_elements(By.CLASS_NAME, "spc-zero")
+
+            # Iterate over all job attributes in class "spc_zero".
+            for spc_zero in spc_zeros:
+                # There are 1-2 children of class "spc_zero".
+                children = spc_zero.find_elements(By.XPATH, './child::*')
+                if len(children) == 2:
+                    # Job attribute in 2nd child of class "spc_zero".
+                    value = spc_zero.find_element(By.XPATH, './span[2]').text.strip()
+                else:
+                    # Sometimes the job availability attribute isn't the 2nd child of class "spc_zero".
+                    xpath = './../p[@class="text-semibold spc-tiny"]'
+                    items = spc_zero.find_elements(By.XPATH, xpath)
+                    value = "; ".join([item.text for item in items]).strip()
+
+                # Job attribute in 1st child of class "spc_zero".
+                my_key = spc_zero.find_element(By.XPATH, './span[1]').text
+                my_key = my_key.replace(":", "").strip()
+                params[my_key] = value
+            # Done iterating over all job attributes in class "spc_zero".
+
+        job_cards.append(params)
+    # Done iterating over academy_cards.
+
+    return job_cards
+# End of function scrape_job_cards.
+
+
+def parse_job_card(card_obj, card_num: int) -> dict:
+    """ Parse one job card, already parsed into an lxml element.  Same XPaths as scrape_job_cards.
+
+    Parameters:
+        card_obj: lxml element for an "academy-card".
+        card_num (int): position of card on the jobs page, starting at 0.
+    Returns:
+        params (dict): job properties.
+    """
+    # Get Job listing URL.
+    job_link = card_obj.xpath('./h3/a')[0]
+    job_url = job_link.get('href')
+
+    # Save job properties.
+    params = dict()
+    params[JOB_ID] = int(job_url.split("/")[-1].strip())
+    params[CARD_NUMBER] = card_num
+    job_age_info = element_text(card_obj.xpath('./div[1]/span[1]')[0])
+    if job_age_info == "No applications yet":
+        params[APPLICATIONS] = "N"
+        job_age_info = element_text(card_obj.xpath('./div[1]/span[2]')[0])
+    else:
+        params[APPLICATIONS] = "Y"
+    params[JOB_AGE] = age_to_minutes(job_age_info)
+    params[STUDENT_NAME] = element_text(card_obj.xpath('./p[1]')[0])
+    params[JOB_TOPIC] = element_text(job_link)
+    pay_rate = element_text(card_obj.xpath('./div[3]/span/div/div[1]/span')[0])
+    params[PAY_RATE] = pay_rate.replace("Recommended rate: ", "")
+    params[JOB_DESCRIPTION] = element_text(card_obj.xpath('./p[2]')[0])
+
+    # Job attributes only present if "Show Details" control exists.
+    if len(card_obj.xpath('./div[4]/div/div/p')) == 1:
+        # Each instance of class "spc_zero" contains one job attribute.
+        xpath = './/*[contains(concat(" ", normalize-space(@class), " "), " spc-zero ")]'
+        for spc_zero in card_obj.xpath(xpath):
+            # There are 1-2 children of class "spc_zero".
+            if len(spc_zero.xpath('./child::*')) == 2:
+                # Job attribute in 2nd child of class "spc_zero".
+                value = element_text(spc_zero.xpath('./span[2]')[0])
+            else:
+                # Sometimes the job availability attribute isn't the 2nd child of class "spc_zero".
+                items = spc_zero.xpath('./../p[@class="text-semibold spc-tiny"]')
+                value = "; ".join([element_text(item) for item in items]).strip()
+
+            # Job attribute in 1st child of class "spc_zero".
+            my_key = element_text(spc_zero.xpath('./span[1]')[0])
+            my_key = my_key.replace(":", "").strip()
+            params[my_key] = value
+        # Done iterating over all job attributes in class "spc_zero".
+
+    return params
+# End of function parse_job_card.
+
+
+def parse_job_cards(card_htmls: list) -> list:
+    """ Parse job cards from their outerHTML, as returned by CARD_SNAPSHOT_JS.
+
+    Parameters:
+        card_htmls (list): outerHTML (str) of each "academy-card".
+    Returns:
+        job_cards (list): a params dict for each job card.
+    """
+    return [parse_job_card(lxml_html.fragment_fromstring(card_html), card_num)
+            for card_num, card_html in enumerate(card_htmls)]
+# End of function parse_job_cards.
+
+
+def parse_jobs_page(page_source: str) -> list:
+    """ Parse all job cards from the HTML source of the jobs page.
+
+    Parameters:
+        page_source (str): HTML of the Wyzant job listings page.
+    Returns:
+        job_cards (list): a params dict for each job card.
+    """
+    tree = lxml_html.document_fromstring(page_source)
+    academy_cards = tree.xpath('//*[contains(concat(" ", normalize-space(@class), " "), " academy-card ")]')
+    return [parse_job_card(card_obj, card_num) for card_num, card_obj in enumerate(academy_cards)]
+# End of function parse_jobs_page.
+
+
+def fetch_job_cards(driver) -> list:
+    """ Scrape all job cards on the jobs page, either from one snapshot of the page or element by element.
+
+    Parameters:
+        driver: Selenium driver object, at the Wyzant job listings page.
+    Returns:
+        job_cards (list): a params dict for each job card.
+    """
+    if USE_SNAPSHOT_PARSER:
+        return parse_job_cards(driver.execute_async_script(CARD_SNAPSHOT_JS))
+    else:
+        return scrape_job_cards(driver)
+# End of function fetch_job_cards.
+
+
+def alert_new_job(params: dict, score: float, reasons: list) -> None:
+    """ Beep and print a summary of a new job.
+
+    Parameters:
+        params (dict): job properties.
+        score (float): score of the job, from SCORER.
+        reasons (list): reasons for the score, from SCORER.
+    Returns:
+    """
+    job_summary = f"New job at www.wyzant.com/tutor/jobs/{params[JOB_ID]}"
+    job_summary += f'\nSCORE: {score:g} ({", ".join(reasons)})'
+    for key in ['Rate', 'Topic', 'Subject', 'Student grade level', 'Description']:
+        if key in params:
+            job_summary += f'\n{key.upper()}: "{params[key]}"'
+    tags = TAGGER.tags(params.get(JOB_TOPIC), params.get('Subject'), params.get(JOB_DESCRIPTION))
+    if tags:
+        job_summary += f'\nTAGS: {", ".join(tags)}'
+
+    # Make audible tone.
+    Beep(6000, 1000)
+
+    # Print the job summary.
+    print(job_summary)
+# End of function alert_new_job.
+
+
+class JobAlerts:
+    """ Alerts on new jobs, best first: at once for jobs scoring enough, in a batch every DIGEST_TIME seconds for
+    the rest. """
+
+    def __init__(self, scorer=SCORER, digest_time: float = DIGEST_TIME):
+        """ Function __init__.
+
+        Parameters:
+            scorer (job_scoring.JobScorer): scores new jobs.
+            digest_time (float): seconds between printing the batch of jobs not scoring enough to alert at once.
+        """
+        self.scorer = scorer
+        self.digest_time = digest_time
+        self.batch = []  # [(score, params)], of jobs waiting to be printed.
+        self.batch_start = monotonic()
+
+    def add(self, new_jobs: list) -> None:
+        """ Function add.  Score and rank new jobs, alert on the best at once, and batch the rest.
+        Prints the batch if it is due.  Call after every poll, even if there are no new jobs.
+
+        Parameters:
+            new_jobs (list): params dict of each new job.
+        Returns:
+        """
+        scored = [(*self.scorer.score(params), params) for params in new_jobs if params[JOB_AGE] <= MAX_JOB_AGE]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        for score, reasons, params in scored:
+            if self.scorer.is_urgent(score):
+                alert_new_job(params, score, reasons)
+            else:
+                self.batch.append((score, params))
+        if monotonic() - self.batch_start >= self.digest_time:
+            self.flush()
+
+    def flush(self) -> None:
+        """ Function flush.  Print the batch of jobs not scoring enough to alert at once, best first.
+
+        Parameters:
+        Returns:
+        """
+        if self.batch:
+            self.batch.sort(key=lambda item: item[0], reverse=True)
+            print(f"{len(self.batch)} more new jobs:")
+            for score, params in self.batch:
+                print(f"{score:6g}  www.wyzant.com/tutor/jobs/{params[JOB_ID]}  {params.get(PAY_RATE, '')}  "
+                      f"{params.get(JOB_TOPIC, '')}")
+            self.batch.clear()
+        self.batch_start = monotonic()
+# End of class JobAlerts.
+
+
+def watch_jobs(driver, jobs_curr: dict, job_ids_curr: set, store: JobStore, alerts: JobAlerts) -> None:
+    """ Watch the jobs page for new jobs, without reloading it, for up to WATCH_REFRESH_TIME seconds.
+    New jobs are alerted on and added to jobs_curr and job_ids_curr.
+
+    Parameters:
+        driver: Selenium driver object, at the Wyzant job listings page.
+        jobs_curr (dict): job properties of the jobs on the page, by job ID.
+        job_ids_curr (set): job IDs of the jobs on the page.
+        store (JobStore): every job seen.
+        alerts (JobAlerts): alerts on new jobs.
+    Returns:
+    """
+    driver.execute_script(JOB_WATCHER_JS, 1000 * WATCH_FETCH_TIME)
+
+    start = monotonic()
+    while monotonic() - start < WATCH_REFRESH_TIME:
+        sleep(WATCH_POLL_TIME)
+
+        card_htmls = driver.execute_async_script(WATCHER_DRAIN_JS)
+        if card_htmls is None:
+            print("Job watcher gone, refreshing the page.")
+            return
+
+        new_jobs = []
+        for params in parse_job_cards(card_htmls):
+            job_id = params[JOB_ID]
+            if job_id in job_ids_curr:
+                continue
+            jobs_curr[job_id] = params
+            job_ids_curr.add(job_id)
+            new_jobs.append(params)
+
+            date_time = datetime.now().strftime("%Y/%m/%d %H:%M:%S")
+            print(f"{date_time}    Watcher found job {job_id}.")
+        alerts.add(store.record(new_jobs))
+    # Done watching, time for a full refresh.
+# End of function watch_jobs.
+
+
+class SessionExpiredError(Exception):
+    """ The Wyzant login of an HTTP session has expired. """
+
+
+def fetch_job_cards_http(session: requests.Session, jobs_url: str, validators: dict):
+    """ Fetch and parse the jobs page over HTTP.  Uses a conditional request, so an unchanged
+    jobs page costs a "304 Not Modified" response instead of the whole page.
+
+    Parameters:
+        session (requests.Session): HTTP session from make_http_session.
+        jobs_url (str): URL of the Wyzant job listings page.
+        validators (dict): ETag and Last-Modified from the last response, updated in place.
+    Returns:
+        job_cards (list): a params dict for each job card, or None if the jobs page is unchanged.
+    Raises:
+        SessionExpiredError: if Wyzant no longer accepts the session's login.
+    """
+    headers = dict()
+    if "ETag" in validators:
+        headers["If-None-Match"] = validators["ETag"]
+    if "Last-Modified" in validators:
+        headers["If-Modified-Since"] = validators["Last-Modified"]
+
+    response = session.get(jobs_url, headers=headers, timeout=TIMEOUT)
+    if response.status_code in (401, 403) or "/login" in response.url:
+        raise SessionExpiredError(f"Redirected to {response.url}, status {response.status_code}.")
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+
+    for key in ["ETag", "Last-Modified"]:
+        if key in response.headers:
+            validators[key] = response.headers[key]
+    return parse_jobs_page(response.text)
+# End of function fetch_job_cards_http.
+
+
 def main():
     """ Function main.  Watch for new online jobs on Wyzant.com.
 
@@ -88,33 +526,28 @@ def main():
     Returns:
     """
 
+    # Browsers logged into Wyzant: one watching the jobs page, one standing by in case it fails.
+    pool = None if USE_HTTP_BACKEND else DriverPool(size=2, block=BLOCK_PROFILE)
+    driver = None
+    alerts = JobAlerts()
+    # Every job seen, including before a restart.
+    store = JobStore(open_store())
+    print(f"{len(store)} jobs in the job store.")
+
     # On Exception, come back to here and re-initialize everything.
     while True:
         try:
-            # Job dicts, store info about job listings.
+            # Job dict, stores info about job listings.
             jobs_curr = dict()
-            jobs_prev = dict()
-            # Job_ids sets, store the job_ids for job dict.
+            # Job_ids set, stores the job_ids for job dict.
             job_ids_curr = set()
-            job_ids_prev = set()
-
-            # Selenium options.
-            print("Initializing Selenium.")
-            options = Options()
-            options.add_argument('--headless')
-            options.add_argument("--window-size=1920,2200")
-
-            # Connect to the Selenium web driver.
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=options)
 
-            # Maximize the browser window.
-            driver.maximize_window()
-
-            print("Done initializing Selenium.")
-
-            # Log into wyzant.
-            driver = log_into_wyzant(driver)
+            # Lease a browser logged into Wyzant.  Over HTTP, the browser is only needed to log in.
+            if USE_HTTP_BACKEND:
+                driver = make_driver(block=BLOCK_PROFILE)
+            else:
+                driver = pool.lease()
+            num_refreshes = 0
 
             print("Going to the Wyzant job listings page.")
 
@@ -130,151 +563,107 @@ def main():
 
             print("Fetched Wyzant jobs list.")
 
+            if USE_HTTP_BACKEND:
+                # Poll the jobs page over HTTP, with the browser's login, and close the browser.
+                jobs_url = driver.current_url
+                session = make_http_session(driver, headers={"Accept": "text/html,application/xhtml+xml"})
+                validators = dict()
+                quit_driver(driver)
+                driver = None
+                print("Polling Wyzant jobs list over HTTP.")
+
             # Loop forever.
             while True:
-                driver.refresh()
-                WebDriverWait(driver, TIMEOUT).until(ec.visibility_of_element_located((By.CLASS_NAME, MY_CLASS_NAME)))
+                if USE_HTTP_BACKEND:
+                    job_cards = fetch_job_cards_http(session, jobs_url, validators)
+                    if job_cards is None:
+                        # Jobs page not modified since the last poll, so the same jobs are still listed.
+                        store.record(list(jobs_curr.values()))
+                        # No new jobs, but the batch of jobs may be due.
+                        alerts.add([])
+                        sleep(HTTP_POLL_TIME)
+                        continue
+                else:
+                    if USE_JOB_WATCHER and len(jobs_curr) > 0:
+                        # Watch for new jobs in the page until the watcher stops, then fall back to a full refresh.
+                        watch_jobs(driver, jobs_curr, job_ids_curr, store, alerts)
+
+                    driver.refresh()
+                    num_refreshes += 1
+                    WebDriverWait(driver, TIMEOUT).until(
+                        ec.visibility_of_element_located((By.CLASS_NAME, MY_CLASS_NAME)))
+                    job_cards = fetch_job_cards(driver)
 
-                # Save jobs_curr and job_ids_curr into jobs_prev and job_ids_prev, respectively.
-                # Skip if jobs_curr empty due to faulty page load.
-                if len(jobs_curr) > 0:
-                    jobs_prev = deepcopy(jobs_curr)
-                    job_ids_prev = deepcopy(job_ids_curr)
-                    jobs_curr.clear()
-                    job_ids_curr.clear()
+                jobs_curr.clear()
+                job_ids_curr.clear()
 
                 # Print the current datetime.
                 date_time = datetime.now().strftime("%Y/%m/%d %H:%M:%S")
                 print(date_time + "    ", end="")
 
-                # Each instance of class "academy-card" contains 1 job, 10 cards per page.
-                academy_cards = driver.find_elements(By.CLASS_NAME, "academy-card")
-
-                for card_num, card_obj in enumerate(academy_cards):
-                    # Get Job listing URL.
-                    job_url = card_obj.find_element(By.XPATH, './h3/a').get_attribute('href')
-
-                    # Save job properties.
-                    params = dict()
-                    params[JOB_ID] = int(job_url.split("/")[-1].strip())
-                    params[CARD_NUMBER] = card_num
-                    job_age_info = card_obj.find_element(By.XPATH, './div[1]/span[1]').text.strip()
-                    if job_age_info == "No applications yet":
-                        params[APPLICATIONS] = "N"
-                        job_age_info = card_obj.find_element(By.XPATH, './div[1]/span[2]').text.strip()
-                    else:
-                        params[APPLICATIONS] = "Y"
-                    params[JOB_AGE] = age_to_minutes(job_age_info)
-                    params[STUDENT_NAME] = card_obj.find_element(By.XPATH, './p[1]').text.strip()
-                    params[JOB_TOPIC] = card_obj.find_element(By.XPATH, './h3/a').text.strip()
-                    pay_rate = card_obj.find_element(By.XPATH, './div[3]/span/div/div[1]/span').text.strip()
-                    params[PAY_RATE] = pay_rate.replace("Recommended rate: ", "")
-                    params[JOB_DESCRIPTION] = card_obj.find_element(By.XPATH, './p[2]').text.strip()
-
-                    # Does "Show Details" control exist?
-                    show_details = card_obj.find_elements(By.XPATH, './div[4]/div/div/p')
-                    if len(show_details) == 1:
-                        # If "Show Details" exists, click it.
-                        show_details[0].click()
-
-                        # Each instance of class "spc_zero" contains one job attribute.
-                        spc_zeros = card_obj.find_elements(By.CLASS_NAME, "spc-zero")
-
-                        # Iterate over all job attributes in class "spc_zero".
-                        for spc_zero in spc_zeros:
-                            # There are 1-2 children of class "spc_zero".
-                            children = spc_zero.find_elements(By.XPATH, './child::*')
-                            if len(children) == 2:
-                                # Job attribute in 2nd child of class "spc_zero".
-                                value = spc_zero.find_element(By.XPATH, './span[2]').text.strip()
-                            else:
-                                # Sometimes the job availability attribute isn't the 2nd child of class "spc_zero".
-                                xpath = './../p[@class="text-semibold spc-tiny"]'
-                                items = spc_zero.find_elements(By.XPATH, xpath)
-                                value = "; ".join([item.text for item in items]).strip()
-
-                            # Job attribute in 1st child of class "spc_zero".
-                            my_key = spc_zero.find_element(By.XPATH, './span[1]').text
-                            my_key = my_key.replace(":", "").strip()
-                            params[my_key] = value
-                        # Done iterating over all job attributes in class "spc_zero".
-
+                for params in job_cards:
                     # Save job properties in new entry in dict jobs_curr, and save job_id in set job_ids_curr.
-                    # for key, value in params.items():
-                    #     print("params", key, value)
-                    # Description?
-                    # Availability?
                     job_id = params[JOB_ID]
                     jobs_curr[job_id] = params
                     job_ids_curr.add(job_id)
 
                     # Print progress, on just one line.
+                    card_num = params[CARD_NUMBER]
                     if card_num == 0:
                         print(f"Done fetching job {card_num}", end="")
                     else:
                         print(f", {card_num}", end="")
-                # Done iterating over academy_cards.
+                # Done iterating over job_cards.
 
                 # After print, need to add newline.
                 print()
 
-                # Look for new jobs: the job IDs in job_ids and not in job_ids_prev.
+                # Look for new jobs: the jobs not in the job store, which saves this poll.
                 current_num = len(jobs_curr)
-                previous_num = len(jobs_prev)
-                # Skip if job_ids or job_ids_prev has too few entries (1st loop or faulty page load).
+                previous_num = len(store)
+                # Skip if no jobs (faulty page load), or the job store was empty (first run).
                 if current_num == 0:
                     print(f"Current  # Job IDs: {current_num}.")
+                    alerts.add([])
                 elif previous_num == 0:
+                    store.record(job_cards)
                     print(f"Previous # Job IDs: {previous_num}.")
+                    alerts.add([])
                 else:
-                    new_job_ids = job_ids_curr.difference(job_ids_prev)
-
-                    # Iterate over all new job listings.
-                    for job_id in new_job_ids:
-                        age = jobs_curr[job_id][JOB_AGE]
-                        if age <= 10:
-                            keys = jobs_curr[job_id].keys()
-
-                            job_summary = f"New job at www.wyzant.com/tutor/jobs/{job_id}"
-
-                            key = 'Rate'
-                            if key in keys:
-                                value = jobs_curr[job_id][key]
-                                job_summary += f'\n{key.upper()}: "{value}"'
-                            key = 'Topic'
-                            if key in keys:
-                                value = jobs_curr[job_id][key]
-                                job_summary += f'\n{key.upper()}: "{value}"'
-                            key = 'Subject'
-                            if key in keys:
-                                value = jobs_curr[job_id][key]
-                                job_summary += f'\n{key.upper()}: "{value}"'
-                            key = 'Student grade level'
-                            if key in keys:
-                                value = jobs_curr[job_id][key]
-                                job_summary += f'\n{key.upper()}: "{value}"'
-                            key = 'Description'
-                            if key in keys:
-                                value = jobs_curr[job_id][key]
-                                job_summary += f'\n{key.upper()}: "{value}"'
-
-                            # Make audible tone.
-                            Beep(6000, 1000)
-
-                            # Print the job summary.
-                            print(job_summary)
-                    # Done iterating over new_job_ids.
+                    # Alert on all new job listings, best first.
+                    alerts.add(store.record(job_cards))
 
                 # Wait some more, so that jobs page polled about every 30 seconds.
-                sleep(20)
+                if USE_HTTP_BACKEND:
+                    sleep(HTTP_POLL_TIME)
+                elif not USE_JOB_WATCHER:
+                    sleep(20)
+
+                # Give the browser back to the pool, counting the pages loaded before polling, and lease again.
+                if not USE_HTTP_BACKEND and num_refreshes >= LEASE_REFRESHES:
+                    pool.release(driver, pages=num_refreshes + 2)
+                    driver = None
+                    break
             # End of inner while loop.
+        except SessionExpiredError as error:
+            # Log in again with a new browser.
+            print(f"HTTP session expired: {error}")
+            # Start over.
         except Exception:
             # Print exception.
             print_exception(*exc_info(), limit=None)
             # Make audible tone.
             Beep(1000, 1000)
-            # Wait, in case of a web glitch.
-            sleep(SLEEP_TIME)
+            # Throw away the browser, and swap to a standby browser if one is ready.
+            if driver is not None:
+                if pool is None:
+                    quit_driver(driver)
+                else:
+                    pool.discard(driver)
+                driver = None
+            if pool is None or pool.standby() == 0:
+                # Wait, in case of a web glitch.
+                sleep(SLEEP_TIME)
             # Start over.
     # End of outer while loop.
 # End of function main.
@@ -1,32 +1,165 @@
 """ wyzant_login.py
 
 SUMMARY: Function log_into_wyzant handles logging into wyzant website.
+Function get_chromedriver_path finds chromedriver, without asking ChromeDriverManager every time.
+Function get_geckodriver_path does the same for geckodriver, for Firefox, with GeckoDriverManager.
+
+The cookies of a logged-in browser are saved in COOKIE_CACHE, and reused by the next login until they
+are SESSION_MAX_AGE seconds old, or Wyzant stops accepting them.  Only then is the login form filled in.
 
 REPOSITORY: https://github.com/DavidJLambert/Selenium
 
 AUTHOR: David J. Lambert
 
-VERSION: 0.6.0
+VERSION: 0.7.0
 
-DATE: Sep 02, 2023
+DATE: Oct 18, 2026
 """
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
+from selenium.common.exceptions import WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.firefox import GeckoDriverManager
+
+# Other packages.
+import json
+import os
+import requests
+import tempfile
+from time import time
 
 # Username and password.
 from login_tutor import USERNAME, PASSWORD
 
 TIMEOUT = 30  # Seconds.
 
+# Login session and chromedriver path caches.
+CACHE_DIR = './cache'
+COOKIE_CACHE = os.path.join(CACHE_DIR, 'wyzant_cookies.json')
+DRIVER_PATH_CACHE = os.path.join(CACHE_DIR, 'chromedriver_path.txt')
+GECKODRIVER_PATH_CACHE = os.path.join(CACHE_DIR, 'geckodriver_path.txt')
+SESSION_MAX_AGE = 12 * 60 * 60  # Seconds.
+DRIVER_PATH_MAX_AGE = 7 * 24 * 60 * 60  # Seconds.
+
+# A page that is only available when logged in.  Redirects to the login page otherwise.
+VALIDATE_URL = "https://www.wyzant.com/tutor/jobs"
+# Any cheap page on www.wyzant.com, so the browser accepts cookies for the domain.
+COOKIE_DOMAIN_URL = "https://www.wyzant.com/robots.txt"
+
+
+def cache_is_fresh(path: str, max_age: float) -> bool:
+    """ Function cache_is_fresh.
+
+    Parameters:
+        path (str): path of a cache file.
+        max_age (float): maximum age of the cache file, in seconds.
+    Returns: True if the cache file exists and is younger than max_age.
+    """
+    return os.path.isfile(path) and time() - os.path.getmtime(path) < max_age
+
+
+def get_driver_path(manager, cache_path: str) -> str:
+    """ Function get_driver_path.  Only calls manager().install() when the cached path is missing,
+    too old, or no longer exists.
+
+    Parameters:
+        manager: webdriver_manager class, such as ChromeDriverManager.
+        cache_path (str): path of the file caching the path of the driver executable.
+    Returns: Path of driver executable.
+    """
+    if cache_is_fresh(cache_path, DRIVER_PATH_MAX_AGE):
+        with open(cache_path, 'r') as file:
+            driver_path = file.read().strip()
+        if os.path.isfile(driver_path):
+            return driver_path
+
+    driver_path = manager().install()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(cache_path, 'w') as file:
+        file.write(driver_path)
+    return driver_path
+
+
+def get_chromedriver_path() -> str:
+    """ Function get_chromedriver_path.
+
+    Parameters:
+    Returns: Path of chromedriver executable.
+    """
+    return get_driver_path(ChromeDriverManager, DRIVER_PATH_CACHE)
 
-def log_into_wyzant(driver):
+
+def get_geckodriver_path() -> str:
+    """ Function get_geckodriver_path.
+
+    Parameters:
+    Returns: Path of geckodriver executable, for Firefox.
+    """
+    return get_driver_path(GeckoDriverManager, GECKODRIVER_PATH_CACHE)
+
+
+def save_session(driver) -> None:
+    """ Function save_session.  Save the cookies of a logged-in browser to COOKIE_CACHE.
+
+    Parameters: Selenium driver object, after logging into Wyzant.
+    Returns:
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Browsers of a DriverPool log in at once, so each writes its own temporary file, then replaces the cache.
+    with tempfile.NamedTemporaryFile('w', dir=CACHE_DIR, suffix='.tmp', delete=False) as file:
+        json.dump(driver.get_cookies(), file)
+    os.replace(file.name, COOKIE_CACHE)
+
+
+def load_session() -> list:
+    """ Function load_session.  Load cookies saved by save_session, if they are still valid.
+    Checks them with one request for VALIDATE_URL, without following redirects or reading the page.
+
+    Parameters:
+    Returns: List of cookie dicts, or None if no valid cookies are cached.
+    """
+    if not cache_is_fresh(COOKIE_CACHE, SESSION_MAX_AGE):
+        return None
+    try:
+        with open(COOKIE_CACHE, 'r') as file:
+            cookies = json.load(file)
+        jar = {cookie['name']: cookie['value'] for cookie in cookies}
+        with requests.get(VALIDATE_URL, cookies=jar, allow_redirects=False, stream=True,
+                          timeout=TIMEOUT) as response:
+            if response.status_code == 200:
+                return cookies
+    except (OSError, ValueError, KeyError, requests.RequestException):
+        pass
+    return None
+
+
+def log_into_wyzant(driver, cookies: list = None):
     """ Function log_into_wyzant.
 
-    Parameters: Selenium driver object, before logging into Wyzant.
+    Parameters:
+        driver: Selenium driver object, before logging into Wyzant.
+        cookies (list): cookie dicts already checked by load_session, or None to load them now.
     Returns: Selenium driver object, after logging into Wyzant.
+    Raises:
+        WebDriverException: if there are no valid cookies, and the driver cannot fill in the login form.
     """
+    if cookies is None:
+        cookies = load_session()
+    if cookies is not None:
+        print("Reusing Wyzant login.")
+        driver.get(COOKIE_DOMAIN_URL)
+        for cookie in cookies:
+            # The browser rejects the "sameSite" values some versions of chromedriver return.
+            cookie.pop('sameSite', None)
+            driver.add_cookie(cookie)
+        print("Done logging into Wyzant.")
+        return driver
+
+    if not getattr(driver, 'fills_forms', True):
+        raise WebDriverException(f"No valid Wyzant login cached in {COOKIE_CACHE}, and {type(driver).__name__} "
+                                 "cannot fill in the login form.")
 
     print("Logging into Wyzant.")
     driver.get("https://www.wyzant.com/login")
@@ -37,6 +170,8 @@ def log_into_wyzant(driver):
     driver.find_element(By.XPATH, '//form[@class="sso-login-form"]/button').click()
     WebDriverWait(driver, TIMEOUT).until(ec.title_is("My Profile | Wyzant Tutoring"))
 
+    save_session(driver)
+
     print("Done logging into Wyzant.")
 
     return driver
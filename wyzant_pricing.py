@@ -4,6 +4,16 @@ SUMMARY: Part 1 of a survey and analysis of tutors (the competition).
 Uses Selenium to find all the tutors, the topics they tutor in, and related info.
 Simply goes through tapics in a text file, searches for students who tutor in each topic,
 scrapes the search results page, and saves that information into a database.
+With --workers N, topics are shared out among N processes, each with its own browser.  Their results
+are written by the main process in topic order, so the database ends up the same as a sequential run.
+Tutors are written in batches, by pricing_db.PricingWriter.
+The time taken by each topic is saved in TOPIC_TIMES_PATH.
+Searching and scraping are done by wyzant_search.py, which fetches pages of search results directly, in
+parallel, instead of clicking "Show More Tutors" until it vanishes.  Waits for the search page are for
+conditions, by wyzant_waits.py, not fixed sleeps.  The time spent waiting in each step is saved in WAIT_TIMES_PATH.
+With --ranks, my rank for each topic is saved too, from the same searches, to RANKS_PATH and the rank
+history, as wyzant_search_topics.py does.
+With --parquet, the Tutors and Topics tables are also exported to Parquet files, by pricing_parquet.py.
 
 Part 1: wyzant_pricing.py.
 Part 2: wyzant_pricing_detail.py
@@ -17,53 +27,27 @@ VERSION: 0.6.0
 
 DATE: Sep 02, 2023
 """
-# Web Browser independent Selenium imports.
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as ec
-
-# Web Browser dependent Selenium code
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-
-from wyzant_login import log_into_wyzant
+from wyzant_search import search_results, feed_consumers, WORKERS
+from wyzant_driver import BROWSER, JS_BROWSERS
+from wyzant_search_topics import RankWriter, MY_TUTOR_ID
+from rank_history import RankHistory
+from wyzant_waits import WAIT_STATS
+from pricing_db import connect, PricingWriter
+from pricing_parquet import export_pricing
+from parquet_sink import require_pyarrow
 
 # Other packages.
+import argparse
+import csv
 import datetime
-import sqlite3
-from traceback import print_exception
-from sys import stdout, exc_info
-from time import sleep
-import gender_guesser.detector as gender_guesser
 
 # CONSTANTS.
 
 TIMEOUT = 30  # Seconds.
-FAILURE_WAIT = 10 # Seconds.
-BIG_WAIT = 2  # Seconds.
-SMALL_WAIT = 0.2  # Seconds.
 DB_PATH = r'C:\Users\david\Desktop\Wyzant\Pricing\Pricing.sqlite3'
-MAX_TRIES = 6
-
-# Instantiate gender guesser
-""" Output:
-unknown (name not found), saved as Unk
-andy (androgynous), saved as And
-male, saved as M
-female, saved as F
-mostly_male, saved as M?
-mostly_female, saved as F?
-"""
-guess = gender_guesser.Detector()
-guess_dict = {'unknown': 'Unk',
-              'andy': 'And',
-              'male': 'M',
-              'female': 'F',
-              'mostly_male': 'M?',
-              'mostly_female': 'F?'}
+TOPIC_TIMES_PATH = './output/pricing_topic_times.csv'
+WAIT_TIMES_PATH = './output/pricing_wait_times.csv'
+RANKS_PATH = './output/search_topics.csv'
 
 
 def get_date_time() -> str:
@@ -75,273 +59,87 @@ def get_date_time() -> str:
     return str(datetime.datetime.now())[:19]
 
 
-def main():
-    """ Function main.
+def read_topics() -> list:
+    """ Function read_topics.
 
     Parameters:
-    Returns:
+    Returns: List of topics in tutor_topics.txt.
     """
-    # Read list of topics.
     topics = []
     with open('tutor_topics.txt', 'r') as file:
         for topic in file:
             topics.append(topic.strip())
+    return topics
 
-    # Selenium options.
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument("--window-size=1920,2200")
-
-    # Connect to the Selenium web driver.
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-
-    # Maximize the browser window.
-    driver.maximize_window()
-
-    # Log into Wyzant website.
-    print("Done initializing Selenium")
-
-    # Log into wyzant.
-    driver = log_into_wyzant(driver)
-
-    # Connect to database.
-    connection = sqlite3.connect(database=DB_PATH, timeout=TIMEOUT)
-    cursor = connection.cursor()
-    print("Connected to SQLite.")
-
-    for topic_orig in topics:
-        # Get next topic.
-        subject = 0
-        if " # subject" in topic_orig:
-            topic, subject = topic_orig.split(" # ")
-            if subject == "subject":
-                subject = 1
-        else:
-            topic = topic_orig
-        print(f"{topic} STARTED.")
-
-        for num_tries in range(1, MAX_TRIES):
-            try:
-                # Start search.
-                driver.get("https://www.wyzant.com/match/search")
-                sleep(BIG_WAIT)
-
-                # Make sure that the background check checkbox is unchecked.
-                background_check = driver.find_element(By.XPATH,
-                                                       '/html/body/div[2]/section/main/aside[1]/form/input[6]')
-                if background_check.is_selected():
-                    background_check.click()
-                    sleep(BIG_WAIT)
-
-                # Enter topic into subject input control.
-                search_term = driver.find_element(By.XPATH,
-                                                  '/html/body/div[2]/section/main/aside[2]/form/div[1]/input')
-                # First, select all text in input...
-                search_term.send_keys(Keys.CONTROL, 'a')
-                sleep(SMALL_WAIT)
-                # ...backspace to delete text in input...
-                search_term.send_keys(Keys.BACKSPACE)
-                sleep(SMALL_WAIT)
-                # ...paste topic into subject input control...
-                search_term.send_keys(topic)
-                sleep(SMALL_WAIT)
-                # ...click Search "button" (an anchor).
-                submit = driver.find_element(By.XPATH,
-                                             '/html/body/div[2]/section/main/aside[2]/form/div[3]/button')
-                submit.click()
-                sleep(BIG_WAIT)
-
-                # Get number of tutors.
-                num_tutors = driver.find_elements(By.XPATH,
-                                                  '/html/body/div[2]/div[2]/div[1]/section/div[1]/div/h3/strong')
-                num_tutors = num_tutors[0].text.split()[0].replace(",", "")
-                num_tutors = int(num_tutors)
-                print(f"{topic} HAS {num_tutors} TUTORS.")
-
-                # Successful topic search, exit for loop
-                break
-            except Exception:
-                print(f"{topic} TOPIC SEARCH RAISED THIS EXCEPTION, TRY #{num_tries}:")
-                print_exception(*exc_info(), limit=None)
-                sleep(FAILURE_WAIT)
-
-        else:  # for num_tries in range(1, MAX_TRIES):
-            print(f"{topic} TOPIC SEARCH FAILED {MAX_TRIES} TIMES, SKIPPING TO NEXT TOPIC.")
-            continue
-
-        # Scrape tutors only if there are tutors.
-        if num_tutors == 0:
-            print(f"{topic} TOPIC SEARCH FOUND ZERO TUTORS.")
-            continue
 
-        # Keep clicking "Show More Tutors" link until it disappears.
-        print(f"{topic} CLICKING 'Show More Tutors'")
-        while True:
-            try:
-                sleep(0.35)
-                show_more = driver.find_elements(By.XPATH,
-                                                 '//div[@class="load-more"]/a[contains(@class, "load-more-btn")]')
-                if len(show_more) == 0:
-                    break
-                else:
-                    show_more[0].click()
-            except Exception:
-                pass
+def save_topic_times(topic_times: list) -> None:
+    """ Function save_topic_times.  Save and print the time taken by each topic, slowest first.
 
-        print(f"{topic} FINISHED CLICKING 'Show More Tutors'")
-
-        for num_tries in range(1, MAX_TRIES):
-            try:
-                # Get list of tutor-card anchors (each contains 1 tutor).  They fall under 2 different xpaths.
-                xpath1 = '/html/body/div[2]/div[2]/div[1]/section/a[contains(@class, "tutor-card")]'
-                xpath2 = '/html/body/div[2]/div[2]/div[1]/a[contains(@class, "tutor-card")]'
-                tutor_cards = (driver.find_elements(By.XPATH, xpath1) +
-                               driver.find_elements(By.XPATH, xpath2))
-                # Number of tutor-cards should match num_tutors.  Not checking.
-                num_tutor_cards = len(tutor_cards)
-
-                # Successful tutor-card search, exit for loop
-                break
-            except Exception:
-                print(f"{topic} TUTOR-CARD SEARCH RAISED THIS EXCEPTION, TRY #{num_tries}:")
-                print_exception(*exc_info(), limit=None)
-                sleep(FAILURE_WAIT)
-        else:  # for num_tries in range(1, MAX_TRIES):
-            print(f"{topic} GETTING LIST OF TUTOR-CARDS FAILED {MAX_TRIES} TIMES, SKIPPING TO NEXT TOPIC.")
-            continue
-
-        print(f"{topic} STARTED SCRAPING TUTOR CARDS")
-        for tutor in tutor_cards:
-            # Get tutor profile URL
-            tutor_url = tutor.get_attribute('href').split('?')[0]
-
-            # Get tutor ID number
-            id_number = tutor_url.split("?")[0].split("/")[-1]
-            id_number = int(id_number)
-
-            for num_tries in range(1, MAX_TRIES):
-                try:
-                    # Get Tutor Name and Gender
-                    tutor_name = tutor.find_elements(By.XPATH, './div/section[2]/div/h5')
-                    if tutor_name:
-                        tutor_name = tutor_name[0].text.strip()
-                        gender = tutor_name.split()[:-1]
-                        gender = " ".join(gender)
-                        gender = guess_dict[guess.get_gender(gender)]
-                    else:
-                        tutor_name = None
-                        gender = "Unk"
-
-                    # Billing rate, $ per hour.
-                    bill_rate = tutor.find_elements(By.XPATH, './div/section[3]/section/h5/div')
-                    if bill_rate:
-                        bill_rate = int(bill_rate[0].text.strip()[1:-5].replace(",", ""))
-                    else:
-                        bill_rate = None
-
-                    # Average Rating, 0-5.
-                    avg_rating = tutor.find_elements(By.XPATH, './div/section[3]/div[1]/strong')
-                    if avg_rating:
-                        avg_rating = float(avg_rating[0].text.strip())
-                    else:
-                        avg_rating = None
-
-                    # Number of Ratings.
-                    num_ratings = tutor.find_elements(By.XPATH, './div/section[3]/div[1]/span[2]')
-                    if num_ratings:
-                        num_ratings = int(num_ratings[0].text.strip().replace(",", "")[1:-1])
-                    else:
-                        num_ratings = 0
-
-                    # Topic hours and Total hours
-                    '''
-                    FORMAT 1:
-                    TOPIC HOURS: "40 hours tutoring Fortran" at
-                        /html/body/div[2]/div[2]/div[1]/section/a[3]/div/section[3]/div[2]/div/p/span[1]
-                    TOTAL HOURS: "out of 1,369 hours" at
-                        /html/body/div[2]/div[2]/div[1]/section/a[3]/div/section[3]/div[2]/div/p/span[2]
-
-                    FORMAT 2:
-                    TOPIC HOURS: 'None'
-                    TOTAL HOURS: "78 hours tutoring" at
-                        /html/body/div[2]/div[2]/div[1]/section/a[2]/div/section[3]/div[2]/h3
-                    '''
-                    topic_hours = tutor.find_elements(By.XPATH, './div/section[3]/div[2]/div/p/span[1]')
-                    if topic_hours:
-                        # FORMAT 1
-                        topic_hours = int(topic_hours[0].text.split()[0].replace(",", ""))
-
-                        total_hours = tutor.find_element(By.XPATH, './div/section[3]/div[2]/div/p/span[2]')
-                        total_hours = int(total_hours.text.split()[2].replace(",", ""))
-                    else:
-                        # FORMAT 2
-                        # No topic hours reported, so don't record topic hours.  Do get total hours.
-                        topic_hours = 0
-                        total_hours = tutor.find_elements(By.XPATH, './div/section[3]/div[2]/h3')
-                        if total_hours:
-                            total_hours = int(total_hours[0].text.split()[0].replace(",", ""))
-                        else:
-                            total_hours = 0
-
-                    photo = tutor.find_elements(By.XPATH, './div/section[1]/div/img')
-                    if photo:
-                        photo = photo[0].get_attribute('src')
-                        has_photo = int(photo != 'https://www.wyzant.com/images/tutor/silhouette.png')
-                    else:
-                        has_photo = int(False)
+    Parameters:
+        topic_times (list): (topic, number of tutors, seconds) for each topic.
+    Returns:
+    """
+    topic_times = sorted(topic_times, key=lambda item: item[2], reverse=True)
+    with open(TOPIC_TIMES_PATH, 'w', newline='') as output:
+        csvwriter = csv.writer(output)
+        csvwriter.writerow(['Topic', 'Num_Tutors', 'Seconds'])
+        for topic, num_tutors, seconds in topic_times:
+            csvwriter.writerow([topic, num_tutors, f"{seconds:.1f}"])
 
-                    # Successful scrape of tutor, exit for loop
-                    break
-                except Exception:
-                    print(f"{topic} GET INTO FOR TUTOR {id_number} RAISED THIS EXCEPTION, TRY #{num_tries}:")
-                    print_exception(*exc_info(), limit=None)
-                    sleep(FAILURE_WAIT)
+    print("SLOWEST TOPICS:")
+    for topic, num_tutors, seconds in topic_times[:10]:
+        print(f"{topic}: {seconds:.1f} SECONDS, {num_tutors} TUTORS.")
 
-            else:  # for num_tries in range(1, MAX_TRIES):
-                print(f"{topic} GET INTO FOR TUTOR {id_number} FAILED #{num_tries} TIMES, SKIPPING.")
-                continue
 
-            # Insert into or update Tutors table.
-            sql = "SELECT COUNT(*) FROM Tutors WHERE ID = ?"
-            cursor.execute(sql, [id_number])
-            count = cursor.fetchone()[0]
+def main():
+    """ Function main.
 
-            if count == 0:
-                sql = ("INSERT INTO Tutors (URL, Name, Bill_Rate, Avg_Rating, Number_Ratings, Total_Hours, "
-                       "Has_Photo, Gender, Last_Update, ID) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
-            else:
-                sql = ("UPDATE Tutors SET URL = ?, Name = ?, Bill_Rate = ?, Avg_Rating = ?,"
-                       "Number_Ratings = ?, Total_Hours = ?, Has_Photo = ?, Gender = ?, Last_Update = ? "
-                       "WHERE ID = ?")
-            cursor.execute(sql, [tutor_url, tutor_name, bill_rate, avg_rating, num_ratings, total_hours,
-                                 has_photo, gender, get_date_time(), id_number])
+    Parameters:
+    Returns:
+    """
+    parser = argparse.ArgumentParser(description="Survey tutors for each topic in tutor_topics.txt.")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help="processes, each with a browser, scraping topics at once")
+    parser.add_argument("--parquet", action="store_true",
+                        help="also export the Tutors and Topics tables to Parquet files when done (needs pyarrow)")
+    parser.add_argument("--ranks", action="store_true",
+                        help=f"also save my rank for each topic to {RANKS_PATH}, as wyzant_search_topics.py does")
+    parser.add_argument("--browser", choices=JS_BROWSERS, default=BROWSER, help="browser to search with")
+    args = parser.parse_args()
+    if args.parquet:
+        # Fail now, rather than after scraping.
+        require_pyarrow()
 
-            # Insert into or update Topics table.
-            sql = "SELECT COUNT(*) FROM Topics WHERE ID = ? AND Topic = ?"
-            cursor.execute(sql, [id_number, topic])
-            count = cursor.fetchone()[0]
+    # Read list of topics.
+    topics = read_topics()
 
-            if count == 0:
-                sql = "INSERT INTO Topics (Subject, Topic_Hours, Last_Update, ID, Topic) VALUES (?, ?, ?, ?, ?)"
-            else:
-                sql = ("UPDATE Topics SET Subject = ?, Topic_Hours = ?, Last_Update = ? WHERE ID = ? AND "
-                       "Topic = ?")
-            cursor.execute(sql, [subject, topic_hours, get_date_time(), id_number, topic])
-            connection.commit()
+    # Connect to database.  Tutors are written in batches.
+    connection = connect(DB_PATH, timeout=TIMEOUT)
+    writer = PricingWriter(connection)
+    print("Connected to SQLite.")
 
-        else:  # for tutor in tutor_cards:
-            pass
+    # Every consumer gets the search hits of each topic, so topics are only searched once.
+    consumers = [writer]
+    if args.ranks:
+        consumers.append(RankWriter(RANKS_PATH, [MY_TUTOR_ID], RankHistory(connection, [MY_TUTOR_ID])))
 
-        print(f"{topic} FINISHED SCRAPING TUTOR CARDS")
+    topic_times = []
+    results = search_results(topics, args.workers, browser=args.browser)
+    for topic, subject, num_tutors, tutors, seconds in feed_consumers(results, consumers):
+        topic_times.append((topic, sum(tutor is not None for tutor in tutors), seconds))
         print(f"{topic} TOPIC FINISHED")
 
-    else:  # for topic_orig in topics:
-        pass
+    save_topic_times(topic_times)
+    if args.workers <= 1:
+        # Worker processes report their own waits when they exit.
+        WAIT_STATS.save(WAIT_TIMES_PATH)
+        WAIT_STATS.report()
 
     # Final commit, disconnect from database.
-    connection.commit()
-    cursor.close()
+    for consumer in consumers:
+        consumer.close()
+    if args.parquet:
+        export_pricing(connection)
     connection.close()
     print("ALL DONE.")
 # End of function main.
@@ -3,6 +3,12 @@
 SUMMARY: Part 2 of a survey and analysis of tutors (the competition).
 Fetches information about each tutor, goes to the tutor's profile page on wyzant.com,
 scrapes the information in that page, and saves that information into a database.
+Profiles are scraped by --workers browsers at once, each taking tutors from a shared queue, with all
+database updates written in batches by a single writer thread.  Interrupted runs resume where they
+stopped, since tutors not yet updated are still found by the query for tutors needing details.
+Profiles are scraped with Chrome by default.  Profile pages are rendered by the server, so --browser http
+fetches them with wyzant_driver.HttpDriver instead, without a browser, but scrape_profile was written for the
+page as Chrome lays it out, and has not been checked against a saved profile page on both.
 
 Part 1: wyzant_pricing.py.
 Part 2: wyzant_pricing_detail.py
@@ -17,32 +23,50 @@ VERSION: 0.6.0
 DATE: Sep 02, 2023
 """
 # Web Browser independent Selenium imports.
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
 
-# Web Browser dependent Selenium code
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-
-from wyzant_login import log_into_wyzant
+from wyzant_driver import DriverPool, is_healthy, BROWSERS
+from pricing_db import connect
 
 # Other packages.
+import argparse
 import datetime
-import sqlite3
+from queue import Queue, Empty
+from threading import Event, Lock, Thread
+from time import monotonic, sleep
 from traceback import print_exception
 from sys import exc_info
 
 # CONSTANTS.
 
 TIMEOUT = 30  # Seconds.
+BLOCK_PROFILE = 'lean'  # What the browser does not download, one of wyzant_driver.BLOCK_PROFILES.
 FAILURE_WAIT = 10 # Seconds.
 BIG_WAIT = 2  # Seconds.
 SMALL_WAIT = 0.2  # Seconds.
 DB_PATH = r'C:\Users\david\Desktop\Wyzant\Pricing\Pricing.sqlite3'
 MAX_TRIES = 6
+LEASE_TIMEOUT = 60  # Seconds a worker waits for a browser from the pool.
+WORKER_WAIT = 300  # Seconds to wait for busy workers, once no tutors are left to scrape.
+WORKERS = 1  # Browsers scraping profiles at once.
+PROFILE_BROWSER = 'chrome'  # 'http' is cheaper, but unchecked against Chrome for scrape_profile.
+MAX_RATE = 2.0  # Profile page loads per second, across all workers.
+WRITE_BATCH = 10  # Rows per database commit.
+PROGRESS_EVERY = 50  # Rows.
+
+# Find tutors who need details from their profile added.
+NEEDS_DETAIL_SQL = ("SELECT ID, URL "
+                    "FROM Tutors "
+                    "WHERE City IS NULL "
+                    "OR State IS NULL "
+                    "OR Response_Time_Min IS NULL "
+                    "OR Highest_Degree IS NULL "
+                    "OR Background_Check IS NULL")
+
+UPDATE_SQL = ("UPDATE Tutors SET City = ?, State = ?, Response_Time_Min = ?, Highest_Degree = ?, "
+              "Background_Check = ?, Last_Update = ? WHERE ID = ?")
 
 
 def get_date_time() -> str:
@@ -54,140 +78,257 @@ def get_date_time() -> str:
     return str(datetime.datetime.now())[:19]
 
 
-def main():
-    """ Function main.
+def scrape_profile(driver, tutor_url: str) -> list:
+    """ Function scrape_profile.
 
     Parameters:
-    Returns:
+        driver: Selenium driver object, logged into Wyzant.
+        tutor_url (str): URL of the tutor's profile page.
+    Returns: [city, state, response time in minutes, highest degree, background check date].
     """
-    # Selenium options.
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument("--window-size=1920,2200")
-
-    # Connect to the Selenium web driver.
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    # Go to URL.
+    driver.get(tutor_url)
+    xpath = '/html/body/footer/div[1]/div[2]/div/div[1]/ul/li[1]/a'
+    WebDriverWait(driver, TIMEOUT, poll_frequency=0.2).until(ec.element_to_be_clickable((By.XPATH, xpath)))
+
+    # City and state.  Format: "Other Palm Beach Gardens, FL Tutors"
+    location = driver.find_elements(By.XPATH, '/html/body/div[2]/section/div[1]/div[3]/aside/h2')
+    if location:
+        location = location[0].text[6:-7]
+        city, state = location.split(", ")
+    else:
+        city, state = None, None
+
+    # Response time.  Format: "Response time: 2 hours"
+    xpath = '/html/body/div[2]/section/div[1]/div[1]/section/div[6]/div'
+    response_time = driver.find_elements(By.XPATH, xpath)
+    if response_time:
+        response_time = response_time[0].text.strip().split()
+        if len(response_time) > 2:
+            response_time, units = response_time[2:]
+            response_time = int(response_time)
+            if units[:4] == "hour":
+                response_time *= 60
+            elif units[:6] == "minute":
+                pass
+            else:
+                response_time = None
+        else:
+            response_time = None
+    else:
+        response_time = None
+
+    # Highest degree.  Format: "University of Rochester\nMathematics\n\nUniversity of Rochester\nMasters".
+    highest_degree = 'None'
+    xpath = '/html/body/div/section/div/div/div/h3[contains(text(), "Education")]/../div/section'
+    degrees = driver.find_elements(By.XPATH, xpath)
+    if len(degrees) > 0:
+        for degree in degrees:
+            degree = degree.text.split("\n")
+            if len(degree) >= 2:
+                degree = degree[1]
+                if highest_degree in ['MS', 'BS', 'None'] and degree == 'PhD':
+                    highest_degree = 'PhD'
+                elif highest_degree in ['BS', 'None'] and degree in ['Masters', 'MBA']:
+                    highest_degree = 'MS'
+                elif highest_degree == 'None':
+                    highest_degree = 'BS'
+
+    # Background check date.  Format: "Background check passed on 1/26/2016"
+    xpath = '/html/body/div/section/div/div/div/div/ul/li/p/a[contains(text(), "Background check passed")]/..'
+    check_date = driver.find_elements(By.XPATH, xpath)
+    if check_date:
+        check_date = check_date[0].text.strip().split()[-1]
+        month, day, year = check_date.split('/')
+        check_date = datetime.date(int(year), int(month), int(day))
+    else:
+        check_date = None
 
-    # Maximize the browser window.
-    driver.maximize_window()
+    return [city, state, response_time, highest_degree, check_date]
+# End of function scrape_profile.
 
-    # Log into Wyzant website.
-    print("Done initializing Selenium")
 
-    # Log into wyzant.
-    driver = log_into_wyzant(driver)
+class RateLimiter:
+    """ Spaces out page loads to wyzant.com, so that all workers together load at most rate pages per second. """
 
-    # Connect to database.
-    connection = sqlite3.connect(database=DB_PATH, timeout=10)
-    cursor = connection.cursor()
-    print("Connected to SQLite.")
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next = monotonic()
+        self._lock = Lock()
 
-    # Find tutors who need details from their profile added.
-    sql = ("SELECT ID, URL "
-           "FROM Tutors "
-           "WHERE City IS NULL "
-           "OR State IS NULL "
-           "OR Response_Time_Min IS NULL "
-           "OR Highest_Degree IS NULL "
-           "OR Background_Check IS NULL")
-    cursor.execute(sql)
-    rows = cursor.fetchall()
+    def wait(self) -> None:
+        """ Wait until the next page load is allowed. """
+        with self._lock:
+            now = monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            sleep(delay)
+# End of class RateLimiter.
 
-    print(f"Found {len(rows)} records to update.")
 
-    for row_number, row in enumerate(rows):
-        if row_number % 50 == 0:
-            print(f"Updated {row_number} records.")
+def scrape_worker(pool: DriverPool, tutors: Queue, results: Queue, limiter: RateLimiter, stop: Event) -> None:
+    """ Function scrape_worker.  Scrape profiles of tutors taken from a queue, until the queue is empty.
+    If no browser can be leased, the tutor goes back in the queue, and the worker tries again, up to MAX_TRIES
+    times in a row, then stops, leaving the tutor for another worker or the next run.
 
+    Parameters:
+        pool (DriverPool): browsers logged into Wyzant.
+        tutors (Queue): (ID, URL) of tutors needing details.
+        results (Queue): UPDATE_SQL parameters for each scraped tutor.
+        limiter (RateLimiter): shared limit on page loads.
+        stop (Event): set to stop early.
+    Returns:
+    """
+    lease_failures = 0  # In a row.
+    while not stop.is_set():
         try:
-            id_number, tutor_url = row
-
-            # Go to URL.
-            driver.get(tutor_url)
-            xpath = '/html/body/footer/div[1]/div[2]/div/div[1]/ul/li[1]/a'
-            WebDriverWait(driver, TIMEOUT, poll_frequency=0.2).until(ec.element_to_be_clickable((By.XPATH, xpath)))
-
-            # City and state.  Format: "Other Palm Beach Gardens, FL Tutors"
-            location = driver.find_elements(By.XPATH, '/html/body/div[2]/section/div[1]/div[3]/aside/h2')
-            if location:
-                location = location[0].text[6:-7]
-                city, state = location.split(", ")
-            else:
-                city, state = None, None
-
-            # Response time.  Format: "Response time: 2 hours"
-            xpath = '/html/body/div[2]/section/div[1]/div[1]/section/div[6]/div'
-            response_time = driver.find_elements(By.XPATH, xpath)
-            if response_time:
-                response_time = response_time[0].text.strip().split()
-                if len(response_time) > 2:
-                    response_time, units = response_time[2:]
-                    response_time = int(response_time)
-                    if units[:4] == "hour":
-                        response_time *= 60
-                    elif units[:6] == "minute":
-                        pass
-                    else:
-                        response_time = None
-                else:
-                    response_time = None
-            else:
-                response_time = None
+            id_number, tutor_url = tutors.get_nowait()
+        except Empty:
+            break
 
-            # Highest degree.  Format: "University of Rochester\nMathematics\n\nUniversity of Rochester\nMasters".
-            highest_degree = 'None'
-            xpath = '/html/body/div/section/div/div/div/h3[contains(text(), "Education")]/../div/section'
-            degrees = driver.find_elements(By.XPATH, xpath)
-            if len(degrees) > 0:
-                for degree in degrees:
-                    degree = degree.text.split("\n")
-                    if len(degree) >= 2:
-                        degree = degree[1]
-                        if highest_degree in ['MS', 'BS', 'None'] and degree == 'PhD':
-                            highest_degree = 'PhD'
-                        elif highest_degree in ['BS', 'None'] and degree in ['Masters', 'MBA']:
-                            highest_degree = 'MS'
-                        elif highest_degree == 'None':
-                            highest_degree = 'BS'
-
-            # Background check date.  Format: "Background check passed on 1/26/2016"
-            xpath = '/html/body/div/section/div/div/div/div/ul/li/p/a[contains(text(), "Background check passed")]/..'
-            check_date = driver.find_elements(By.XPATH, xpath)
-            if check_date:
-                check_date = check_date[0].text.strip().split()[-1]
-                month, day, year = check_date.split('/')
-                check_date = datetime.date(int(year), int(month), int(day))
+        limiter.wait()
+        try:
+            driver = pool.lease(timeout=LEASE_TIMEOUT)
+        except Exception:
+            print(f"Exception caught leasing a browser for {tutor_url}:")
+            print_exception(*exc_info(), limit=None)
+            tutors.put((id_number, tutor_url))
+            lease_failures += 1
+            if lease_failures >= MAX_TRIES:
+                print(f"Leasing a browser failed {MAX_TRIES} times in a row, worker stopping.")
+                break
+            sleep(FAILURE_WAIT)
+            continue
+        lease_failures = 0
+        try:
+            details = scrape_profile(driver, tutor_url)
+        except Exception:
+            # print stack trace, but continue on to next record.
+            print(f"Exception caught scraping {tutor_url}:")
+            print_exception(*exc_info(), limit=None)
+            if is_healthy(driver):
+                pool.release(driver)
             else:
-                check_date = None
+                pool.discard(driver)
+            continue
+        pool.release(driver)
 
-            # Update the Tutors table.
-            sql = ("UPDATE Tutors SET City = ?, State = ?, Response_Time_Min = ?, Highest_Degree = ?, "
-                   "Background_Check = ?, Last_Update = ? WHERE ID = ?")
-            cursor.execute(sql, [city, state, response_time, highest_degree, check_date, get_date_time(), id_number])
+        results.put(details + [get_date_time(), id_number])
+# End of function scrape_worker.
 
-            if row_number % 10 == 0:
-                connection.commit()
 
-        except KeyboardInterrupt:
-            connection.commit()
-            cursor.close()
-            connection.close()
-            print("Execution halted.")
-            exit(0)
+def write_updates(results: Queue, num_rows: int) -> None:
+    """ Function write_updates.  Write scraped details to the Tutors table, WRITE_BATCH rows per commit,
+    and report progress.  Stops when it takes None from the queue.
 
-        except Exception:
-            # print stack trace, but continue on to next record.
-            print(f"Exception caught scraping {tutor_url}:")
-            print_exception(*exc_info(), limit=None)
+    Parameters:
+        results (Queue): UPDATE_SQL parameters for each scraped tutor, then None.
+        num_rows (int): number of tutors to be scraped.
+    Returns:
+    """
+    connection = connect(DB_PATH, timeout=10)
+    cursor = connection.cursor()
 
-    else:
-        pass
+    start = monotonic()
+    batch = []
+    num_written = 0
+    while True:
+        row = results.get()
+        if row is not None:
+            batch.append(row)
+        if batch and (row is None or len(batch) >= WRITE_BATCH):
+            cursor.executemany(UPDATE_SQL, batch)
+            connection.commit()
+            for _ in batch:
+                num_written += 1
+                if num_written % PROGRESS_EVERY == 0:
+                    per_minute = 60 * num_written / (monotonic() - start)
+                    print(f"Updated {num_written} of {num_rows} records, {per_minute:.1f} profiles/min.")
+            batch.clear()
+        if row is None:
+            break
 
     # Final commit, disconnect from database.
     connection.commit()
     cursor.close()
     connection.close()
+    print(f"Updated {num_written} of {num_rows} records.")
+# End of function write_updates.
+
+
+def main():
+    """ Function main.
+
+    Parameters:
+    Returns:
+    """
+    parser = argparse.ArgumentParser(description="Scrape tutor profiles into the Tutors table.")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="browsers scraping profiles at once")
+    parser.add_argument("--rate", type=float, default=MAX_RATE,
+                        help="maximum profile page loads per second, across all workers (0 for no limit)")
+    parser.add_argument("--browser", choices=BROWSERS, default=PROFILE_BROWSER,
+                        help="browser to scrape profiles with ('http' has no JavaScript, is cheapest, but unchecked)")
+    args = parser.parse_args()
+
+    # Connect to database.
+    connection = connect(DB_PATH, timeout=10)
+    cursor = connection.cursor()
+    print("Connected to SQLite.")
+
+    # Find tutors who need details from their profile added.
+    cursor.execute(NEEDS_DETAIL_SQL)
+    rows = cursor.fetchall()
+    cursor.close()
+    connection.close()
+
+    print(f"Found {len(rows)} records to update.")
+
+    tutors = Queue()
+    for row in rows:
+        tutors.put(row)
+    results = Queue()
+    limiter = RateLimiter(args.rate)
+    stop = Event()
+
+    # Start browsers logged into Wyzant, one per worker.
+    pool = DriverPool(size=args.workers, browser=args.browser, block=BLOCK_PROFILE)
+
+    writer = Thread(target=write_updates, args=(results, len(rows)))
+    writer.start()
+    workers = [Thread(target=scrape_worker, args=(pool, tutors, results, limiter, stop), daemon=True)
+               for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+
+    try:
+        # Once no tutors are left, wait at most WORKER_WAIT seconds for the workers, so a stuck one cannot keep
+        # what was scraped from being written.
+        deadline = None
+        for worker in workers:
+            while worker.is_alive():
+                worker.join(timeout=1)
+                if not tutors.empty():
+                    deadline = None
+                elif deadline is None:
+                    deadline = monotonic() + WORKER_WAIT
+                elif monotonic() > deadline:
+                    break
+        busy = sum(worker.is_alive() for worker in workers)
+        if busy:
+            stop.set()
+            print(f"{busy} workers still busy after {WORKER_WAIT} seconds, not waiting for them.")
+    except KeyboardInterrupt:
+        stop.set()
+        print("Execution halted.")
+    finally:
+        # Write what was scraped, then disconnect from database.
+        results.put(None)
+        writer.join()
+        pool.close()
+
+    if not tutors.empty():
+        print(f"{tutors.qsize()} tutors not scraped, left for the next run.")
     print("ALL DONE.")
 # End of function main.
 
@@ -0,0 +1,928 @@
+""" wyzant_search.py
+
+SUMMARY: Search engine for tutors, shared by wyzant_pricing.py and wyzant_search_topics.py, so that one pass
+over the topics feeds both the pricing database and the rank survey.
+search_results searches for each topic, in one browser or in several worker processes, and scrapes the
+tutor-cards found.  feed_consumers turns the results into a stream of SearchHit(topic, subject, num_tutors,
+position, tutor), and passes each to every consumer, such as pricing_db.PricingWriter and
+wyzant_search_topics.RankWriter.  In rank mode, rank_topic reads tutor IDs only until the tutors
+wanted are found, then stops paging.
+
+Tutor-cards are found by a pagination engine, instead of clicking "Show More Tutors" until it vanishes.
+Clicking makes the page, and Chrome's memory, grow with every click, and each click re-lays-out every
+tutor-card so far, so a topic with thousands of tutors gets slower and slower.
+Instead, discover_pager finds the request behind the "Show More Tutors" button: from the button's href,
+or else by clicking it once and finding the request it made with the Performance API.
+iter_search_pages then fetches the later pages of results directly over HTTP, PAGE_WORKERS at once,
+with the cookies of the browser, and parses the tutor-cards of each page on its own with lxml.
+Pages are yielded in order, as soon as each is ready.  If that fails, it falls back to clicking.
+
+Used by:
+wyzant_pricing.py.
+wyzant_search_topics.py.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+# Web Browser independent Selenium imports.
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as ec
+
+from selenium.common.exceptions import TimeoutException
+
+from wyzant_common import element_text, guess_gender, make_http_session
+from wyzant_driver import make_driver, quit_driver, BROWSER
+from wyzant_waits import (wait_for, element_text_changed, element_count_increased, element_gone, input_value_is,
+                          NetworkIdle, SPINNER_XPATH, WAIT_STATS)
+
+# Other packages.
+import math
+import multiprocessing
+import requests
+from collections import namedtuple
+from functools import partial
+from multiprocessing.util import Finalize
+from traceback import print_exception
+from sys import exc_info
+from time import sleep, monotonic
+from concurrent.futures import ThreadPoolExecutor
+from lxml import html as lxml_html
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+# CONSTANTS.
+
+TIMEOUT = 30  # Seconds.
+BLOCK_PROFILE = 'lean'  # What the browser does not download, one of wyzant_driver.BLOCK_PROFILES.
+FAILURE_WAIT = 10  # Seconds.
+MAX_TRIES = 6
+WORKERS = 1  # Processes, each with a browser, searching for topics at once.
+USE_SEARCH_PAGES = True  # Fetch pages of search results directly, rather than clicking "Show More Tutors".
+PAGE_WORKERS = 4  # Pages of search results fetched at once.
+MAX_PAGES = 1000  # Pages of search results, at most, per search.
+
+# Search page.
+SEARCH_URL = "https://www.wyzant.com/match/search"
+BACKGROUND_CHECK = (By.XPATH, '/html/body/div[2]/section/main/aside[1]/form/input[6]')
+SEARCH_INPUT = (By.XPATH, '/html/body/div[2]/section/main/aside[2]/form/div[1]/input')
+SEARCH_BUTTON = (By.XPATH, '/html/body/div[2]/section/main/aside[2]/form/div[3]/button')
+NUM_TUTORS = (By.XPATH, '/html/body/div[2]/div[2]/div[1]/section/div[1]/div/h3/strong')
+SHOW_MORE = (By.XPATH, '//div[@class="load-more"]/a[contains(@class, "load-more-btn")]')
+TUTOR_CARDS = (By.XPATH, '/html/body/div[2]/div[2]/div[1]/section/a[contains(@class, "tutor-card")] | '
+                         '/html/body/div[2]/div[2]/div[1]/a[contains(@class, "tutor-card")]')
+
+LOAD_MORE_XPATH = '//a[contains(@class, "load-more-btn")]'
+TUTOR_CARD_XPATH = '//a[contains(@class, "tutor-card")]'
+SILHOUETTE_URL = 'https://www.wyzant.com/images/tutor/silhouette.png'
+
+# Names of query parameters that number pages, and those that count results skipped.
+PAGE_PARAMS = ['page', 'pg', 'p', 'pagenumber', 'pageindex', 'pagenum']
+OFFSET_PARAMS = ['offset', 'start', 'skip', 'from']
+
+# URLs of the XMLHttpRequest and fetch requests made since the resource timings were last cleared.
+XHR_URLS_JS = ("return performance.getEntriesByType('resource')"
+               ".filter(entry => ['xmlhttprequest', 'fetch'].includes(entry.initiatorType))"
+               ".map(entry => entry.name);")
+CLEAR_TIMINGS_JS = "performance.clearResourceTimings();"
+
+# hrefs of the tutor-cards in the page, from position arguments[0] on, in one call.
+CARD_HREFS_JS = ("return Array.from(document.querySelectorAll('a.tutor-card'))"
+                 ".slice(arguments[0]).map(card => card.getAttribute('href'));")
+
+
+# One tutor-card found by searching for a topic, at position 1, 2, ... in the search results.
+# tutor is as from scrape_tutor_card, or None for a tutor-card that could not be scraped, or, at position 0,
+# for a topic with no tutors.
+SearchHit = namedtuple("SearchHit", ["topic", "subject", "num_tutors", "position", "tutor"])
+
+
+class PagerNotFound(Exception):
+    """ The request behind the "Show More Tutors" button could not be found. """
+    pass
+
+
+class SearchPager:
+    """ URLs of the pages of search results, from the URL of one of them. """
+
+    def __init__(self, url: str, param: str, value: int, page_num: int, step: int):
+        """ Function __init__.
+
+        Parameters:
+            url (str): URL of page page_num.
+            param (str): name of the query parameter that selects the page.
+            value (int): value of param in url.
+            page_num (int): number of the page at url, starting at 1.
+            step (int): change of param from one page to the next.
+        """
+        self.url = url
+        self.param = param
+        self.value = value
+        self.page_num = page_num
+        self.step = step
+        self.xhr = False  # True if the URL was requested by JavaScript, rather than a link.
+
+    def page_url(self, page_num: int) -> str:
+        """ URL of a page of search results.
+
+        Parameters:
+            page_num (int): number of the page, starting at 1.
+        Returns:
+            url (str): URL of the page.
+        """
+        parts = urlsplit(self.url)
+        query = [(name, str(self.value + (page_num - self.page_num) * self.step) if name == self.param else value)
+                 for name, value in parse_qsl(parts.query, keep_blank_values=True)]
+        return urlunsplit(parts._replace(query=urlencode(query)))
+# End of class SearchPager.
+
+
+def make_pager(url: str, page_size: int):
+    """ Function make_pager.
+
+    Parameters:
+        url (str): URL of page 2 of search results, the page "Show More Tutors" loads first.
+        page_size (int): tutor-cards per page.
+    Returns: SearchPager, or None if url has no query parameter that selects the page.
+    """
+    for name, value in parse_qsl(urlsplit(url).query):
+        if not value.isdigit():
+            continue
+        if name.lower() in PAGE_PARAMS:
+            return SearchPager(url, name, int(value), 2, 1)
+        if name.lower() in OFFSET_PARAMS:
+            return SearchPager(url, name, int(value), 2, page_size)
+    return None
+
+
+def discover_pager(driver) -> SearchPager:
+    """ Function discover_pager.  Find the request behind the "Show More Tutors" button.
+
+    Parameters:
+        driver: Selenium driver object, at the first page of search results.
+    Returns: SearchPager for the search results.
+    Raises: PagerNotFound if there is no such request.
+    """
+    page_size = len(driver.find_elements(By.XPATH, TUTOR_CARD_XPATH))
+    show_more = driver.find_elements(By.XPATH, LOAD_MORE_XPATH)
+    if not show_more:
+        raise PagerNotFound("No 'Show More Tutors' button.")
+
+    # An anchor, so its href may be the URL of the next page.
+    href = (show_more[0].get_attribute('href') or "").strip()
+    if href and not href.startswith(('javascript:', '#')):
+        pager = make_pager(urljoin(driver.current_url, href), page_size)
+        if pager is not None:
+            return pager
+
+    # Otherwise, click it once, and look for the request it made.
+    driver.execute_script(CLEAR_TIMINGS_JS)
+    show_more[0].click()
+    wait_for(driver, "discover pager", element_count_increased((By.XPATH, TUTOR_CARD_XPATH), page_size))
+    for url in reversed(driver.execute_script(XHR_URLS_JS)):
+        pager = make_pager(url, page_size)
+        if pager is not None:
+            pager.xhr = True
+            return pager
+    raise PagerNotFound("No request with a page number found for 'Show More Tutors'.")
+
+
+def find_html(value) -> str:
+    """ Function find_html.
+
+    Parameters: Decoded JSON.
+    Returns: The first string in value containing tutor-cards, or "" if none.
+    """
+    if isinstance(value, str):
+        return value if "tutor-card" in value else ""
+    items = value.values() if isinstance(value, dict) else value if isinstance(value, list) else []
+    for item in items:
+        found = find_html(item)
+        if found:
+            return found
+    return ""
+
+
+def parse_cards(page_html: str, parse_card) -> list:
+    """ Function parse_cards.  Parse the tutor-cards of one page of search results.
+
+    Parameters:
+        page_html (str): HTML of the page, or of the part of it with tutor-cards.
+        parse_card: function from a tutor-card, an lxml element, to what is wanted from it.
+    Returns: parse_card of each tutor-card, in page order.
+    """
+    if not page_html.strip():
+        return []
+    return [parse_card(card) for card in lxml_html.fromstring(page_html).xpath(TUTOR_CARD_XPATH)]
+
+
+def fetch_page(session: requests.Session, pager: SearchPager, page_num: int, parse_card) -> list:
+    """ Function fetch_page.  Fetch and parse one page of search results.
+
+    Parameters:
+        session (requests.Session): session from wyzant_common.make_http_session.
+        pager (SearchPager): from discover_pager.
+        page_num (int): number of the page, starting at 1.
+        parse_card: as for parse_cards.
+    Returns: parse_card of each tutor-card on the page.
+    """
+    headers = {"X-Requested-With": "XMLHttpRequest"} if pager.xhr else {}
+    response = session.get(pager.page_url(page_num), headers=headers, timeout=TIMEOUT)
+    response.raise_for_status()
+    if "json" in response.headers.get("Content-Type", ""):
+        return parse_cards(find_html(response.json()), parse_card)
+    return parse_cards(response.text, parse_card)
+
+
+def iter_search_pages(driver, num_tutors: int, parse_card, workers: int = PAGE_WORKERS):
+    """ Function iter_search_pages.  Generator of the pages of search results, in order.
+    Page 1 is parsed from the browser.  The rest are fetched over HTTP, workers pages at once,
+    until a page has no tutor-cards, or there are enough pages for num_tutors.
+
+    Parameters:
+        driver: Selenium driver object, at the first page of search results.
+        num_tutors (int): number of tutors found by the search.
+        parse_card: as for parse_cards.
+        workers (int): pages fetched at once.
+    Yields: List of parse_card of each tutor-card of a page.
+    Raises: PagerNotFound if the request behind the "Show More Tutors" button could not be found.
+    """
+    first_page = parse_cards(driver.page_source, parse_card)
+    page_size = len(first_page)
+    if page_size == 0 or page_size >= num_tutors or not driver.find_elements(By.XPATH, LOAD_MORE_XPATH):
+        yield first_page
+        return
+
+    pager = discover_pager(driver)
+    session = make_http_session(driver, workers, {"Referer": driver.current_url})
+    yield first_page
+
+    num_pages = min(math.ceil(num_tutors / page_size), MAX_PAGES)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # At most workers pages are fetched at once, and pages are yielded in order.
+        pages = executor.map(lambda page_num: fetch_page(session, pager, page_num, parse_card),
+                             range(2, num_pages + 1))
+        try:
+            for page in pages:
+                if not page:
+                    break
+                yield page
+        finally:
+            # If the caller stops early, do not fetch the pages still queued.
+            executor.shutdown(wait=True, cancel_futures=True)
+    session.close()
+# End of function iter_search_pages.
+
+
+def card_url(card_obj) -> str:
+    """ Function card_url.
+
+    Parameters: tutor-card, an lxml element.
+    Returns: Absolute URL of the tutor's profile, without query.
+    """
+    return urljoin("https://www.wyzant.com/", card_obj.get('href', '').split('?')[0])
+
+
+def card_id(href: str) -> int:
+    """ Function card_id.
+
+    Parameters: href of a tutor-card, such as "/match/tutor/88195255?...".
+    Returns: ID of the tutor, or None if the href has none.
+    """
+    id_number = (href or "").split('?')[0].rstrip('/').split('/')[-1]
+    return int(id_number) if id_number.isdigit() else None
+
+
+def card_id_of(card_obj) -> int:
+    """ Function card_id_of.
+
+    Parameters: tutor-card, an lxml element.
+    Returns: ID of the tutor, or None if none.
+    """
+    return card_id(card_obj.get('href'))
+
+
+def parse_tutor_card(card_obj) -> list:
+    """ Function parse_tutor_card.  Same XPaths as wyzant_pricing.scrape_tutor_card.
+
+    Parameters: tutor-card, an lxml element.
+    Returns: [ID, URL, name, bill rate, average rating, number of ratings, total hours, has photo, gender,
+              topic hours].
+    """
+    tutor_url = card_url(card_obj)
+    id_number = int(tutor_url.split("/")[-1])
+
+    # Get Tutor Name and Gender
+    tutor_name = card_obj.xpath('./div/section[2]/div/h5')
+    if tutor_name:
+        tutor_name = element_text(tutor_name[0])
+        gender = guess_gender(" ".join(tutor_name.split()[:-1]))
+    else:
+        tutor_name = None
+        gender = "Unk"
+
+    # Billing rate, $ per hour.
+    bill_rate = card_obj.xpath('./div/section[3]/section/h5/div')
+    bill_rate = int(element_text(bill_rate[0])[1:-5].replace(",", "")) if bill_rate else None
+
+    # Average Rating, 0-5.
+    avg_rating = card_obj.xpath('./div/section[3]/div[1]/strong')
+    avg_rating = float(element_text(avg_rating[0])) if avg_rating else None
+
+    # Number of Ratings.
+    num_ratings = card_obj.xpath('./div/section[3]/div[1]/span[2]')
+    num_ratings = int(element_text(num_ratings[0]).replace(",", "")[1:-1]) if num_ratings else 0
+
+    # Topic hours and Total hours, in one of 2 formats: see wyzant_pricing.scrape_tutor_card.
+    topic_hours = card_obj.xpath('./div/section[3]/div[2]/div/p/span[1]')
+    if topic_hours:
+        topic_hours = int(element_text(topic_hours[0]).split()[0].replace(",", ""))
+        total_hours = card_obj.xpath('./div/section[3]/div[2]/div/p/span[2]')[0]
+        total_hours = int(element_text(total_hours).split()[2].replace(",", ""))
+    else:
+        topic_hours = 0
+        total_hours = card_obj.xpath('./div/section[3]/div[2]/h3')
+        total_hours = int(element_text(total_hours[0]).split()[0].replace(",", "")) if total_hours else 0
+
+    photo = card_obj.xpath('./div/section[1]/div/img')
+    has_photo = int(bool(photo) and urljoin("https://www.wyzant.com/", photo[0].get('src', '')) != SILHOUETTE_URL)
+
+    return [id_number, tutor_url, tutor_name, bill_rate, avg_rating, num_ratings, total_hours,
+            has_photo, gender, topic_hours]
+# End of function parse_tutor_card.
+
+
+def search_topic(driver, topic: str):
+    """ Function search_topic.  Search for tutors of a topic, trying up to MAX_TRIES times.
+
+    Parameters:
+        driver: Selenium driver object, logged into Wyzant.
+        topic (str): topic to search for.
+    Returns: Number of tutors found, or None if the search failed.
+    """
+    for num_tries in range(1, MAX_TRIES):
+        try:
+            # Start search.
+            driver.get(SEARCH_URL)
+            search_term = wait_for(driver, "search page", ec.element_to_be_clickable(SEARCH_INPUT))
+
+            # Make sure that the background check checkbox is unchecked.
+            background_check = driver.find_element(*BACKGROUND_CHECK)
+            if background_check.is_selected():
+                background_check.click()
+                wait_for(driver, "background check", ec.element_selection_state_to_be(background_check, False))
+
+            # Enter topic into subject input control.
+            # First, select all text in input...
+            search_term.send_keys(Keys.CONTROL, 'a')
+            # ...backspace to delete text in input...
+            search_term.send_keys(Keys.BACKSPACE)
+            wait_for(driver, "clear topic", input_value_is(search_term, ""))
+            # ...paste topic into subject input control...
+            search_term.send_keys(topic)
+            wait_for(driver, "type topic", input_value_is(search_term, topic))
+            # ...click Search "button" (an anchor).  Wait for the number of tutors to change, or, if it does not
+            # (no tutors, or the same number as before), for the page to stop loading.
+            old_num_tutors = (driver.find_elements(*NUM_TUTORS) or [None])[0]
+            old_text = old_num_tutors.text.strip() if old_num_tutors else None
+            driver.find_element(*SEARCH_BUTTON).click()
+            wait_for(driver, "search results",
+                     ec.any_of(element_text_changed(NUM_TUTORS, old_text, old_num_tutors), NetworkIdle()))
+            wait_for(driver, "search spinner", element_gone((By.XPATH, SPINNER_XPATH)))
+
+            # Get number of tutors, none if the number is missing.
+            num_tutors = driver.find_elements(*NUM_TUTORS)
+            num_tutors = int(num_tutors[0].text.split()[0].replace(",", "")) if num_tutors else 0
+            print(f"{topic} HAS {num_tutors} TUTORS.")
+
+            # Successful topic search.
+            return num_tutors
+        except Exception:
+            print(f"{topic} TOPIC SEARCH RAISED THIS EXCEPTION, TRY #{num_tries}:")
+            print_exception(*exc_info(), limit=None)
+            sleep(FAILURE_WAIT)
+
+    print(f"{topic} TOPIC SEARCH FAILED {MAX_TRIES} TIMES, SKIPPING TO NEXT TOPIC.")
+    return None
+
+
+def show_all_tutors(driver, topic: str) -> None:
+    """ Function show_all_tutors.  Keep clicking "Show More Tutors" link until it disappears.
+    After each click, wait for more tutor-cards, rather than for a fixed time.
+
+    Parameters:
+        driver: Selenium driver object, at the search results page.
+        topic (str): topic searched for.
+    Returns:
+    """
+    print(f"{topic} CLICKING 'Show More Tutors'")
+    num_timeouts = 0
+    while num_timeouts < MAX_TRIES:
+        show_more = driver.find_elements(*SHOW_MORE)
+        if len(show_more) == 0:
+            break
+        num_cards = len(driver.find_elements(*TUTOR_CARDS))
+        try:
+            show_more[0].click()
+            wait_for(driver, "show more tutors", element_count_increased(TUTOR_CARDS, num_cards))
+            num_timeouts = 0
+        except TimeoutException:
+            num_timeouts += 1
+        except Exception:
+            pass
+
+    print(f"{topic} FINISHED CLICKING 'Show More Tutors'")
+
+
+def get_tutor_cards(driver, topic: str):
+    """ Function get_tutor_cards.  Get tutor-card anchors, trying up to MAX_TRIES times.
+
+    Parameters:
+        driver: Selenium driver object, at the search results page.
+        topic (str): topic searched for.
+    Returns: List of tutor-card anchors (each contains 1 tutor), or None if unable to find them.
+    """
+    for num_tries in range(1, MAX_TRIES):
+        try:
+            # Get list of tutor-card anchors (each contains 1 tutor).  They fall under 2 different xpaths.
+            tutor_cards = driver.find_elements(*TUTOR_CARDS)
+            # Number of tutor-cards should match num_tutors.  Not checking.
+
+            # Successful tutor-card search.
+            return tutor_cards
+        except Exception:
+            print(f"{topic} TUTOR-CARD SEARCH RAISED THIS EXCEPTION, TRY #{num_tries}:")
+            print_exception(*exc_info(), limit=None)
+            sleep(FAILURE_WAIT)
+
+    print(f"{topic} GETTING LIST OF TUTOR-CARDS FAILED {MAX_TRIES} TIMES, SKIPPING TO NEXT TOPIC.")
+    return None
+
+
+def scrape_tutor_card(tutor, topic: str):
+    """ Function scrape_tutor_card.  Scrape one tutor-card, trying up to MAX_TRIES times.
+
+    Parameters:
+        tutor: tutor-card anchor.
+        topic (str): topic searched for.
+    Returns: [ID, URL, name, bill rate, average rating, number of ratings, total hours, has photo, gender,
+              topic hours], or None if the tutor-card could not be scraped.
+    """
+    # Get tutor profile URL
+    tutor_url = tutor.get_attribute('href').split('?')[0]
+
+    # Get tutor ID number
+    id_number = tutor_url.split("?")[0].split("/")[-1]
+    id_number = int(id_number)
+
+    for num_tries in range(1, MAX_TRIES):
+        try:
+            # Get Tutor Name and Gender
+            tutor_name = tutor.find_elements(By.XPATH, './div/section[2]/div/h5')
+            if tutor_name:
+                tutor_name = tutor_name[0].text.strip()
+                gender = tutor_name.split()[:-1]
+                gender = " ".join(gender)
+                gender = guess_gender(gender)
+            else:
+                tutor_name = None
+                gender = "Unk"
+
+            # Billing rate, $ per hour.
+            bill_rate = tutor.find_elements(By.XPATH, './div/section[3]/section/h5/div')
+            if bill_rate:
+                bill_rate = int(bill_rate[0].text.strip()[1:-5].replace(",", ""))
+            else:
+                bill_rate = None
+
+            # Average Rating, 0-5.
+            avg_rating = tutor.find_elements(By.XPATH, './div/section[3]/div[1]/strong')
+            if avg_rating:
+                avg_rating = float(avg_rating[0].text.strip())
+            else:
+                avg_rating = None
+
+            # Number of Ratings.
+            num_ratings = tutor.find_elements(By.XPATH, './div/section[3]/div[1]/span[2]')
+            if num_ratings:
+                num_ratings = int(num_ratings[0].text.strip().replace(",", "")[1:-1])
+            else:
+                num_ratings = 0
+
+            # Topic hours and Total hours
+            '''
+            FORMAT 1:
+            TOPIC HOURS: "40 hours tutoring Fortran" at
+                /html/body/div[2]/div[2]/div[1]/section/a[3]/div/section[3]/div[2]/div/p/span[1]
+            TOTAL HOURS: "out of 1,369 hours" at
+                /html/body/div[2]/div[2]/div[1]/section/a[3]/div/section[3]/div[2]/div/p/span[2]
+
+            FORMAT 2:
+            TOPIC HOURS: 'None'
+            TOTAL HOURS: "78 hours tutoring" at
+                /html/body/div[2]/div[2]/div[1]/section/a[2]/div/section[3]/div[2]/h3
+            '''
+            topic_hours = tutor.find_elements(By.XPATH, './div/section[3]/div[2]/div/p/span[1]')
+            if topic_hours:
+                # FORMAT 1
+                topic_hours = int(topic_hours[0].text.split()[0].replace(",", ""))
+
+                total_hours = tutor.find_element(By.XPATH, './div/section[3]/div[2]/div/p/span[2]')
+                total_hours = int(total_hours.text.split()[2].replace(",", ""))
+            else:
+                # FORMAT 2
+                # No topic hours reported, so don't record topic hours.  Do get total hours.
+                topic_hours = 0
+                total_hours = tutor.find_elements(By.XPATH, './div/section[3]/div[2]/h3')
+                if total_hours:
+                    total_hours = int(total_hours[0].text.split()[0].replace(",", ""))
+                else:
+                    total_hours = 0
+
+            photo = tutor.find_elements(By.XPATH, './div/section[1]/div/img')
+            if photo:
+                photo = photo[0].get_attribute('src')
+                has_photo = int(photo != 'https://www.wyzant.com/images/tutor/silhouette.png')
+            else:
+                has_photo = int(False)
+
+            # Successful scrape of tutor.
+            return [id_number, tutor_url, tutor_name, bill_rate, avg_rating, num_ratings, total_hours,
+                    has_photo, gender, topic_hours]
+        except Exception:
+            print(f"{topic} GET INTO FOR TUTOR {id_number} RAISED THIS EXCEPTION, TRY #{num_tries}:")
+            print_exception(*exc_info(), limit=None)
+            sleep(FAILURE_WAIT)
+
+    print(f"{topic} GET INTO FOR TUTOR {id_number} FAILED #{num_tries} TIMES, SKIPPING.")
+    return None
+
+
+def parse_tutor_card_safely(card_obj):
+    """ Function parse_tutor_card_safely.  parse_tutor_card, printing rather than raising errors.
+
+    Parameters:
+        card_obj: tutor-card, an lxml element.
+    Returns: Same as scrape_tutor_card, or None if the tutor-card could not be parsed.
+    """
+    try:
+        return parse_tutor_card(card_obj)
+    except Exception:
+        print(f"PARSING TUTOR-CARD {card_url(card_obj)} RAISED THIS EXCEPTION, SKIPPING:")
+        print_exception(*exc_info(), limit=None)
+        return None
+
+
+def fetch_search_pages(driver, topic: str, num_tutors: int) -> list:
+    """ Function fetch_search_pages.  Fetch and parse every page of search results, without clicking
+    "Show More Tutors", by iter_search_pages.
+
+    Parameters:
+        driver: Selenium driver object, at the search results page.
+        topic (str): topic searched for.
+        num_tutors (int): number of tutors found.
+    Returns: List of tutors, as from scrape_tutor_card, each tutor once, and None for each tutor-card that
+             could not be parsed, so that positions are those of the tutor-cards.
+    """
+    print(f"{topic} FETCHING SEARCH RESULT PAGES")
+    tutors = []
+    id_numbers = set()
+    for page in iter_search_pages(driver, num_tutors, parse_tutor_card_safely):
+        # Tutors can move from one page to the next while paging.  Keep the first.
+        for tutor in page:
+            if tutor is None:
+                tutors.append(tutor)
+            elif tutor[0] not in id_numbers:
+                id_numbers.add(tutor[0])
+                tutors.append(tutor)
+    print(f"{topic} FINISHED FETCHING {len(tutors)} TUTORS FROM SEARCH RESULT PAGES")
+    return tutors
+
+
+def parse_topic_line(topic_orig: str) -> tuple:
+    """ Function parse_topic_line.
+
+    Parameters: Line from a topics file, a topic, optionally followed by " # subject".
+    Returns: (topic, subject), subject 1 if the topic is a subject, else 0.
+    """
+    subject = 0
+    if " # subject" in topic_orig:
+        topic, subject = topic_orig.split(" # ")
+        if subject == "subject":
+            subject = 1
+    else:
+        topic = topic_orig
+    return topic, subject
+
+
+def scrape_topic(driver, topic_orig: str) -> tuple:
+    """ Function scrape_topic.  Search for a topic, and scrape all the tutor-cards found.
+
+    Parameters:
+        driver: Selenium driver object, logged into Wyzant.
+        topic_orig (str): line from a topics file, a topic, optionally followed by " # subject".
+    Returns: (topic, subject, number of tutors found or None if the search failed,
+              list of tutors from scrape_tutor_card in search result order, None for each tutor-card that
+              could not be scraped, seconds taken).
+    """
+    start = monotonic()
+
+    # Get next topic.
+    topic, subject = parse_topic_line(topic_orig)
+    print(f"{topic} STARTED.")
+
+    tutors = []
+    num_tutors = search_topic(driver, topic)
+    if num_tutors is None:
+        return topic, subject, num_tutors, tutors, monotonic() - start
+
+    # Scrape tutors only if there are tutors.
+    if num_tutors == 0:
+        print(f"{topic} TOPIC SEARCH FOUND ZERO TUTORS.")
+        return topic, subject, num_tutors, tutors, monotonic() - start
+
+    if USE_SEARCH_PAGES:
+        try:
+            tutors = fetch_search_pages(driver, topic, num_tutors)
+            return topic, subject, num_tutors, tutors, monotonic() - start
+        except Exception:
+            print(f"{topic} FETCHING SEARCH RESULT PAGES RAISED THIS EXCEPTION, CLICKING 'Show More Tutors' INSTEAD:")
+            print_exception(*exc_info(), limit=None)
+            tutors = []
+            # Start over, since the search results may have been partly expanded.
+            if search_topic(driver, topic) is None:
+                return topic, subject, num_tutors, tutors, monotonic() - start
+
+    show_all_tutors(driver, topic)
+
+    tutor_cards = get_tutor_cards(driver, topic)
+    if tutor_cards is None:
+        return topic, subject, num_tutors, tutors, monotonic() - start
+
+    print(f"{topic} STARTED SCRAPING TUTOR CARDS")
+    for tutor_card in tutor_cards:
+        tutors.append(scrape_tutor_card(tutor_card, topic))
+
+    print(f"{topic} FINISHED SCRAPING TUTOR CARDS")
+    return topic, subject, num_tutors, tutors, monotonic() - start
+
+
+# Browser of a worker process, started by init_worker, or why it could not be started.
+worker_driver = None
+worker_error = None
+worker_browser = BROWSER
+
+
+class WorkerStartError(Exception):
+    """ The browser of a worker process could not be started. """
+    pass
+
+
+def init_worker(browser: str = BROWSER) -> None:
+    """ Function init_worker.  Start the browser of a worker process, quit when the process exits.
+    Does not raise, since multiprocessing.Pool would restart the worker, and fail again, forever.  Instead,
+    get_worker_driver tries again for each task, and the task fails if the browser still cannot start.
+
+    Parameters:
+        browser (str): one of wyzant_driver.JS_BROWSERS.
+    Returns:
+    """
+    global worker_driver, worker_error, worker_browser
+    worker_browser = browser
+    try:
+        worker_driver = make_driver(browser=browser, block=BLOCK_PROFILE)
+    except Exception as error:
+        worker_error = f"{type(error).__name__}: {error}"
+        return
+    Finalize(None, quit_driver, args=(worker_driver,), exitpriority=16)
+    Finalize(None, WAIT_STATS.report, exitpriority=17)
+
+
+def get_worker_driver():
+    """ Function get_worker_driver.  If init_worker could not start the browser, try once more, so that a
+    worker whose browser failed to start does not fail every topic it takes at once.
+
+    Parameters:
+    Returns: The browser of this worker process.
+    Raises:
+        WorkerStartError: if the browser could not be started.
+    """
+    if worker_driver is None:
+        init_worker(worker_browser)
+    if worker_driver is None:
+        raise WorkerStartError(f"Starting the browser of a worker process failed: {worker_error}")
+    return worker_driver
+
+
+def failed_topic(topic_orig: str, start: float) -> tuple:
+    """ Function failed_topic.  Print the exception being handled, raised searching for a topic.
+
+    Parameters:
+        topic_orig (str): line from a topics file.
+        start (float): monotonic() when the search started.
+    Returns: Same as scrape_topic for a failed search: number of tutors None, and no tutors.
+    """
+    topic, subject = parse_topic_line(topic_orig)
+    print(f"{topic} RAISED THIS EXCEPTION, SKIPPING:")
+    print_exception(*exc_info(), limit=None)
+    return topic, subject, None, [], monotonic() - start
+
+
+def scrape_topic_in_worker(topic_orig: str) -> tuple:
+    """ Function scrape_topic_in_worker.  scrape_topic, with the browser of a worker process.
+    Does not raise, so that one topic, or one worker without a browser, does not stop the other topics.
+
+    Parameters:
+        topic_orig (str): line from a topics file.
+    Returns: Same as scrape_topic, or as failed_topic if it raised.
+    """
+    start = monotonic()
+    try:
+        return scrape_topic(get_worker_driver(), topic_orig)
+    except Exception:
+        return failed_topic(topic_orig, start)
+
+
+def scan_for_ids(card_ids, tutor_ids: set) -> list:
+    """ Function scan_for_ids.  Read tutor IDs, in search result order, until all of tutor_ids are found.
+
+    Parameters:
+        card_ids: iterable of lists of the tutor ID of each tutor-card, one list per page.  If it is a
+                  generator, it is closed when all are found, so no more pages are fetched.
+        tutor_ids (set): IDs of the tutors to look for.
+    Returns: [ID] for each tutor-card read, in order, as tutors for topic_hits.  As in fetch_search_pages,
+             a tutor read again on a later page is kept only the first time, and tutor-cards with no ID are
+             kept, as [None], so that positions are the same as in a full scrape.
+    """
+    tutors = []
+    id_numbers = set()
+    missing = set(tutor_ids)
+    try:
+        for page in card_ids:
+            for id_number in page:
+                if id_number is None or id_number not in id_numbers:
+                    id_numbers.add(id_number)
+                    tutors.append([id_number])
+            missing.difference_update(page)
+            if not missing:
+                break
+    finally:
+        if hasattr(card_ids, 'close'):
+            card_ids.close()
+    return tutors
+
+
+def clicked_card_ids(driver):
+    """ Function clicked_card_ids.  Generator of the tutor IDs of each lot of tutor-cards loaded by clicking
+    "Show More Tutors", with one execute_script per lot, rather than a get_attribute per tutor-card.
+
+    Parameters: Selenium driver object, at the search results page.
+    Yields: List of the tutor ID of each tutor-card, one list per lot.
+    """
+    num_cards = 0
+    num_timeouts = 0
+    while True:
+        hrefs = driver.execute_script(CARD_HREFS_JS, num_cards)
+        num_cards += len(hrefs)
+        if hrefs:
+            yield [card_id(href) for href in hrefs]
+
+        show_more = driver.find_elements(*SHOW_MORE)
+        if not show_more or num_timeouts >= MAX_TRIES:
+            return
+        try:
+            show_more[0].click()
+            wait_for(driver, "show more tutors", element_count_increased(TUTOR_CARDS, num_cards))
+            num_timeouts = 0
+        except TimeoutException:
+            num_timeouts += 1
+        except Exception:
+            pass
+
+
+def rank_topic(driver, topic_orig: str, tutor_ids: list) -> tuple:
+    """ Function rank_topic.  Search for a topic, and read tutor-cards only until all of tutor_ids are found.
+
+    Parameters:
+        driver: Selenium driver object, logged into Wyzant.
+        topic_orig (str): line from a topics file, a topic, optionally followed by " # subject".
+        tutor_ids (list): IDs of the tutors to rank.
+    Returns: Same as scrape_topic, but each tutor is just [ID], and only the tutors up to the last of
+             tutor_ids found, or all if some are not found.
+    """
+    start = monotonic()
+    topic, subject = parse_topic_line(topic_orig)
+    print(f"{topic} STARTED.")
+
+    tutors = []
+    num_tutors = search_topic(driver, topic)
+    if not num_tutors:
+        return topic, subject, num_tutors, tutors, monotonic() - start
+
+    if USE_SEARCH_PAGES:
+        try:
+            tutors = scan_for_ids(iter_search_pages(driver, num_tutors, card_id_of), set(tutor_ids))
+            return topic, subject, num_tutors, tutors, monotonic() - start
+        except Exception:
+            print(f"{topic} FETCHING SEARCH RESULT PAGES RAISED THIS EXCEPTION, CLICKING 'Show More Tutors' INSTEAD:")
+            print_exception(*exc_info(), limit=None)
+            # Start over, since the search results may have been partly expanded.
+            num_tutors = search_topic(driver, topic)
+            if not num_tutors:
+                return topic, subject, num_tutors, tutors, monotonic() - start
+
+    tutors = scan_for_ids(clicked_card_ids(driver), set(tutor_ids))
+    return topic, subject, num_tutors, tutors, monotonic() - start
+
+
+def rank_topic_in_worker(topic_orig: str, tutor_ids: list) -> tuple:
+    """ Function rank_topic_in_worker.  rank_topic, with the browser of a worker process.
+    Does not raise, as for scrape_topic_in_worker.
+
+    Parameters:
+        topic_orig (str): line from a topics file.
+        tutor_ids (list): IDs of the tutors to rank.
+    Returns: Same as rank_topic, or as failed_topic if it raised.
+    """
+    start = monotonic()
+    try:
+        return rank_topic(get_worker_driver(), topic_orig, tutor_ids)
+    except Exception:
+        return failed_topic(topic_orig, start)
+
+
+def search_results(topic_lines: list, workers: int = WORKERS, rank_ids: list = None, browser: str = BROWSER):
+    """ Function search_results.  Generator of the results of searching for each topic, in topic order.
+
+    Parameters:
+        topic_lines (list): lines from a topics file.
+        workers (int): processes, each with a browser, searching for topics at once.
+        rank_ids (list): if given, rank mode: read tutor-cards only until these tutor IDs are found,
+                         by rank_topic, rather than scraping them all, by scrape_topic.
+        browser (str): one of wyzant_driver.JS_BROWSERS, since search results need JavaScript.
+    Yields: Results of scrape_topic, or rank_topic, one per topic.  A topic whose search raised an exception
+            yields the result of failed_topic, and the other topics go on.
+    """
+    if workers <= 1:
+        # Start a browser, logged into Wyzant.
+        driver = make_driver(browser=browser, block=BLOCK_PROFILE)
+        try:
+            for topic_orig in topic_lines:
+                start = monotonic()
+                try:
+                    if rank_ids:
+                        result = rank_topic(driver, topic_orig, rank_ids)
+                    else:
+                        result = scrape_topic(driver, topic_orig)
+                except Exception:
+                    result = failed_topic(topic_orig, start)
+                yield result
+        finally:
+            quit_driver(driver)
+    else:
+        # Start a browser, logged into Wyzant, in each worker process.
+        pool = multiprocessing.Pool(processes=workers, initializer=init_worker, initargs=(browser,))
+        function = partial(rank_topic_in_worker, tutor_ids=rank_ids) if rank_ids else scrape_topic_in_worker
+        try:
+            # imap returns results in topic order, so consumers see the same order as a sequential run.
+            yield from pool.imap(function, topic_lines)
+        finally:
+            pool.close()
+            pool.join()
+
+
+def topic_hits(topic: str, subject: int, num_tutors: int, tutors: list):
+    """ Function topic_hits.  Generator of the search hits of one topic.
+
+    Parameters:
+        topic, subject, num_tutors, tutors: from scrape_topic.
+    Yields: SearchHit for each tutor, at positions 1, 2, ..., or one SearchHit with no tutor, at
+            position 0, if there are no tutors or the search failed, so that consumers see every topic.
+            A tutor-card that could not be scraped keeps its position, with tutor None, or [None] in rank mode.
+            The hits of each topic start at position 0 or 1, which marks where a topic starts.
+    """
+    if not tutors:
+        yield SearchHit(topic, subject, num_tutors, 0, None)
+    for position, tutor in enumerate(tutors, 1):
+        yield SearchHit(topic, subject, num_tutors, position, tutor)
+
+
+def feed_consumers(results, consumers: list):
+    """ Function feed_consumers.  Pass the hits of each search result to every consumer, in one pass.
+
+    Parameters:
+        results: iterable of results of scrape_topic, from search_results.
+        consumers (list): objects with an add_hit(SearchHit) method, such as pricing_db.PricingWriter
+                          and wyzant_search_topics.RankWriter.
+    Yields: Each result, after every consumer has its hits.
+    """
+    for result in results:
+        topic, subject, num_tutors, tutors, _ = result
+        for hit in topic_hits(topic, subject, num_tutors, tutors):
+            for consumer in consumers:
+                consumer.add_hit(hit)
+        yield result
@@ -1,6 +1,15 @@
 """ wyzant_search_topics.py
 
 SUMMARY: Use Selenium to find my ranking among the tutors for each topic listed in a text file.
+Searching is done by wyzant_search.py, the same search engine as wyzant_pricing.py uses.  With --pricing,
+the tutors found are also saved to the pricing database, in the same pass, so that a rank survey and a
+pricing survey do not search for every topic twice.  wyzant_pricing.py --ranks does the same from the
+other side, for the topics in tutor_topics.txt.
+Without --pricing, only tutor IDs are read, page by page as the search results stream in, and paging stops
+as soon as all the tutors ranked (--tutor-ids, by default just me) are found.  Num_Tutor_Cards is then the
+number of tutor-cards read, not all of them.
+The ranks of each run are also added to the rank history in the pricing database, by rank_history.py,
+which reports how ranks change over time.
 
 REPOSITORY: https://github.com/DavidJLambert/Selenium
 
@@ -10,28 +19,97 @@ VERSION: 0.6.0
 
 DATE: Sep 02, 2023
 """
-# Web Browser independent Selenium imports.
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as ec
-
-# Web Browser dependent Selenium code
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-
-from wyzant_login import log_into_wyzant
+from wyzant_search import search_results, feed_consumers, WORKERS
+from wyzant_driver import BROWSER, JS_BROWSERS
+from wyzant_waits import WAIT_STATS
+from pricing_db import connect, PricingWriter
+from rank_history import RankHistory
 
 # Other packages.
+import argparse
 import csv
-from time import sleep
 
 # CONSTANTS.
 
 TIMEOUT = 30  # Seconds.
-SLEEP_TIME = 0.2  # Seconds.
+DB_PATH = r'C:\Users\david\Desktop\Wyzant\Pricing\Pricing.sqlite3'
+RANKS_PATH = './output/search_topics.csv'
+MY_TUTOR_ID = 88195255
+
+
+class RankWriter:
+    """ Consumer of search hits, from wyzant_search.feed_consumers.  Writes the rank of each of some tutors for
+    each topic to a csv file, one row per topic: topic, subject, number of tutors, number of tutor-cards, and
+    the rank of each tutor.  Rank is -1 if the tutor is not in the search results.  Topics whose search failed
+    are skipped, rather than ranked as if no tutors were found.
+    """
+
+    def __init__(self, path: str, tutor_ids: list = (MY_TUTOR_ID,), history: RankHistory = None):
+        """ Function __init__.
+
+        Parameters:
+            path (str): path of the csv file.
+            tutor_ids (list): IDs of the tutors to rank.
+            history (RankHistory): if given, each row is also added to the rank history, saved when closed.
+        """
+        self.tutor_ids = list(tutor_ids)
+        self.history = history
+        self.columns = {tutor_id: 4 + index for index, tutor_id in enumerate(self.tutor_ids)}
+        self.output = open(path, 'w', newline='')
+        self.csvwriter = csv.writer(self.output)
+        self.row = None  # Row of the current topic, None if its search failed.
+
+        # Heading row.  Just "Rank" for one tutor, as before.
+        row = ['Topic', 'Subject', 'Num_Tutors', 'Num_Tutor_Cards']
+        if len(self.tutor_ids) == 1:
+            row.append('Rank')
+        else:
+            row.extend(f"Rank_{tutor_id}" for tutor_id in self.tutor_ids)
+        print(row)
+        self.csvwriter.writerow(row)
+
+    def add_hit(self, hit) -> None:
+        """ Count one search hit, and write the row of the last topic when a new topic starts.
+        A new topic starts at position 0 or 1, as from wyzant_search.topic_hits, so topics with the same name
+        on consecutive lines stay apart.
+
+        Parameters:
+            hit: wyzant_search.SearchHit.
+        """
+        if hit.position <= 1:
+            self.write_row()
+            if hit.num_tutors is None:
+                print(f"{hit.topic} SEARCH FAILED, NOT RANKED.")
+            else:
+                self.row = [hit.topic, "subject" if hit.subject else "", hit.num_tutors, 0]
+                self.row.extend(-1 for _ in self.tutor_ids)
+        if hit.position == 0 or self.row is None:
+            return
+        # Every tutor-card counts, even one that could not be scraped.
+        self.row[3] += 1
+        if hit.tutor is None:
+            return
+        column = self.columns.get(hit.tutor[0])
+        if column is not None and self.row[column] == -1:
+            self.row[column] = hit.position
+
+    def write_row(self) -> None:
+        """ Write the row of the current topic, if any. """
+        if self.row is not None:
+            print(self.row)
+            self.csvwriter.writerow(self.row)
+            if self.history is not None:
+                topic, subject, num_tutors, num_cards, *ranks = self.row
+                self.history.add(topic, int(subject == "subject"), num_tutors, num_cards, ranks)
+            self.row = None
+
+    def close(self) -> None:
+        """ Write the row of the last topic, close the csv file, and save the rank history, if any. """
+        self.write_row()
+        self.output.close()
+        if self.history is not None:
+            self.history.close()
+# End of class RankWriter.
 
 
 def main():
@@ -40,6 +118,17 @@ def main():
     Parameters:
     Returns:
     """
+    parser = argparse.ArgumentParser(description="Find my rank for each topic in tutor_topics.txt and "
+                                                 "search_topics.txt.")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help="processes, each with a browser, searching for topics at once")
+    parser.add_argument("--pricing", action="store_true",
+                        help="also save the tutors found to the pricing database, as wyzant_pricing.py does")
+    parser.add_argument("--tutor-ids", type=int, nargs="+", default=[MY_TUTOR_ID],
+                        help="IDs of the tutors to rank, by default just me")
+    parser.add_argument("--browser", choices=JS_BROWSERS, default=BROWSER, help="browser to search with")
+    args = parser.parse_args()
+
     # Read list of topics
     topics = []
     with open('tutor_topics.txt', 'r') as file:
@@ -48,108 +137,25 @@ def main():
 
     with open('search_topics.txt', 'r') as file:
         for topic in file:
-            if topic not in topics:
+            if topic.strip() not in topics:
                 topics.append(topic.strip())
 
-    # Selenium options.
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument("--window-size=1920,2200")
-
-    # Connect to the Selenium web driver.
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-
-    # Maximize the browser window.
-    driver.maximize_window()
-
-    print("Done initializing Selenium.")
-
-    # Log into wyzant.
-    driver = log_into_wyzant(driver)
-
-    print("Going to the Wyzant find tutors page.")
-
-    driver.get("https://www.wyzant.com/match/search")
-    sleep(5)
-    # this_id = "ctl00_ctl00_PageCPH_CenterColumnCPH_LessonDisplay1_ListViewSession_Pager_NextPageBTN"
-    # WebDriverWait(driver, TIMEOUT).until(ec.visibility_of_element_located((By.ID, this_id)))
-
-    print("At Wyzant find tutors page.")
-
-    with open('./output/search_topics.csv', 'w', newline='') as output:
-        csvwriter = csv.writer(output)
-
-        # Heading row.
-        row = ['Topic', 'Subject', 'Num_Tutors', 'Num_Tutor_Cards', 'Rank']
-
-        print(row)
-        csvwriter.writerow(row)
-
-        for topic_orig in topics:
-            if " # subject" in topic_orig:
-                topic, subject = topic_orig.split(" # ")
-            else:
-                topic, subject = topic_orig, ""
-            # Enter search into subject input control.
-            search = driver.find_element(By.XPATH, '/html/body/div[2]/section/main/aside[2]/form/div[1]/input')
-            sleep(SLEEP_TIME)
-            search.send_keys(Keys.CONTROL, 'a')
-            sleep(SLEEP_TIME)
-            search.send_keys(Keys.BACKSPACE)
-            sleep(SLEEP_TIME)
-            search.send_keys(topic)
-            sleep(SLEEP_TIME)
-
-            # Click Search "button" (an anchor).
-            submit = driver.find_element(By.XPATH, '/html/body/div[2]/section/main/aside[2]/form/div[3]/button')
-            sleep(SLEEP_TIME)
-            submit.click()
-            sleep(SLEEP_TIME)
-
-            # Get number of tutors.
-            num_tutors = driver.find_elements(By.XPATH, '/html/body/div[2]/div[2]/div[1]/section/div[1]/div/h3/strong')
-            if len(num_tutors) == 0:
-                num_tutors = 0
-                num_tutor_cards = 0
-                rank = -1
-            else:
-                num_tutors = num_tutors[0].text.split()[0].replace(",", "")
-
-                # Keep clicking "Show More Tutors" link until it disappears.
-                while True:
-                    try:
-                        sleep(0.35)
-                        show_more = driver.find_elements(By.XPATH, '//a[contains(@class, "load-more-btn")]')
-                    except Exception:
-                        pass
-
-                    try:
-                        show_more[0].click()
-                    except Exception:
-                        pass
-
-                    if not show_more:
-                        break
-
-                tutor_cards = driver.find_elements(By.XPATH, '//a[contains(@class, "tutor-card")]')
-                num_tutor_cards = len(tutor_cards)
-
-                # In case no hits for search term.
-                rank = -2
-
-                for index, tutor in enumerate(tutor_cards):
-                    url = tutor.get_attribute('href')
-                    if "https://www.wyzant.com/match/tutor/88195255" == url[:43]:
-                        rank = index
-                        break
-                rank += 1
-
-            row = [topic, subject, num_tutors, num_tutor_cards, rank]
-            print(row)
-            csvwriter.writerow(row)
-
-
+    # Every consumer gets the search hits of each topic, so topics are only searched once.
+    connection = connect(DB_PATH, timeout=TIMEOUT)
+    consumers = [RankWriter(RANKS_PATH, args.tutor_ids, RankHistory(connection, args.tutor_ids))]
+    rank_ids = args.tutor_ids  # Rank mode: stop reading tutor-cards once these tutors are found.
+    if args.pricing:
+        consumers.append(PricingWriter(connection))
+        rank_ids = None  # Pricing needs every tutor-card.
+
+    for topic, _, _, _, _ in feed_consumers(search_results(topics, args.workers, rank_ids, args.browser), consumers):
+        print(f"{topic} TOPIC FINISHED")
+
+    for consumer in consumers:
+        consumer.close()
+    connection.close()
+    if args.workers <= 1:
+        WAIT_STATS.report()
 # End of function main.
 
 
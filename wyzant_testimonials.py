@@ -1,68 +1,333 @@
 """ wyzant_testimonials.py
 
 SUMMARY: Use Selenium to get all the testimonials.
+The testimonials shown one at a time by the carousel of the job application form (testimonial_nav) are all in
+the page already, as the data the carousel shows them from.  So all of them are read at once, from the page
+source, by extract_testimonials.  Only if that finds none are they read by clicking through the carousel, one
+at a time, by click_through_testimonials, as before.
+Each testimonial is tagged with the topics it mentions by topic_tagger.py.
+
+Runs are incremental.  Each testimonial saved is keyed by a hash of its student name, title and body, in table
+Testimonials of STORE_PATH, and only the testimonials not saved yet are appended to OUTPUT_PATH.  Testimonials read
+from the page source are all checked.  When clicking through, new testimonials are shown first, so clicking stops
+after SEEN_RUN testimonials in a row that are already saved, unless --full is given.
+The first run with an existing OUTPUT_PATH and no STORE_PATH saves the hashes of the rows in OUTPUT_PATH first.
 
 REPOSITORY: https://github.com/DavidJLambert/Selenium
 
 AUTHOR: David J. Lambert
 
-VERSION: 0.6.1
+VERSION: 0.7.0
 
-DATE: Jun 13, 2024
+DATE: Oct 18, 2026
 """
 # Web Browser independent Selenium imports.
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
 
-# Web Browser dependent Selenium code
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-
-from wyzant_login import log_into_wyzant
+from wyzant_driver import make_driver, quit_driver
+from topic_tagger import load_tagger
 
 # Other packages.
+import argparse
 import csv
+import datetime
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from lxml import html as lxml_html
 
 # CONSTANTS.
 
 TIMEOUT = 30  # Seconds.
+BLOCK_PROFILE = 'lean'  # What the browser does not download, one of wyzant_driver.BLOCK_PROFILES.
+OUTPUT_PATH = './output/recommendations.csv'
+STORE_PATH = './output/recommendations.sqlite3'
+SEEN_RUN = 3  # Testimonials in a row already saved, after which the rest are too.
+HEADINGS = ['Name', 'Sessions', 'Topics', 'Title', 'Body']
 
-topics = {'python': 'Python',
-          'sql': 'SQL',
-          'calculus': 'Calculus',
-          'web scraping': 'Web Scraping',
-          'vba': 'VBA',
-          'precalc': 'Pre-Calculus',
-          'linux': 'Linux', 'ubuntu': 'Linux', 'unix': 'Linux', 'bash': 'Linux',
-          'code': 'Coding', 'coding': 'Coding', 'programming': 'Coding', 'loop': 'Coding'}
-exact_topics = {'GRE'}
+# Start of a JSON array of testimonials in a script, such as "testimonials = [" or '"Testimonials": ['.
+TESTIMONIALS_START = re.compile(r'testimonials?\w*["\']?\s*[:=]\s*\[', re.IGNORECASE)
+# Keys of each field of a testimonial in that JSON, first found used.
+NAME_KEYS = ['studentName', 'student_name', 'StudentName', 'name', 'Name']
+SESSIONS_KEYS = ['sessions', 'numSessions', 'sessionCount', 'lessonCount', 'Sessions']
+TITLE_KEYS = ['title', 'Title', 'headline']
+BODY_KEYS = ['body', 'Body', 'text', 'testimonial', 'comment']
 
+# Topics of the keywords in testimonials, from topic_tagger.TOPICS_PATH if it exists.
+TAGGER = load_tagger()
 
-def main():
-    """ Function main.  Get all recommendations.
+
+def testimonial_topics(title: str, body: str) -> str:
+    """ Function testimonial_topics.
 
     Parameters:
+        title (str): title of the testimonial.
+        body (str): body of the testimonial.
+    Returns: Topics mentioned in the testimonial, comma-separated, in order of first mention.
+    """
+    return ', '.join(TAGGER.tags(title, body))
+
+
+def testimonial_row(name: str, sessions: str, title: str, body: str) -> list:
+    """ Function testimonial_row.
+
+    Parameters:
+        name (str): student name.
+        sessions (str): number of sessions with the student, such as "12 sessions", or "".
+        title (str): title of the testimonial, or "".
+        body (str): body of the testimonial.
+    Returns: Row of the csv file, as in HEADINGS.
+    """
+    sessions = sessions.split()[0] if sessions.split() else ''
+    return [name, sessions, testimonial_topics(title, body), title, body]
+
+
+def first_value(testimonial: dict, keys: list) -> str:
+    """ Function first_value.
+
+    Parameters:
+        testimonial (dict): one testimonial, from JSON.
+        keys (list): keys to try, in order.
+    Returns: Value of the first key found, as a stripped string, or "" if none.
+    """
+    for key in keys:
+        value = testimonial.get(key)
+        if value is not None:
+            return str(value).strip()
+    return ''
+
+
+def extract_testimonials(page_source: str) -> list:
+    """ Function extract_testimonials.  Read all testimonials at once, from the JSON array of testimonials in
+    a script of the page, which the testimonial_nav carousel shows them from.
+
+    Parameters:
+        page_source (str): HTML of the job application form.
+    Returns: Rows of the csv file, in carousel order, or None if no testimonials were found.
+    """
+    decoder = json.JSONDecoder()
+    for script in lxml_html.fromstring(page_source).xpath('//script/text()'):
+        for match in TESTIMONIALS_START.finditer(script):
+            try:
+                testimonials, _ = decoder.raw_decode(script, match.end() - 1)
+            except ValueError:
+                # Not JSON, such as a JavaScript expression.
+                continue
+            if not testimonials or not all(isinstance(item, dict) for item in testimonials):
+                continue
+            rows = [testimonial_row(first_value(item, NAME_KEYS), first_value(item, SESSIONS_KEYS),
+                                    first_value(item, TITLE_KEYS), first_value(item, BODY_KEYS))
+                    for item in testimonials]
+            if any(row[4] for row in rows):
+                return rows
+    return None
+
+
+def click_through_testimonials(driver):
+    """ Function click_through_testimonials.  Generator of testimonials, read one at a time by clicking the
+    "›" arrow of the testimonial_nav carousel until it is disabled.
+
+    Parameters: Selenium driver object, at the job application form.
+    Yields: Rows of the csv file, in carousel order.
+    """
+    # Loop over recommendations.
+    keep_going = True
+    while keep_going:
+        # Student name.
+        testimonial_student = driver.find_element(By.XPATH, '//span[@id="testimonial_student_name"]').text
+
+        # Number of sessions with student.
+        testimonial_sessions = driver.find_elements(By.XPATH, '//span[@id="testimonial_sessions"]')
+        if len(testimonial_sessions) > 0:
+            testimonial_sessions = testimonial_sessions[0].text
+        else:
+            testimonial_sessions = ''
+
+        testimonial_titles = driver.find_elements(By.XPATH, '//h5[@id="testimonial_title"]')
+        if len(testimonial_titles) > 0:
+            testimonial_title = testimonial_titles[0].text
+        else:
+            testimonial_title = ''
+
+        testimonial_body = driver.find_element(By.XPATH, '//p[@id="testimonial_body"]').text
+
+        # xpath of button to move to next recommendation.
+        # driver.find_element(By.XPATH, '//div[@id="testimonial_nav"]/a[text()="›"]').click()
+        arrows = driver.find_elements(By.XPATH, '//a[text()="›"][not(contains(@class, "disabled"))]')
+        if len(arrows) == 1:
+            arrows[0].click()
+        else:
+            keep_going = False
+
+        WebDriverWait(driver, TIMEOUT).until(ec.visibility_of_element_located((By.ID, "testimonial_student_name")))
+
+        yield testimonial_row(testimonial_student, testimonial_sessions, testimonial_title, testimonial_body)
+# End of function click_through_testimonials.
+
+
+def harvest_testimonials(driver, seen: set, seen_run: int = SEEN_RUN) -> list:
+    """ Function harvest_testimonials.  Read the testimonials not saved yet, all at once if possible, else by
+    clicking through.  All testimonials read at once are checked, since they are already in memory, whatever
+    their order.  Clicking through stops after seen_run testimonials in a row already saved.
+
+    Parameters:
+        driver: Selenium driver object, at the job application form.
+        seen (set): hashes of saved testimonials.  The hashes of new testimonials are added to it.
+        seen_run (int): when clicking through, stop after this many saved testimonials in a row, or never if None.
+    Returns: Rows of the csv file not saved yet, in carousel order.
+    """
+    rows = extract_testimonials(driver.page_source)
+    if rows is not None:
+        print(f"Read {len(rows)} testimonials from the page source.")
+        return list(new_testimonials(rows, seen, None))
+    print("No testimonials in the page source, clicking through them instead.")
+    return list(new_testimonials(click_through_testimonials(driver), seen, seen_run))
+
+
+def testimonial_hash(row: list) -> str:
+    """ Function testimonial_hash.
+
+    Parameters:
+        row (list): row of the csv file, as in HEADINGS.
+    Returns: Hash of the student name, title and body of the testimonial, with white space collapsed.
+    """
+    name, _, _, title, body = row
+    content = "\x1f".join(" ".join(item.split()) for item in [name, title, body])
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def open_store(path: str = STORE_PATH) -> sqlite3.Connection:
+    """ Function open_store.  Open the store of saved testimonials, creating it if needed.
+
+    Parameters:
+        path (str): path of the SQLite database.
+    Returns: SQLite connection.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    connection = sqlite3.connect(path)
+    columns = ", ".join(f"{heading} TEXT" for heading in HEADINGS)
+    connection.execute(f"CREATE TABLE IF NOT EXISTS Testimonials (Hash TEXT PRIMARY KEY, {columns}, First_Seen TEXT)")
+    return connection
+
+
+def saved_hashes(connection: sqlite3.Connection) -> set:
+    """ Function saved_hashes.
+
+    Parameters:
+        connection: SQLite connection, from open_store.
+    Returns: Hashes of all saved testimonials.
+    """
+    return {row[0] for row in connection.execute("SELECT Hash FROM Testimonials")}
+
+
+def save_testimonials(connection: sqlite3.Connection, rows: list, path: str = None) -> None:
+    """ Function save_testimonials.  Save testimonials, in one transaction, ignoring any already saved.
+    If path is given, the rows are also appended to that csv file before the transaction commits, so that if
+    appending fails, they are not saved either, and the next run appends them again.
+
+    Parameters:
+        connection: SQLite connection, from open_store.
+        rows (list): rows of the csv file, as in HEADINGS.
+        path (str): path of the csv file to append the rows to, or None.
+    Returns:
+    """
+    first_seen = str(datetime.datetime.now())[:19]
+    sql = (f"INSERT OR IGNORE INTO Testimonials (Hash, {', '.join(HEADINGS)}, First_Seen) "
+           f"VALUES ({', '.join('?' * (len(HEADINGS) + 2))})")
+    with connection:
+        connection.executemany(sql, [[testimonial_hash(row), *row, first_seen] for row in rows])
+        if path is not None:
+            append_csv_rows(rows, path)
+
+
+def append_csv_rows(rows: list, path: str = OUTPUT_PATH) -> None:
+    """ Function append_csv_rows.  Append rows to a csv file, with a heading row if the file is new, and print them.
+
+    Parameters:
+        rows (list): rows of the csv file, as in HEADINGS.
+        path (str): path of the csv file.
     Returns:
     """
-    # Selenium options.
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument("--window-size=1920,2200")
+    new_file = not os.path.isfile(path)
+    with open(path, 'a', newline='') as output:
+        csvwriter = csv.writer(output)
+
+        # Heading row, if the file is new.
+        if new_file:
+            csvwriter.writerow(HEADINGS)
+        print('\t'.join(HEADINGS))
+
+        for row in rows:
+            # Write row to file and print.
+            csvwriter.writerow(row)
+            print('\t'.join(row))
+        output.flush()
+        os.fsync(output.fileno())
+
+
+def read_csv_rows(path: str = OUTPUT_PATH) -> list:
+    """ Function read_csv_rows.
+
+    Parameters:
+        path (str): path of a csv file written by this script.
+    Returns: Rows of the csv file, without the heading row, or [] if there is no such file.
+    """
+    if not os.path.isfile(path):
+        return []
+    with open(path, 'r', newline='') as file:
+        return [row for row in list(csv.reader(file))[1:] if len(row) == len(HEADINGS)]
+
 
-    # Connect to the Selenium web driver.
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+def new_testimonials(rows, seen: set, seen_run: int = SEEN_RUN):
+    """ Function new_testimonials.  Generator of the testimonials not saved yet, in carousel order.
+    Testimonials that appear more than once are only yielded once.
 
-    # Maximize the browser window.
-    driver.maximize_window()
+    Parameters:
+        rows: iterable of rows of the csv file, newest first.
+        seen (set): hashes of saved testimonials.  The hashes of new testimonials are added to it.
+        seen_run (int): stop after this many saved testimonials in a row, or never if None.
+    Yields: Rows not saved yet.
+    """
+    num_seen = 0
+    for row in rows:
+        row_hash = testimonial_hash(row)
+        if row_hash in seen:
+            num_seen += 1
+            if seen_run is not None and num_seen >= seen_run:
+                return
+            continue
+        num_seen = 0
+        seen.add(row_hash)
+        yield row
 
-    print("Done initializing Selenium.")
 
-    # Log into wyzant.
-    driver = log_into_wyzant(driver)
+def main():
+    """ Function main.  Get all new recommendations.
+
+    Parameters:
+    Returns:
+    """
+    parser = argparse.ArgumentParser(description="Append new recommendations to " + OUTPUT_PATH + ".")
+    parser.add_argument("--full", action="store_true",
+                        help="read every recommendation, not just those before the ones already saved")
+    args = parser.parse_args()
+
+    # Hashes of the testimonials already saved, from the csv file of earlier runs if there is no store yet.
+    connection = open_store()
+    seen = saved_hashes(connection)
+    if not seen:
+        old_rows = read_csv_rows()
+        if old_rows:
+            save_testimonials(connection, old_rows)
+            seen = saved_hashes(connection)
+            print(f"Saved hashes of {len(old_rows)} testimonials from {OUTPUT_PATH}.")
+
+    # Start a browser, logged into Wyzant.
+    driver = make_driver(block=BLOCK_PROFILE)
 
     print("Going to the Wyzant job listings page.")
 
@@ -80,85 +345,14 @@ def main():
 
     print("In first Wyzant job listing page.")
 
-    with open('./output/recommendations.csv', 'w', newline='') as output:
-        csvwriter = csv.writer(output)
+    rows = [row for row in harvest_testimonials(driver, seen, None if args.full else SEEN_RUN)
+            if sum(len(item) for item in row) > 0]
+    quit_driver(driver)
+    print(f"Found {len(rows)} new testimonials.")
 
-        # Heading row.
-        row = ['Name', 'Sessions', 'Topics', 'Title', 'Body']
-        csvwriter.writerow(row)
-        row = '\t'.join(row)
-        print(row)
-
-        # Loop over recommendations.
-        keep_going = True
-        while keep_going:
-            row = []
-
-            # Student name.
-            testimonial_student = driver.find_element(By.XPATH, '//span[@id="testimonial_student_name"]').text
-            row.append(testimonial_student)
-
-            # Number of sessions with student.
-            testimonial_sessions = driver.find_elements(By.XPATH, '//span[@id="testimonial_sessions"]')
-            if len(testimonial_sessions) > 0:
-                testimonial_sessions = testimonial_sessions[0].text
-                if len(testimonial_sessions) > 0:
-                    row.append(testimonial_sessions.split()[0])
-                else:
-                    row.append('')
-            else:
-                row.append('')
-
-            testimonial_titles = driver.find_elements(By.XPATH, '//h5[@id="testimonial_title"]')
-            if len(testimonial_titles) > 0:
-                testimonial_title = testimonial_titles[0].text
-            else:
-                testimonial_title = ''
-
-            testimonial_body = driver.find_element(By.XPATH, '//p[@id="testimonial_body"]').text
-
-            # xpath of button to move to next recommendation.
-            # driver.find_element(By.XPATH, '//div[@id="testimonial_nav"]/a[text()="›"]').click()
-            arrows = driver.find_elements(By.XPATH, '//a[text()="›"][not(contains(@class, "disabled"))]')
-            if len(arrows) == 1:
-                arrows[0].click()
-            else:
-                keep_going = False
-
-            WebDriverWait(driver, TIMEOUT).until(ec.visibility_of_element_located((By.ID, "testimonial_student_name")))
-
-            used_topics = set()
-            # Search for topics, part 1.
-            search_me = testimonial_title + ' ' + testimonial_body
-            for topic in exact_topics:
-                if topic in search_me:
-                    used_topics.add(topic)
-            # Search for topics, part 2.
-            search_me = search_me.lower()
-            for topic, TOPIC in topics.items():
-                if topic in search_me:
-                    used_topics.add(TOPIC)
-            # Append topics to end of row.
-            used_topics = ', '.join(used_topics)
-
-            # Topics covered in the session.
-            row.append(used_topics)
-
-            # Testimonial title.
-            row.append(testimonial_title)
-
-            # Body of testimonial.
-            row.append(testimonial_body)
-
-            row_len = 0
-            for item in row:
-                row_len += len(item)
-
-            if row_len > 0:
-                # Write row to file and print.
-                csvwriter.writerow(row)
-                row = '\t'.join(row)
-                print(row)
+    # Save the new testimonials and append them to the csv file in one step.
+    save_testimonials(connection, rows, OUTPUT_PATH)
+    connection.close()
 
 # End of function main.
 
@@ -0,0 +1,265 @@
+""" wyzant_waits.py
+
+SUMMARY: Condition-based waits for the search scripts, instead of fixed sleeps.
+Function wait_for waits until a condition holds, for up to an adaptive timeout, and records the time
+spent waiting in each step of a script in WAIT_STATS, so that the slow steps can be found.
+The timeout of each step adapts to how long that step usually takes, as for TCP retransmission:
+smoothed wait + 4 * smoothed deviation, between MIN_TIMEOUT and MAX_TIMEOUT.  A step that times out
+has its timeout doubled, up to MAX_TIMEOUT.
+
+Conditions, for wait_for, in addition to those in selenium.webdriver.support.expected_conditions:
+element_text_changed: the text of an element, such as the number of tutors found, changed, or the element
+                      was replaced.
+element_count_increased: more elements, such as tutor-cards, than before.
+element_gone: no visible element, such as a spinner, is left.
+input_value_is: an input control has a given value.
+NetworkIdle: the page is loaded, and has requested no more resources for a while.
+
+Used by:
+wyzant_pricing.py.
+wyzant_search_topics.py.
+
+REPOSITORY: https://github.com/DavidJLambert/Selenium
+
+AUTHOR: David J. Lambert
+
+VERSION: 0.7.0
+
+DATE: Oct 18, 2026
+"""
+# Web Browser independent Selenium imports.
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Other packages.
+import csv
+from time import monotonic
+
+# CONSTANTS.
+
+TIMEOUT = 30  # Seconds, the timeout of a step before it has any history.
+MIN_TIMEOUT = 5  # Seconds.
+MAX_TIMEOUT = 60  # Seconds.
+POLL_TIME = 0.05  # Seconds between checks of a condition.
+NETWORK_IDLE_TIME = 0.5  # Seconds without new resource requests for the network to count as idle.
+# Classes of the spinner the search results page shows while it loads.  Matched as whole class names, so that
+# elements such as a permanent "lazy-loading" container, which would never be gone, do not match.
+SPINNER_CLASSES = ["spinner", "loading-spinner"]
+SPINNER_XPATH = ('//*[' + ' or '.join(f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+                                      for name in SPINNER_CLASSES) + ']'
+                 '[not(contains(@style, "display: none"))]')
+
+RESOURCE_COUNT_JS = "return [document.readyState, performance.getEntriesByType('resource').length];"
+
+
+class StepStats:
+    """ Time spent waiting in one step, and its adaptive timeout. """
+
+    def __init__(self):
+        """ Function __init__. """
+        self.count = 0
+        self.timeouts = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.smoothed = None  # Smoothed wait, in seconds.
+        self.deviation = 0.0  # Smoothed deviation of the wait, in seconds.
+        self.timeout = TIMEOUT
+
+    def record(self, seconds: float, timed_out: bool) -> None:
+        """ Record one wait, and adapt the timeout.
+
+        Parameters:
+            seconds (float): time spent waiting.
+            timed_out (bool): True if the condition did not hold in time.
+        """
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if timed_out:
+            self.timeouts += 1
+            self.timeout = min(2 * self.timeout, MAX_TIMEOUT)
+            return
+        if self.smoothed is None:
+            self.smoothed = seconds
+            self.deviation = seconds / 2
+        else:
+            self.deviation = 0.75 * self.deviation + 0.25 * abs(seconds - self.smoothed)
+            self.smoothed = 0.875 * self.smoothed + 0.125 * seconds
+        self.timeout = min(max(self.smoothed + 4 * self.deviation, MIN_TIMEOUT), MAX_TIMEOUT)
+# End of class StepStats.
+
+
+class WaitStats:
+    """ Time spent waiting in each step of a script. """
+
+    def __init__(self):
+        """ Function __init__. """
+        self.steps = {}
+
+    def step(self, name: str) -> StepStats:
+        """ Statistics of one step, created if new. """
+        if name not in self.steps:
+            self.steps[name] = StepStats()
+        return self.steps[name]
+
+    def total(self) -> float:
+        """ Total time spent waiting, in seconds. """
+        return sum(stats.total for stats in self.steps.values())
+
+    def report(self) -> None:
+        """ Print the time spent waiting in each step, most first. """
+        print(f"TIME SPENT WAITING: {self.total():.1f} SECONDS.")
+        for name, stats in sorted(self.steps.items(), key=lambda item: item[1].total, reverse=True):
+            print(f"{name}: {stats.total:.1f} SECONDS IN {stats.count} WAITS, MAX {stats.max:.1f}, "
+                  f"{stats.timeouts} TIMEOUTS, TIMEOUT NOW {stats.timeout:.1f}.")
+
+    def save(self, path: str) -> None:
+        """ Save the time spent waiting in each step to a csv file, most first.
+
+        Parameters:
+            path (str): path of the csv file.
+        """
+        with open(path, 'w', newline='') as output:
+            csvwriter = csv.writer(output)
+            csvwriter.writerow(['Step', 'Waits', 'Seconds', 'Max_Seconds', 'Timeouts', 'Timeout'])
+            for name, stats in sorted(self.steps.items(), key=lambda item: item[1].total, reverse=True):
+                csvwriter.writerow([name, stats.count, f"{stats.total:.2f}", f"{stats.max:.2f}",
+                                    stats.timeouts, f"{stats.timeout:.1f}"])
+# End of class WaitStats.
+
+
+# Waits of this process.
+WAIT_STATS = WaitStats()
+
+
+def wait_for(driver, step: str, condition, timeout: float = None, stats: WaitStats = WAIT_STATS):
+    """ Function wait_for.  Wait until a condition holds, and record the time spent waiting.
+
+    Parameters:
+        driver: Selenium driver object.
+        step (str): name of the step of the script, for the statistics and the adaptive timeout.
+        condition: function of driver, returning a true value once the condition holds.
+        timeout (float): seconds to wait, or None for the adaptive timeout of the step.
+        stats (WaitStats): where to record the wait.
+    Returns: The value returned by condition.
+    Raises: TimeoutException if the condition did not hold in time.
+    """
+    step_stats = stats.step(step)
+    start = monotonic()
+    try:
+        result = WebDriverWait(driver, timeout or step_stats.timeout, poll_frequency=POLL_TIME,
+                               ignored_exceptions=[StaleElementReferenceException]).until(condition)
+    except TimeoutException:
+        step_stats.record(monotonic() - start, timed_out=True)
+        raise
+    step_stats.record(monotonic() - start, timed_out=False)
+    return result
+
+
+def locator_text(driver, locator: tuple) -> str:
+    """ Function locator_text.
+
+    Parameters:
+        driver: Selenium driver object.
+        locator (tuple): (By, value) of the element.
+    Returns: Text of the first element found, or None if there is none.
+    """
+    elements = driver.find_elements(*locator)
+    return elements[0].text.strip() if elements else None
+
+
+def element_text_changed(locator: tuple, old_text: str, old_element=None):
+    """ Function element_text_changed.
+
+    Parameters:
+        locator (tuple): (By, value) of the element.
+        old_text (str): text before, or None if there was no such element.
+        old_element: the element before, if any.  If it is replaced, as when a new page loads,
+                     the condition holds even if the text is the same.
+    Returns: Condition, true once the element exists with new text, or replaced, returning its text.
+    """
+    def condition(driver):
+        text = locator_text(driver, locator)
+        if not text:
+            return False
+        if text != old_text or (old_element is not None and is_stale(old_element)):
+            return text
+        return False
+    return condition
+
+
+def is_stale(element) -> bool:
+    """ Function is_stale.
+
+    Parameters: An element.
+    Returns: True if the element is no longer in the page.
+    """
+    try:
+        element.is_enabled()
+        return False
+    except StaleElementReferenceException:
+        return True
+
+
+def element_count_increased(locator: tuple, old_count: int):
+    """ Function element_count_increased.
+
+    Parameters:
+        locator (tuple): (By, value) of the elements.
+        old_count (int): number of elements before.
+    Returns: Condition, true once there are more than old_count elements, returning the number.
+    """
+    def condition(driver):
+        count = len(driver.find_elements(*locator))
+        return count if count > old_count else False
+    return condition
+
+
+def element_gone(locator: tuple):
+    """ Function element_gone.
+
+    Parameters:
+        locator (tuple): (By, value) of the elements, such as a spinner.
+    Returns: Condition, true once none of the elements is displayed.
+    """
+    def condition(driver):
+        return not any(element.is_displayed() for element in driver.find_elements(*locator))
+    return condition
+
+
+def input_value_is(element, value: str):
+    """ Function input_value_is.
+
+    Parameters:
+        element: input control.
+        value (str): value wanted.
+    Returns: Condition, true once the value of the input control is value.
+    """
+    def condition(driver):
+        return element.get_attribute('value') == value
+    return condition
+
+
+class NetworkIdle:
+    """ Condition, true once the page is loaded and has requested no new resources for idle_time seconds. """
+
+    def __init__(self, idle_time: float = NETWORK_IDLE_TIME):
+        """ Function __init__.
+
+        Parameters:
+            idle_time (float): seconds without new resource requests.
+        """
+        self.idle_time = idle_time
+        self.last_count = None
+        self.last_change = monotonic()
+
+    def __call__(self, driver) -> bool:
+        """ Check the condition once. """
+        ready_state, count = driver.execute_script(RESOURCE_COUNT_JS)
+        now = monotonic()
+        if count != self.last_count:
+            self.last_count = count
+            self.last_change = now
+            return False
+        return ready_state == 'complete' and now - self.last_change >= self.idle_time
+# End of class NetworkIdle.